@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare 7z backends on listing many small archives.
+
+Each archive is opened with a fresh SevenZipHandler and listed once, which
+is what browsing or indexing a folder of archives does. The 'cli (check per
+handler)' row repeats the old behaviour of running '7z --help' for every
+handler; the other rows use the once-per-process tool check. In-process
+backends are timed only when their package (libarchive-c, py7zr) is
+installed.
+
+Requires the 7z command line tool (or py7zr) to create the archives.
+
+Usage:
+    python benchmarks/bench_7z_backends.py [archive_count]
+
+    archive_count  small archives to list (default: 1000)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.sevenz import SevenZipHandler
+from varchiver.utils import sevenz_backends
+from varchiver.utils.sevenz_backends import available_backends, check_7z_cli
+
+
+def build_archives(root, count):
+    """count archives of three small text files each"""
+    src = os.path.join(root, "src")
+    os.makedirs(src)
+    names = []
+    for i in range(3):
+        name = f"file_{i}.txt"
+        with open(os.path.join(src, name), "w") as f:
+            f.write(f"sample {i}\n" * 100)
+        names.append(name)
+
+    template = os.path.join(root, "template.7z")
+    if check_7z_cli() is None:
+        subprocess.run(["7z", "a", "-bso0", "-bsp0", template] + names, cwd=src, check=True)
+    elif sevenz_backends.PY7ZR_AVAILABLE:
+        with sevenz_backends.py7zr.SevenZipFile(template, "w") as archive:
+            for name in names:
+                archive.write(os.path.join(src, name), name)
+    else:
+        raise RuntimeError("Creating archives needs the 7z tool or py7zr")
+
+    with open(template, "rb") as f:
+        data = f.read()
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"archive_{i:05d}.7z")
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def time_listing(paths, backend, check_each=False):
+    start = time.perf_counter()
+    for path in paths:
+        if check_each:
+            check_7z_cli.cache_clear()
+        handler = SevenZipHandler(path, backend=backend)
+        if len(handler.namelist()) != 3:
+            raise RuntimeError(f"Unexpected listing for {path}")
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print(f"📦 Listing {count:,} small 7z archives per backend")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_archives(tmp, count)
+        backends = available_backends()
+        rows = []
+        if "cli" in backends:
+            rows.append(("cli (check per handler)", "cli", True))
+        rows.extend((name, name, False) for name in backends)
+
+        baseline = None
+        for label, backend, check_each in rows:
+            elapsed = time_listing(paths, backend, check_each)
+            baseline = baseline or elapsed
+            print(f"{label:<26} {elapsed:>8.2f}s  {elapsed / count * 1000:>7.2f} ms/archive  "
+                  f"{baseline / elapsed:>5.1f}x")
+
+        missing = [n for n in ("libarchive", "py7zr", "cli") if n not in backends]
+        if missing:
+            print(f"\nNot available: {', '.join(missing)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
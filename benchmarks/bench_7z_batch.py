@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare per-file 7z creation with the batched listfile path.
+
+SevenZipHandler.write() runs one '7z a' per file, rewriting the archive
+each time; write_many() hands the whole batch to 7z through a listfile.
+The per-file path is timed on a sample and extrapolated, since running it
+over the full tree takes hours.
+
+Requires the 7z command line tool.
+
+Usage:
+    python benchmarks/bench_7z_batch.py [file_count] [per_file_sample]
+
+    file_count       files in the synthetic tree (default: 10000)
+    per_file_sample  files to time through write() (default: 200)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.sevenz import SevenZipHandler
+
+
+def build_tree(root, file_count):
+    paths = []
+    for i in range(file_count):
+        path = os.path.join(root, f"pkg_{i // 250:03d}", f"module_{i:05d}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"# synthetic module {i}\nVALUE = {i}\n" * 20)
+        paths.append(path)
+    return paths
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sample = min(file_count, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+
+    print("📦 7z per-file vs batched creation")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        paths = build_tree(src, file_count)
+        entries = [(p, os.path.relpath(p, src)) for p in paths]
+
+        archive = SevenZipHandler(os.path.join(tmp, "per_file.7z"))
+        start = time.perf_counter()
+        for file_path, arcname in entries[:sample]:
+            archive.write(file_path, arcname)
+        per_file = time.perf_counter() - start
+        estimate = per_file / sample * file_count
+        print(f"write()      {sample:>7,} files {per_file:>9.2f}s "
+              f"(≈{estimate:,.0f}s extrapolated to {file_count:,})")
+
+        archive = SevenZipHandler(os.path.join(tmp, "batched.7z"))
+        start = time.perf_counter()
+        archive.write_many(entries, compression_level=5)
+        batched = time.perf_counter() - start
+        print(f"write_many() {file_count:>7,} files {batched:>9.2f}s")
+
+        members = len(archive.namelist())
+        if members != file_count:
+            raise RuntimeError(f"Expected {file_count} members, found {members}")
+        print(f"\nSpeed-up: ≈{estimate / batched:,.0f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark ArchiveJob creation time against tree size.
+
+Builds synthetic trees of increasing size and archives each one with the
+'Keep both files' collision strategy, which used to re-list the archive for
+every member. With the in-memory member index the per-file cost should stay
+flat, i.e. total time scales linearly with the number of files.
+
+Usage:
+    python benchmarks/bench_archive_collisions.py [max_files] [format]
+
+    max_files  largest tree to build (default: 100000)
+    format     archive extension to write: .zip or .tar (default: .zip)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.engine.archive_job import ArchiveJob
+
+
+def build_tree(root, file_count, files_per_dir=1000):
+    """Create file_count tiny files spread over subdirectories"""
+    for i in range(file_count):
+        subdir = os.path.join(root, f"dir_{i // files_per_dir:04d}")
+        if i % files_per_dir == 0:
+            os.makedirs(subdir, exist_ok=True)
+        with open(os.path.join(subdir, f"file_{i:07d}.txt"), "w") as f:
+            f.write(f"synthetic file {i}\n")
+
+
+def time_archive(source_dir, archive_name):
+    """Run an ArchiveJob and return elapsed seconds"""
+    job = ArchiveJob(
+        files=[source_dir],
+        archive_name=archive_name,
+        collision_strategy="Keep both files",
+        compression_level=1,
+    )
+    errors = []
+    job.error.connect(lambda msg, _: errors.append(msg))
+    start = time.perf_counter()
+    job.run()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(errors[0])
+    return elapsed
+
+
+def main():
+    max_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else ".zip"
+    sizes = [n for n in (10_000, 25_000, 50_000, 100_000) if n <= max_files] or [max_files]
+
+    print(f"📦 ArchiveJob collision-index benchmark ({fmt})")
+    print("=" * 60)
+    print(f"{'files':>10} {'seconds':>10} {'µs/file':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            source = os.path.join(tmp, f"tree_{count}")
+            build_tree(source, count)
+            archive = os.path.join(tmp, f"out_{count}{fmt}")
+            elapsed = time_archive(source, archive)
+            print(f"{count:>10,} {elapsed:>10.2f} {elapsed / count * 1e6:>10.1f}")
+            os.remove(archive)
+
+    print("\nA flat µs/file column means creation time scales linearly.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
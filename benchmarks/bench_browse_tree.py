@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark archive tree construction for BrowseThread.
+
+Builds trees from two synthetic listings, once with the previous
+list-scanning algorithm (one ``next(...)`` scan of the sibling list per
+path component, one progress call per file) and once with build_tree:
+
+    flat  every file in a single directory (worst case for list scans)
+    deep  files spread over a 12-level directory hierarchy
+
+Usage:
+    python benchmarks/bench_browse_tree.py [entries] [legacy_limit]
+
+    entries       listing size (default: 300000)
+    legacy_limit  skip the old algorithm above this many entries, since it
+                  is quadratic on flat listings (default: 30000)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.archive_tree import build_tree
+
+
+def flat_listing(count):
+    return [{"path": f"data/file_{i:07d}.bin", "size": i, "is_dir": False} for i in range(count)]
+
+
+def deep_listing(count):
+    entries = []
+    for i in range(count):
+        parts = [f"level{d}_{(i >> d) % 4}" for d in range(12)]
+        entries.append({"path": "/".join(parts) + f"/file_{i}.txt", "size": i, "is_dir": False})
+    return entries
+
+
+def legacy_tree(files, progress=lambda value: None):
+    """The list-scanning tree builder BrowseThread used before build_tree"""
+    tree = []
+    total_files = len(files)
+    for processed, file_entry in enumerate(files, 1):
+        filepath = file_entry["path"].replace("\\", "/")
+        is_dir = file_entry.get("is_dir", filepath.endswith("/"))
+        parts = filepath.split("/")
+        current = tree
+        for i, part in enumerate(parts):
+            if not part:
+                continue
+            node = next((n for n in current if n["name"] == part), None)
+            if node is None:
+                node = {"name": part, "path": "/".join(parts[:i + 1]),
+                        "is_dir": i < len(parts) - 1 or is_dir, "children": []}
+                if "size" in file_entry:
+                    node["size"] = file_entry["size"]
+                current.append(node)
+            current = node["children"]
+        progress(int(processed * 100 / total_files))
+    return tree
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    legacy_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 30_000
+
+    print("🌳 Archive tree construction benchmark")
+    print("=" * 60)
+    print(f"{'listing':>8} {'entries':>10} {'legacy s':>10} {'build_tree s':>13} {'progress calls':>15}")
+
+    for name, make in (("flat", flat_listing), ("deep", deep_listing)):
+        entries = make(count)
+        legacy = "skipped"
+        if count <= legacy_limit:
+            legacy = f"{timed(legacy_tree, entries):.2f}"
+        calls = []
+        elapsed = timed(build_tree, entries, progress_callback=calls.append)
+        print(f"{name:>8} {count:>10,} {legacy:>10} {elapsed:>13.2f} {len(calls):>15,}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
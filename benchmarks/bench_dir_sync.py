@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark re-syncing an unchanged directory tree.
+
+The previous DirectoryUpdateThread path copied every file with
+shutil.copy2 on each run; sync_directories compares size and mtime and
+copies nothing when the tree is unchanged. Both are timed on a second run
+over an already synced target, which is what a periodic update does.
+
+Usage:
+    python benchmarks/bench_dir_sync.py [file_count] [file_kb]
+
+    file_count  files in the synthetic tree (default: 5000)
+    file_kb     size of each file in KiB (default: 64)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.dir_sync import sync_directories
+
+
+def build_tree(root, file_count, file_kb):
+    data = os.urandom(file_kb * 1024)
+    for i in range(file_count):
+        path = os.path.join(root, f"dir_{i // 200:03d}", f"file_{i:05d}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def copy_everything(src, dst):
+    """The old update loop: copy2 every file regardless of the target"""
+    for root, _, files in os.walk(src):
+        target_dir = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files:
+            shutil.copy2(os.path.join(root, name), os.path.join(target_dir, name))
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    file_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    total_mb = file_count * file_kb / 1024
+
+    print(f"🔁 Re-sync of an unchanged tree ({file_count:,} files, {total_mb:,.0f} MB)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        build_tree(src, file_count, file_kb)
+
+        legacy_dst = os.path.join(tmp, "legacy")
+        copy_everything(src, legacy_dst)
+        start = time.perf_counter()
+        copy_everything(src, legacy_dst)
+        legacy = time.perf_counter() - start
+        print(f"copy2 every file   {legacy:>8.2f}s  {total_mb:>8,.0f} MB written")
+
+        sync_dst = os.path.join(tmp, "sync")
+        sync_directories(src, sync_dst)
+        start = time.perf_counter()
+        stats = sync_directories(src, sync_dst)
+        incremental = time.perf_counter() - start
+        print(f"sync_directories   {incremental:>8.2f}s  "
+              f"{stats.bytes_copied / (1024 * 1024):>8,.0f} MB written")
+
+        print(f"\nSpeed-up: {legacy / incremental:,.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark copying a directory tree with shutil.copy2 against fast_copy.
+
+Directory archives, directory extraction, updates and snapshots used to
+copy2 one file at a time. fast_copy.copy_many copies on a thread pool with
+reflink, copy_file_range or sendfile, whichever the filesystem supports;
+the strategy it ended up using is printed with the timings. Run it on
+btrfs or XFS to see reflinks, where large copies become near-instant.
+
+Usage:
+    python benchmarks/bench_fast_copy.py [small_files] [large_files] [large_mb]
+
+    small_files  4 KiB files in the tree (default: 5000)
+    large_files  large files in the tree (default: 4)
+    large_mb     size of each large file in MiB (default: 64)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.fast_copy import copy_tree
+
+
+def build_tree(root, small_files, large_files, large_mb):
+    small = os.urandom(4 * 1024)
+    for i in range(small_files):
+        path = os.path.join(root, f"dir_{i // 200:03d}", f"file_{i:05d}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(small)
+    os.makedirs(root, exist_ok=True)
+    block = os.urandom(1024 * 1024)
+    for i in range(large_files):
+        with open(os.path.join(root, f"large_{i}.bin"), "wb") as f:
+            for _ in range(large_mb):
+                f.write(block)
+
+
+def copy2_tree(src, dst):
+    """The old loop: one copy2 per file"""
+    for root, _, files in os.walk(src):
+        target_dir = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files:
+            shutil.copy2(os.path.join(root, name), os.path.join(target_dir, name))
+
+
+def main():
+    small_files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    large_files = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    large_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    total_mb = small_files * 4 / 1024 + large_files * large_mb
+
+    print(f"📁 Tree copy ({small_files:,} small + {large_files} large files, {total_mb:,.0f} MB)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+        src = os.path.join(tmp, "src")
+        build_tree(src, small_files, large_files, large_mb)
+
+        start = time.perf_counter()
+        copy2_tree(src, os.path.join(tmp, "copy2"))
+        legacy = time.perf_counter() - start
+        print(f"shutil.copy2   {legacy:>8.2f}s  {total_mb / legacy:>8,.0f} MB/s")
+
+        start = time.perf_counter()
+        result = copy_tree(src, os.path.join(tmp, "fast"))
+        fast = time.perf_counter() - start
+        print(f"copy_tree      {fast:>8.2f}s  {total_mb / fast:>8,.0f} MB/s  "
+              f"({', '.join(f'{n}: {c:,}' for n, c in result.strategies.most_common())})")
+
+        print(f"\nSpeed-up: {legacy / fast:,.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark extracting many archives one at a time against JobScheduler.
+
+The extraction queue used to run one ExtractionJob after another. This
+builds a batch of small ZIPs (the "300 archives from a file manager"
+case, where per-archive overhead dominates) and extracts them serially,
+then through JobScheduler at a few concurrency levels.
+
+Usage:
+    python benchmarks/bench_job_scheduler.py [archives] [files_per_archive] [jobs...]
+
+    archives           number of ZIPs (default: 300)
+    files_per_archive  64 KiB members per ZIP (default: 20)
+    jobs               concurrency levels to try (default: 2 4 8)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.engine.extraction_job import ExtractionJob
+from varchiver.engine.scheduler import JobScheduler, DONE
+
+
+def build_archives(root, count, files_per_archive):
+    block = os.urandom(32 * 1024) * 2  # Compressible, but not trivially
+    archives = []
+    for i in range(count):
+        path = os.path.join(root, f"archive_{i:04d}.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for j in range(files_per_archive):
+                archive.writestr(f"data/file_{j:03d}.bin", block)
+        archives.append(path)
+    return archives
+
+
+def run_serial(archives, out_root):
+    for path in archives:
+        job = ExtractionJob(path, os.path.join(out_root, os.path.basename(path)), collision_strategy="skip")
+        job.run()
+
+
+def run_scheduled(archives, out_root, max_jobs):
+    scheduler = JobScheduler(max_jobs=max_jobs)
+    with scheduler.batch():
+        for path in archives:
+            scheduler.submit_extraction(path, os.path.join(out_root, os.path.basename(path)),
+                                        collision_strategy="skip")
+    scheduler.wait()
+    failed = [job for job in scheduler.jobs.values() if job.state != DONE]
+    if failed:
+        raise RuntimeError(f"{len(failed)} jobs failed, first: {failed[0].errors}")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    files_per_archive = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    levels = [int(arg) for arg in sys.argv[3:]] or [2, 4, 8]
+
+    print("📦 Multi-archive extraction benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "in"))
+        archives = build_archives(os.path.join(tmp, "in"), count, files_per_archive)
+        print(f"{count} archives x {files_per_archive} files, {os.cpu_count()} CPUs")
+        print(f"{'mode':>12} {'seconds':>9} {'archives/s':>11} {'speedup':>8}")
+
+        out = os.path.join(tmp, "out")
+        # Untimed pass so every mode runs with the archives in the page cache
+        run_serial(archives, out)
+        shutil.rmtree(out)
+        serial = timed(run_serial, archives, out)
+        print(f"{'serial':>12} {serial:9.2f} {count / serial:11.1f} {1.0:8.2f}")
+        for max_jobs in levels:
+            shutil.rmtree(out)
+            elapsed = timed(run_scheduled, archives, out, max_jobs)
+            print(f"{f'{max_jobs} jobs':>12} {elapsed:9.2f} {count / elapsed:11.1f} {serial / elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel ZIP extraction against worker count.
+
+Builds a ZIP of semi-compressible members (by default 5 GB in 50,000
+members, matching a large real-world archive), then extracts it once with
+``ZipFile.extractall`` and once per worker count with extract_zip_parallel,
+reporting MB/s of uncompressed data.
+
+Usage:
+    python benchmarks/bench_parallel_unzip.py [total_mb] [members]
+
+    total_mb  amount of uncompressed data (default: 5120)
+    members   number of members (default: 50000)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.parallel_unzip import extract_zip_parallel
+from varchiver.utils.parallel_zip import default_workers
+
+
+def build_archive(tmp, total_mb, members):
+    """Write members that compress roughly 3:1 into a ZIP"""
+    member_bytes = max(1, total_mb * 1024 * 1024 // members)
+    archive = os.path.join(tmp, "bench.zip")
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for i in range(members):
+            data = os.urandom(member_bytes // 4) + bytes(member_bytes - member_bytes // 4)
+            zf.writestr(f"d{i // 1000:03d}/f{i:06d}.bin", data)
+    return archive
+
+
+def bench_extractall(archive, out):
+    start = time.perf_counter()
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(out)
+    return time.perf_counter() - start
+
+
+def bench_parallel(archive, out, workers):
+    start = time.perf_counter()
+    result = extract_zip_parallel(archive, out, workers=workers)
+    if result["errors"]:
+        raise RuntimeError(f"Extraction errors: {result['errors'][:3]}")
+    return time.perf_counter() - start
+
+
+def main():
+    total_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 5120
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+
+    print("📦 Parallel ZIP extraction benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = build_archive(tmp, total_mb, members)
+        with zipfile.ZipFile(archive) as zf:
+            data_mb = sum(i.file_size for i in zf.infolist()) / (1024 * 1024)
+        print(f"Archive: {members:,} members, {data_mb:.0f} MB uncompressed, "
+              f"{os.path.getsize(archive) / (1024 * 1024):.0f} MB on disk\n")
+        print(f"{'engine':>16} {'seconds':>10} {'MB/s':>10}")
+
+        out = os.path.join(tmp, "out")
+        elapsed = bench_extractall(archive, out)
+        print(f"{'extractall':>16} {elapsed:>10.2f} {data_mb / elapsed:>10.1f}")
+        shutil.rmtree(out)
+
+        counts = sorted({1, 2, 4, 8, 16, 32, default_workers()})
+        for workers in (w for w in counts if w <= default_workers()):
+            elapsed = bench_parallel(archive, out, workers)
+            print(f"{f'{workers} workers':>16} {elapsed:>10.2f} {data_mb / elapsed:>10.1f}")
+            shutil.rmtree(out)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
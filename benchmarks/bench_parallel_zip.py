@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark ParallelZipWriter throughput against worker count.
+
+Generates a synthetic tree of semi-compressible files, then writes it to a
+ZIP once with plain ``zipfile`` and once per worker count with
+ParallelZipWriter, reporting MB/s of source data. Every output is checked
+with ``ZipFile.testzip()``.
+
+Usage:
+    python benchmarks/bench_parallel_zip.py [total_mb] [file_kb]
+
+    total_mb  amount of source data to generate (default: 512)
+    file_kb   size of each generated file (default: 256)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.parallel_zip import ParallelZipWriter, default_workers
+
+
+def build_tree(root, total_mb, file_kb):
+    """Write files that compress roughly 3:1, like typical source trees"""
+    file_bytes = file_kb * 1024
+    count = max(1, total_mb * 1024 // file_kb)
+    paths = []
+    for i in range(count):
+        block = os.urandom(file_bytes // 4) + bytes(file_bytes - file_bytes // 4)
+        path = os.path.join(root, f"d{i // 500:03d}", f"f{i:06d}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(block)
+        paths.append(path)
+    return paths
+
+
+def bench_zipfile(paths, root, archive):
+    start = time.perf_counter()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for path in paths:
+            zf.write(path, os.path.relpath(path, root))
+    return time.perf_counter() - start
+
+
+def bench_parallel(paths, root, archive, workers):
+    start = time.perf_counter()
+    with ParallelZipWriter(archive, compression_level=6, workers=workers) as writer:
+        for path in paths:
+            writer.add(path, os.path.relpath(path, root))
+    return time.perf_counter() - start
+
+
+def check(archive):
+    with zipfile.ZipFile(archive) as zf:
+        bad = zf.testzip()
+    if bad:
+        raise RuntimeError(f"Corrupt member in {archive}: {bad}")
+
+
+def main():
+    total_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    file_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+
+    print("📦 Parallel ZIP compression benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        paths = build_tree(src, total_mb, file_kb)
+        data_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+        print(f"Source: {len(paths):,} files, {data_mb:.0f} MB\n")
+        print(f"{'engine':>16} {'seconds':>10} {'MB/s':>10}")
+
+        archive = os.path.join(tmp, "baseline.zip")
+        elapsed = bench_zipfile(paths, src, archive)
+        check(archive)
+        print(f"{'zipfile':>16} {elapsed:>10.2f} {data_mb / elapsed:>10.1f}")
+        os.remove(archive)
+
+        counts = sorted({1, 2, 4, 8, 16, 32, default_workers()})
+        for workers in (w for w in counts if w <= default_workers()):
+            archive = os.path.join(tmp, f"parallel_{workers}.zip")
+            elapsed = bench_parallel(paths, src, archive, workers)
+            check(archive)
+            print(f"{f'{workers} workers':>16} {elapsed:>10.2f} {data_mb / elapsed:>10.1f}")
+            os.remove(archive)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
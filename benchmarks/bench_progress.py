@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark cross-thread progress signals, per file against ProgressReporter.
+
+Jobs used to emit a status for every file (and progress every file or
+every tenth) from their worker thread. Each emit is a queued event that
+the GUI thread has to deliver to a QLabel / QProgressBar. Two runs:
+
+    signals  a worker thread "processes" N files doing nothing but
+             reporting, so the time is all signal overhead
+    archive  ArchiveThread writes N small files to a .tar with the GUI
+             thread updating a label and a progress bar
+
+Each is timed until the last event has been delivered, with reports per
+file (ProgressReporter with a zero interval) and coalesced to the default
+interval. "gui" is the CPU time the GUI thread spent delivering them,
+which is what keeps the window from repainting. Runs offscreen; needs
+PyQt6.
+
+Usage:
+    python benchmarks/bench_progress.py [files] [signals|archive]
+
+    files  number of files (default: 100000)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QLabel, QProgressBar
+
+from varchiver.utils import progress as progress_module
+from varchiver.utils.progress import ProgressReporter
+
+
+class Emitter(QObject):
+    progress = pyqtSignal(int)
+    status = pyqtSignal(str)
+
+
+class Display:
+    """The GUI side: a label and a progress bar, counting what arrives"""
+
+    def __init__(self, source):
+        self.label = QLabel()
+        self.bar = QProgressBar()
+        self.delivered = 0
+        source.progress.connect(self.on_progress)
+        source.status.connect(self.on_status)
+
+    def on_progress(self, percent):
+        self.delivered += 1
+        self.bar.setValue(percent)
+
+    def on_status(self, message):
+        self.delivered += 1
+        self.label.setText(message)
+
+
+def drain(app, done, display, expected=None):
+    """Run the GUI thread's event loop until the worker is done and its events delivered
+
+    Returns the CPU time the GUI thread used.
+    """
+    cpu = time.thread_time()
+    while True:
+        app.processEvents()
+        if done.is_set() and (expected is None or display.delivered >= expected()):
+            app.processEvents()
+            return time.thread_time() - cpu
+        time.sleep(0.0005)
+
+
+def bench_signals(app, count, per_file):
+    emitter = Emitter()
+    display = Display(emitter)
+    emitted = [0]
+    done = threading.Event()
+
+    def emit_progress(percent):
+        emitted[0] += 1
+        emitter.progress.emit(percent)
+
+    def emit_status(message):
+        emitted[0] += 1
+        emitter.status.emit(message)
+
+    def work():
+        reporter = ProgressReporter(emit_progress, emit_status, label="Adding to",
+                                    total_bytes=count * 4096, total_files=count,
+                                    interval=0 if per_file else None)
+        for _ in range(count):
+            reporter.advance(4096, current="src")
+        reporter.finish()
+        done.set()
+
+    start = time.perf_counter()
+    threading.Thread(target=work).start()
+    gui = drain(app, done, display, lambda: emitted[0])
+    return time.perf_counter() - start, gui, emitted[0]
+
+
+def bench_archive(app, files, per_file):
+    from varchiver.threads.archive_thread import ArchiveThread
+
+    # ArchiveJob builds its reporter with the module default
+    saved = progress_module.DEFAULT_INTERVAL
+    progress_module.DEFAULT_INTERVAL = 0 if per_file else saved
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            thread = ArchiveThread([files], os.path.join(tmp, "out.tar"))
+            display = Display(thread)
+            done = threading.Event()
+            thread.finished.connect(lambda name: done.set())
+            thread.error.connect(lambda message, _: (print(f"error: {message}"), done.set()))
+            start = time.perf_counter()
+            thread.start()
+            gui = drain(app, done, display)
+            thread.wait()
+            return time.perf_counter() - start, gui, display.delivered
+    finally:
+        progress_module.DEFAULT_INTERVAL = saved
+
+
+def make_files(root, count):
+    for i in range(count):
+        directory = os.path.join(root, f"d{i // 1000:03d}")
+        if i % 1000 == 0:
+            os.makedirs(directory)
+        with open(os.path.join(directory, f"f{i:06d}.txt"), "wb") as f:
+            f.write(b"x" * 64)
+
+
+def report(name, per_file, coalesced):
+    for label, (elapsed, gui, events) in (("per file", per_file), ("coalesced", coalesced)):
+        print(f"{name if label == 'per file' else '':>8} {label:>10} {elapsed:8.2f}s "
+              f"{gui:8.2f}s {events:>9,}")
+    print(f"{'':>8} {'speedup':>10} {per_file[0] / coalesced[0]:8.1f}x "
+          f"{per_file[1] / max(coalesced[1], 1e-3):8.1f}x")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    modes = sys.argv[2:] or ["signals", "archive"]
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    print("📶 Progress reporting benchmark")
+    print("=" * 60)
+    print(f"{count:,} files, report interval {progress_module.DEFAULT_INTERVAL * 1000:.0f} ms")
+    print(f"{'':>8} {'':>10} {'wall':>9} {'gui':>9} {'events':>9}")
+    if "signals" in modes:
+        report("signals", bench_signals(app, count, True), bench_signals(app, count, False))
+    if "archive" in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "src")
+            make_files(src, count)
+            # Untimed pass so both runs find the files in the page cache
+            bench_archive(app, src, False)
+            report("archive", bench_archive(app, src, True), bench_archive(app, src, False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark SkipMatcher against pattern_utils.should_skip_file.
+
+Generates synthetic absolute paths shaped like a mixed source tree (source
+files, dependency directories, build output, logs, editor files) and checks
+each one against every DEFAULT_SKIP_PATTERNS group, once with the per-call
+fnmatch loop and once with a SkipMatcher compiled up front. The skipped
+counts differ: should_skip_file anchors bare names such as ``node_modules``
+at the start of the path, so they never match absolute paths.
+
+Usage:
+    python benchmarks/bench_skip_matcher.py [paths]
+
+    paths  number of synthetic paths (default: 1000000)
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.constants import DEFAULT_SKIP_PATTERNS
+from varchiver.utils.pattern_utils import SkipMatcher, should_skip_file
+
+DIRS = ["src", "lib", "app", "tests", "docs", "node_modules", "build", ".git", "deps", "__pycache__"]
+NAMES = ["main.py", "util.py", "index.js", "README.md", "server.log", "cache.pyc",
+         "notes.tmp", "config.json", ".DS_Store", "module.ex"]
+
+
+def make_paths(count, seed=10):
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(1, 6)
+        parts = [rng.choice(DIRS) for _ in range(depth)]
+        paths.append("/home/user/project/" + "/".join(parts) + "/" + rng.choice(NAMES))
+    return paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    patterns = [p for group in DEFAULT_SKIP_PATTERNS.values() for p in group]
+
+    print("🔎 Skip pattern matching benchmark")
+    print("=" * 60)
+    paths = make_paths(count)
+    print(f"{count:,} paths, {len(patterns)} patterns\n")
+    print(f"{'engine':>20} {'seconds':>10} {'us/path':>10} {'skipped':>10}")
+
+    start = time.perf_counter()
+    skipped = sum(1 for p in paths if should_skip_file(p, patterns))
+    elapsed = time.perf_counter() - start
+    print(f"{'should_skip_file':>20} {elapsed:>10.2f} {elapsed / count * 1e6:>10.2f} {skipped:>10,}")
+
+    start = time.perf_counter()
+    matcher = SkipMatcher(patterns)
+    skipped = sum(1 for p in paths if matcher.match(p))
+    elapsed = time.perf_counter() - start
+    print(f"{'SkipMatcher.match':>20} {elapsed:>10.2f} {elapsed / count * 1e6:>10.2f} {skipped:>10,}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
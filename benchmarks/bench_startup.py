@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark import-time startup cost against a recorded baseline.
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and compares it with benchmarks/startup_baseline.json:
+
+    gui  varchiver.widgets.main_widget, everything before the window appears
+    cli  varchiver.cli and the engine that 'varchiver-cli list' runs
+
+For each target the fastest of several runs is reported, together with
+the slowest imports it pulls in and any top-level packages that the
+baseline did not import. The packages are what usually regress:
+importing a mode widget, Supabase or SQLAlchemy at module level shows up
+here even on a machine whose timings differ from the baseline's. Exits
+with 1 when a target is over its baseline by more than the tolerance or
+imports new packages.
+
+Usage:
+    python benchmarks/bench_startup.py [runs] [--update]
+
+    runs      fresh interpreters per target (default: 5)
+    --update  rewrite the baseline from this run
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+BASELINE_FILE = Path(__file__).parent / "startup_baseline.json"
+
+TARGETS = {
+    "gui": ["varchiver.widgets.main_widget"],
+    "cli": ["varchiver.cli", "varchiver.engine.browse_job"],
+}
+
+# Allowed slowdown before a target counts as regressed; import timings are noisy
+TOLERANCE = 0.5
+SLOWEST_SHOWN = 8
+
+
+def profile_imports(modules):
+    """Import modules under -X importtime; returns {module: cumulative ms} and the total"""
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=str(project_root))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env, cwd=str(project_root))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumul, name = line.split("|")
+        if cumul.strip().isdigit():
+            cumulative[name.strip()] = int(cumul) / 1000
+    total = sum(cumulative.get(module, 0) for module in modules)
+    return cumulative, total
+
+
+def measure(modules, runs, ignored):
+    """Fastest of several runs, with the third-party packages it imported"""
+    best_total, best = None, None
+    for _ in range(runs):
+        cumulative, total = profile_imports(modules)
+        if best_total is None or total < best_total:
+            best_total, best = total, cumulative
+    packages = {name.split(".")[0] for name in best} - ignored - {"varchiver"}
+    slowest = sorted(((ms, name) for name, ms in best.items() if name.startswith("varchiver.")
+                      and name not in modules), reverse=True)[:SLOWEST_SHOWN]
+    return {"total_ms": round(best_total, 1),
+            "packages": sorted(name for name in packages
+                               if not name.startswith("_") and importlib.util.find_spec(name)),
+            "slowest": {name: round(ms, 1) for ms, name in slowest}}
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    runs = int(args[0]) if args else 5
+    update = "--update" in sys.argv
+
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    print("🚀 Startup import-time benchmark")
+    print("=" * 60)
+    # The standard library and whatever the bare interpreter imports (site
+    # customizations) are not worth tracking
+    ignored = set(sys.stdlib_module_names) | {name.split(".")[0] for name in profile_imports([])[0]}
+
+    results, regressed = {}, False
+    for target, modules in TARGETS.items():
+        current = measure(modules, runs, ignored)
+        results[target] = current
+        base = baseline.get(target)
+        line = f"{target:>4}  {current['total_ms']:8.1f} ms"
+        if base:
+            change = current["total_ms"] / base["total_ms"] - 1 if base["total_ms"] else 0
+            line += f"  (baseline {base['total_ms']:.1f} ms, {change:+.0%})"
+            new_packages = sorted(set(current["packages"]) - set(base["packages"]))
+            if change > TOLERANCE or new_packages:
+                regressed = True
+                line += "  ❌"
+        print(line)
+        for name, ms in current["slowest"].items():
+            print(f"      {ms:8.1f} ms  {name}")
+        if base and new_packages:
+            print(f"      new packages: {', '.join(new_packages)}")
+
+    if update:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nBaseline written to {BASELINE_FILE}")
+        return 0
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark ZIP verification: one process against a process pool.
+
+Builds a ZIP of moderately compressible members and reports, in MB/s of
+uncompressed data, how fast it can be verified by reading every member
+on one process (as verification used to) and with verify_zip_parallel at
+a few worker counts, with and without hashing the contents for
+comparison against recorded source hashes. The first line is a plain
+sequential read of the archive file, the disk-speed ceiling that
+verification is aiming for.
+
+Usage:
+    python benchmarks/bench_verify.py [size_mb] [workers...]
+
+    size_mb  uncompressed size of the test archive (default: 256)
+    workers  worker counts to try (default: 2 4 and the CPU count)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.parallel_unzip import verify_zip_parallel
+
+MEMBER_SIZE = 4 * 1024 * 1024
+
+
+def build_archive(path, size_mb):
+    block = os.urandom(64 * 1024) + bytes(64 * 1024)  # Compresses to about half
+    member = block * (MEMBER_SIZE // len(block))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for i in range(max(1, size_mb * 1024 * 1024 // MEMBER_SIZE)):
+            archive.writestr(f"data/member_{i:04d}.bin", member)
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        while f.read(8 * 1024 * 1024):
+            pass
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    levels = [int(arg) for arg in sys.argv[2:]] or sorted({2, 4, os.cpu_count() or 1})
+
+    print("🔎 ZIP verification benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.zip")
+        build_archive(path, size_mb)
+        with zipfile.ZipFile(path) as archive:
+            total = sum(info.file_size for info in archive.infolist())
+        print(f"{total / 2**20:.0f} MB in {os.path.getsize(path) / 2**20:.0f} MB compressed, "
+              f"{os.cpu_count()} CPUs")
+        print(f"{'mode':>20} {'seconds':>9} {'MB/s':>9}")
+
+        read_file(path)  # Untimed, so every mode runs from the page cache
+        elapsed, _ = timed(read_file, path)
+        compressed_mb = os.path.getsize(path) / 2**20
+        print(f"{'read archive':>20} {elapsed:9.2f} {compressed_mb / elapsed:9.1f}  (compressed MB/s)")
+
+        serial = None
+        for workers in [1] + levels:
+            for digests in (False, True):
+                # digests hashes every member as comparing against source hashes does
+                elapsed, result = timed(verify_zip_parallel, path, workers=workers, digests=digests)
+                assert not result["errors"], result["errors"]
+                serial = serial or elapsed
+                label = f"{workers} proc{'s' if workers > 1 else ''}" + (" + hash" if digests else "")
+                print(f"{label:>20} {elapsed:9.2f} {total / 2**20 / elapsed:9.1f}  ({serial / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -69,8 +69,9 @@ def show_new_way():
     print("To add a 'Settings' mode, you only need:")
     print()
 
-    print("1. Initialize widget in _init_widgets():")
-    print("   self.settings_widget = SettingsWidget()")
+    print("1. Register a factory in _init_widgets():")
+    print("   'settings_widget': _widget_factory('settings_widget', 'SettingsWidget'),")
+    print("   (imported and built the first time the mode is shown)")
     print()
 
     print("2. Add to _init_modes_config():")
@@ -82,11 +83,7 @@ def show_new_way():
     print("   }")
     print()
 
-    print("3. Add to main layout:")
-    print("   main_layout.addWidget(self.settings_widget)")
-    print()
-
-    print("TOTAL: ~8 lines in 3 centralized places")
+    print("TOTAL: ~7 lines in 2 centralized places")
     print("RISK: Nearly zero - all logic is centralized")
     print()
 
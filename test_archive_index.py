@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Test script for the .arindex archive index format."""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.archive_index import (
+    ArchiveIndex,
+    index_path_for,
+    load_index_entries,
+    write_index,
+)
+
+
+def _fake_archive(tmp):
+    path = os.path.join(tmp, "sample.zip")
+    with open(path, "wb") as f:
+        f.write(b"not really a zip")
+    return path
+
+
+ENTRIES = [
+    {"path": "src/main.py", "size": 120, "compressed": 80, "mtime": 1.5, "offset": 0},
+    {"path": "src/", "is_dir": True},
+    {"path": "README.md", "size": 10, "offset": 512},
+    {"path": "src/utils/ünïcode.txt", "size": 7, "compressed": 7},
+]
+
+
+def test_roundtrip_and_lookup():
+    """Entries come back sorted and are found by binary search"""
+    print("🧪 Testing index round trip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _fake_archive(tmp)
+        write_index(archive, ENTRIES)
+
+        with ArchiveIndex.open(archive) as index:
+            assert len(index) == len(ENTRIES)
+            paths = [e["path"] for e in index]
+            assert paths == sorted(paths, key=lambda p: p.encode("utf-8"))
+            main = index.find("src/main.py")
+            assert main["size"] == 120 and main["compressed"] == 80 and main["offset"] == 0
+            assert index.find("src/")["is_dir"] is True
+            assert index.find("src/utils/ünïcode.txt")["offset"] is None
+            assert index.find("missing") is None
+            assert [e["path"] for e in index.iter_prefix("src/")] == [
+                "src/", "src/main.py", "src/utils/ünïcode.txt"]
+    print("✅ Round trip OK")
+
+
+def test_stale_index_rejected():
+    """Changing the archive invalidates its index"""
+    print("🧪 Testing stale index detection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _fake_archive(tmp)
+        write_index(archive, ENTRIES)
+        time.sleep(0.01)
+        with open(archive, "ab") as f:
+            f.write(b"more")
+        assert ArchiveIndex.open(archive) is None
+    print("✅ Stale index rejected")
+
+
+def test_legacy_index_migrated():
+    """A str(dict) index is read safely and rewritten in the binary format"""
+    print("🧪 Testing legacy index migration...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _fake_archive(tmp)
+        legacy = {"files": [{"name": "a.txt", "path": "a.txt", "size": 3,
+                             "compressed": 3, "is_dir": False}],
+                  "total_size": 3, "compressed_size": 3}
+        with open(index_path_for(archive), "w") as f:
+            f.write(str(legacy))
+
+        entries = load_index_entries(archive)
+        assert [e["path"] for e in entries] == ["a.txt"]
+        with ArchiveIndex.open(archive) as index:
+            assert index.find("a.txt")["size"] == 3
+    print("✅ Legacy index migrated")
+
+
+def test_list_dir_and_sizes():
+    """Directory listings synthesize parents and skip whole subtrees"""
+    print("🧪 Testing directory listing...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _fake_archive(tmp)
+        write_index(archive, ENTRIES + [
+            {"path": "src-old.txt", "size": 1},
+            {"path": "docs/api/index.html", "size": 30},
+        ])
+        with ArchiveIndex.open(archive) as index:
+            top = {e["name"]: e["is_dir"] for e in index.list_dir("")}
+            assert top == {"README.md": False, "docs": True, "src": True, "src-old.txt": False}
+            assert sorted(e["name"] for e in index.list_dir("src")) == ["main.py", "utils"]
+            assert index.size_under("src") == 127
+            assert index.size_under("docs/") == 30
+            assert index.totals_under("docs/") == (30, 30)
+            assert index.list_dir("missing") == []
+    print("✅ Directory listing OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Archive Index Test")
+    print("=" * 60)
+    try:
+        test_roundtrip_and_lookup()
+        test_stale_index_rejected()
+        test_legacy_index_migrated()
+        test_list_dir_and_sizes()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
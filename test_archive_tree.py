@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test script for building archive trees from flat listings."""
+
+import sys
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import os
+import tempfile
+
+from varchiver.utils.archive_index import ArchiveIndex, write_index
+from varchiver.utils.archive_tree import IndexTreeSource, NodeTreeSource, build_tree
+
+LISTING = [
+    {"path": "project/src/main.py", "size": 100, "compressed": 40},
+    {"path": "project/src/util.py", "size": 50, "compressed": 20},
+    {"path": "project/README.md", "size": 10},
+    {"path": "project/empty/", "is_dir": True},
+    {"path": "./project/docs\\guide.md", "size": 5},
+    {"path": "../outside.txt", "size": 1},
+]
+
+
+def test_tree_shape():
+    """Missing parents are created and children are sorted dirs first"""
+    print("🧪 Testing tree shape...")
+    root = build_tree(LISTING)
+    project = root.children["project"]
+    assert [n.name for n in project.sorted_children()] == ["docs", "empty", "src", "README.md"]
+    assert project.children["src"].children["main.py"].path == "project/src/main.py"
+    assert project.children["empty"].is_dir and not project.children["empty"].children
+    assert "outside.txt" not in root.children and ".." not in root.children
+    assert root.file_count() == 4
+    print("✅ Tree shape OK")
+
+
+def test_sizes_and_duplicates():
+    """Directory sizes total their files; a repeated entry replaces the first"""
+    print("🧪 Testing directory sizes...")
+    root = build_tree(LISTING + [{"path": "project/src/main.py", "size": 40}])
+    assert root.children["project"].children["src"].size == 90
+    assert root.size == 40 + 50 + 10 + 5
+    print("✅ Sizes OK")
+
+
+def test_progress_and_cancel():
+    """Progress is throttled and always ends at 100; cancel returns None"""
+    print("🧪 Testing progress and cancellation...")
+    calls = []
+    listing = [{"path": f"d/f{i}", "size": 1} for i in range(10000)]
+    build_tree(listing, progress_callback=calls.append, interval=60)
+    assert calls == [100]
+    assert build_tree(listing, cancel_check=lambda: True) is None
+    print("✅ Progress and cancellation OK")
+
+
+def test_tree_sources_agree():
+    """Index-backed and in-memory sources list the same children and sizes"""
+    print("🧪 Testing tree sources...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "sample.zip")
+        with open(archive, "wb") as f:
+            f.write(b"placeholder")
+        listing = [e for e in LISTING if ".." not in e["path"] and "\\" not in e["path"]]
+        write_index(archive, listing)
+        node_source = NodeTreeSource.from_entries(listing)
+        index_source = IndexTreeSource(ArchiveIndex.open(archive))
+        try:
+            for path in ("", "project", "project/src", "project/empty"):
+                assert ([(n.name, n.is_dir) for n in node_source.children(path)]
+                        == [(n.name, n.is_dir) for n in index_source.children(path)])
+            assert node_source.dir_size("project/src") == index_source.dir_size("project/src") == 150
+            assert node_source.dir_totals("project") == index_source.dir_totals("project") == (160, 70)
+        finally:
+            index_source.close()
+    print("✅ Tree sources OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Archive Tree Test")
+    print("=" * 60)
+    try:
+        test_tree_shape()
+        test_sizes_and_duplicates()
+        test_progress_and_cancel()
+        test_tree_sources_agree()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Test script for the headless varchiver-cli."""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver import cli
+
+
+def _run(*argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = cli.main(["-q", *argv])
+    return code, out.getvalue()
+
+
+def _make_source(root):
+    os.makedirs(os.path.join(root, "sub"))
+    with open(os.path.join(root, "a.txt"), "w") as f:
+        f.write("alpha\n" * 100)
+    with open(os.path.join(root, "sub", "b.txt"), "w") as f:
+        f.write("beta\n")
+
+
+def test_round_trip():
+    """create, list, verify and extract agree with each other"""
+    print("🧪 Testing create/list/verify/extract...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        for ext in (".zip", ".tar.gz", ".tar"):
+            archive = os.path.join(tmp, "x" + ext)
+            assert _run("create", archive, src)[0] == 0
+
+            code, out = _run("list", archive)
+            assert code == 0
+            assert {"a.txt", "sub/b.txt"} <= set(out.split())
+
+            code, out = _run("list", "--json", archive)
+            sizes = {e["path"]: e["size"] for e in json.loads(out)}
+            assert sizes["a.txt"] == 600
+
+            code, out = _run("verify", "--json", archive)
+            report = json.loads(out)
+            assert code == 0 and report["ok"] and report["members_checked"] >= 2
+
+            dest = os.path.join(tmp, "out" + ext)
+            assert _run("extract", archive, "-o", dest)[0] == 0
+            with open(os.path.join(dest, "sub", "b.txt")) as f:
+                assert f.read() == "beta\n"
+    print("✅ Round trip OK")
+
+
+def test_verify_detects_damage():
+    """A corrupted member makes verify fail"""
+    print("🧪 Testing verify on a damaged ZIP...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        archive = os.path.join(tmp, "x.zip")
+        assert _run("create", "-c", "0", archive, src)[0] == 0
+        with open(archive, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"alpha\nalpha"))
+            f.write(b"ALPHA")
+        code, out = _run("verify", "--json", archive)
+        report = json.loads(out)
+        assert code == 1 and not report["ok"] and report["errors"]
+    print("✅ Damage detected OK")
+
+
+def test_update():
+    """update copies new files and --delete removes stale ones"""
+    print("🧪 Testing update...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        dst = os.path.join(tmp, "dst")
+        _make_source(src)
+        os.makedirs(dst)
+        with open(os.path.join(dst, "stale.txt"), "w") as f:
+            f.write("old")
+        assert _run("update", "--delete", src, dst)[0] == 0
+        assert os.path.exists(os.path.join(dst, "sub", "b.txt"))
+        assert not os.path.exists(os.path.join(dst, "stale.txt"))
+    print("✅ Update OK")
+
+
+def test_extract_rename():
+    """--collision rename keeps the existing file and writes the member beside it"""
+    print("🧪 Testing extraction with --collision rename...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        for ext in (".zip", ".tar", ".tar.gz"):
+            archive = os.path.join(tmp, "x" + ext)
+            assert _run("create", archive, src)[0] == 0
+            dest = os.path.join(tmp, "out" + ext)
+            os.makedirs(os.path.join(dest, "sub"))
+            with open(os.path.join(dest, "sub", "b.txt"), "w") as f:
+                f.write("mine")
+            assert _run("extract", archive, "-o", dest, "--collision", "rename")[0] == 0
+            with open(os.path.join(dest, "sub", "b.txt")) as f:
+                assert f.read() == "mine"
+            with open(os.path.join(dest, "sub", "b_1.txt")) as f:
+                assert f.read() == "beta\n"
+            assert sorted(os.listdir(dest)) == ["a.txt", "sub"], os.listdir(dest)
+    print("✅ Rename OK")
+
+
+def test_duplicate_tar_members():
+    """A tar with a repeated member name fails extraction instead of skipping it"""
+    print("🧪 Testing duplicate tar members...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "dup.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            for data in (b"first", b"second"):
+                info = tarfile.TarInfo("same.txt")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        code, _ = _run("extract", archive, "-o", os.path.join(tmp, "out"))
+        assert code == 1
+    print("✅ Duplicate members OK")
+
+
+def test_tar_member_outside_destination():
+    """A '../' tar member is refused instead of written beside the output"""
+    print("🧪 Testing tar members outside the destination...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "evil.tar")
+        with tarfile.open(archive, "w") as tar:
+            info = tarfile.TarInfo("../evil")
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"evil"))
+        code, _ = _run("extract", archive, "-o", os.path.join(tmp, "out"))
+        assert code == 1
+        assert not os.path.exists(os.path.join(tmp, "evil"))
+    print("✅ Outside members refused OK")
+
+
+def test_no_qt_import():
+    """Running a command never imports PyQt6"""
+    print("🧪 Testing that the CLI stays Qt-free...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        archive = os.path.join(tmp, "x.zip")
+        assert _run("create", archive, src)[0] == 0
+        code = (
+            "import sys; from varchiver import cli\n"
+            f"cli.main(['-q', 'list', {archive!r}])\n"
+            f"cli.main(['-q', 'verify', {archive!r}])\n"
+            "sys.exit(any(m.startswith('PyQt6') for m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=str(project_root),
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+    print("✅ No Qt import OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Headless CLI Test")
+    print("=" * 60)
+    try:
+        test_round_trip()
+        test_verify_detects_damage()
+        test_update()
+        test_extract_rename()
+        test_duplicate_tar_members()
+        test_tar_member_outside_destination()
+        test_no_qt_import()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
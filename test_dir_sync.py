@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test script for incremental directory sync."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.dir_sync import sync_directories
+from varchiver.utils.pattern_utils import get_skip_matcher
+
+
+def _write(root, rel, data, mtime=None):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _make_source(root):
+    _write(root, "a.txt", "alpha", 1_600_000_000)
+    _write(root, "sub/b.txt", "bravo bravo", 1_600_000_000)
+    _write(root, "sub/deep/c.txt", "charlie", 1_600_000_000)
+
+
+def test_only_changes_are_copied():
+    """A second sync copies nothing; a modified file is the only one copied"""
+    print("🧪 Testing incremental copies...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "src"), os.path.join(tmp, "dst")
+        _make_source(src)
+
+        first = sync_directories(src, dst)
+        assert first.files_copied == 3 and first.bytes_copied == 23
+
+        again = sync_directories(src, dst)
+        assert again.files_copied == 0 and again.files_unchanged == 3
+
+        _write(src, "sub/b.txt", "bravo BRAVO!", 1_700_000_000)
+        progress = []
+        changed = sync_directories(src, dst, progress_callback=lambda d, t: progress.append((d, t)))
+        assert changed.files_copied == 1 and changed.bytes_copied == 12
+        assert progress[-1] == (12, 12)
+        with open(os.path.join(dst, "sub", "b.txt")) as f:
+            assert f.read() == "bravo BRAVO!"
+        assert not [n for n in os.listdir(os.path.join(dst, "sub")) if n.endswith("varchiver-tmp")]
+    print("✅ Incremental copies OK")
+
+
+def test_checksum_fixes_timestamps():
+    """Same content with a new mtime is hashed, not copied, and then matches by mtime"""
+    print("🧪 Testing checksum comparison...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "src"), os.path.join(tmp, "dst")
+        _make_source(src)
+        sync_directories(src, dst)
+        os.utime(os.path.join(src, "a.txt"), (1_700_000_000, 1_700_000_000))
+
+        stats = sync_directories(src, dst, checksum=True)
+        assert stats.files_copied == 0 and stats.bytes_hashed == 10
+        assert int(os.path.getmtime(os.path.join(dst, "a.txt"))) == 1_700_000_000
+        assert sync_directories(src, dst, checksum=True).bytes_hashed == 0
+    print("✅ Checksum comparison OK")
+
+
+def test_delete_extraneous():
+    """Files missing from the source are removed, except skipped ones"""
+    print("🧪 Testing deletion...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "src"), os.path.join(tmp, "dst")
+        _make_source(src)
+        sync_directories(src, dst)
+        _write(dst, "old/stale.txt", "stale")
+        _write(dst, "debug.log", "keep me")
+
+        matcher = get_skip_matcher(["*.log"])
+        kept = sync_directories(src, dst, skip=matcher.match)
+        assert kept.files_deleted == 0 and os.path.exists(os.path.join(dst, "old", "stale.txt"))
+
+        stats = sync_directories(src, dst, skip=matcher.match, delete=True)
+        assert stats.files_deleted == 1 and stats.dirs_deleted == 1
+        assert not os.path.exists(os.path.join(dst, "old"))
+        assert os.path.exists(os.path.join(dst, "debug.log"))
+    print("✅ Deletion OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Directory Sync Test")
+    print("=" * 60)
+    try:
+        test_only_changes_are_copied()
+        test_checksum_fixes_timestamps()
+        test_delete_extraneous()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
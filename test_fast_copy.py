@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Test script for the zero-copy file copy engine."""
+
+import errno
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils import fast_copy
+from varchiver.utils.fast_copy import STRATEGIES, copy_file, copy_many, copy_tree
+
+
+def _write(path, data, mtime=1_600_000_000):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_copy_file():
+    """Contents, size and mtime survive, whichever strategy the filesystem allows"""
+    print("🧪 Testing single file copy...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        src = _write(os.path.join(tmp, "src.bin"), data)
+        dst = os.path.join(tmp, "dst.bin")
+        strategy, size = copy_file(src, dst)
+        assert strategy in STRATEGIES and size == len(data)
+        with open(dst, "rb") as f:
+            assert f.read() == data
+        assert int(os.path.getmtime(dst)) == 1_600_000_000
+
+        empty = _write(os.path.join(tmp, "empty"), b"")
+        assert copy_file(empty, os.path.join(tmp, "empty.copy"))[1] == 0
+    print(f"✅ Single file copy OK (via {strategy})")
+
+
+def test_fallback_when_unsupported():
+    """A strategy failing with 'not supported' falls through and is remembered"""
+    print("🧪 Testing strategy fallback...")
+    real_copy_range = fast_copy._copy_range
+    real_ioctl = fast_copy.fcntl.ioctl if fast_copy.fcntl else None
+    calls = []
+
+    def unsupported(*args, **kwargs):
+        calls.append(args[0] if isinstance(args[0], str) else "reflink")
+        raise OSError(errno.EXDEV, "cross-device")
+
+    fast_copy._copy_range = unsupported
+    if fast_copy.fcntl:
+        fast_copy.fcntl.ioctl = unsupported
+    fast_copy._unsupported.clear()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = _write(os.path.join(tmp, "a.txt"), b"hello" * 1000)
+            assert copy_file(src, os.path.join(tmp, "b.txt")) == ("userspace", 5000)
+            first_calls = len(calls)
+            assert copy_file(src, os.path.join(tmp, "c.txt"))[0] == "userspace"
+            assert len(calls) == first_calls  # Not retried for the same devices
+            with open(os.path.join(tmp, "c.txt"), "rb") as f:
+                assert f.read() == b"hello" * 1000
+    finally:
+        fast_copy._copy_range = real_copy_range
+        if real_ioctl:
+            fast_copy.fcntl.ioctl = real_ioctl
+        fast_copy._unsupported.clear()
+    print("✅ Strategy fallback OK")
+
+
+def test_permission_error_falls_back_per_file():
+    """EPERM makes one file fall back without ruling the strategy out for the devices"""
+    print("🧪 Testing per-file fallback...")
+    real_copy_range = fast_copy._copy_range
+    real_ioctl = fast_copy.fcntl.ioctl if fast_copy.fcntl else None
+
+    def refused(*args, **kwargs):
+        raise OSError(errno.EPERM, "operation not permitted")
+
+    fast_copy._copy_range = refused
+    if fast_copy.fcntl:
+        fast_copy.fcntl.ioctl = refused
+    fast_copy._unsupported.clear()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = _write(os.path.join(tmp, "a.txt"), b"hello" * 1000)
+            assert copy_file(src, os.path.join(tmp, "b.txt")) == ("userspace", 5000)
+            assert not any(fast_copy._unsupported.values())
+    finally:
+        fast_copy._copy_range = real_copy_range
+        if real_ioctl:
+            fast_copy.fcntl.ioctl = real_ioctl
+        fast_copy._unsupported.clear()
+    print("✅ Per-file fallback OK")
+
+
+def test_copy_many_and_tree():
+    """Batches report totals and strategies; trees keep structure and symlinks"""
+    print("🧪 Testing batch and tree copies...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        for i in range(50):
+            _write(os.path.join(src, f"d{i % 5}", f"f{i}.txt"), b"x" * i)
+        os.makedirs(os.path.join(src, "empty_dir"))
+        os.symlink("d0/f0.txt", os.path.join(src, "link"))
+
+        copied = []
+        result = copy_tree(src, os.path.join(tmp, "dst"), workers=4,
+                           on_copied=lambda s, d, strategy, size: copied.append(size))
+        assert result.files == 50 and result.bytes == sum(range(50))
+        assert sum(result.strategies.values()) == 50 and not result.errors
+        assert sorted(copied) == list(range(50))
+        assert os.path.isdir(os.path.join(tmp, "dst", "empty_dir"))
+        assert os.readlink(os.path.join(tmp, "dst", "link")) == "d0/f0.txt"
+        assert "50 files" in result.summary()
+
+        pairs = [(os.path.join(src, "d1", "f1.txt"), os.path.join(tmp, "new", "deep", "f1.txt")),
+                 (os.path.join(src, "missing"), os.path.join(tmp, "new", "missing"))]
+        result = copy_many(pairs)
+        assert result.files == 1 and len(result.errors) == 1
+        assert os.path.getsize(os.path.join(tmp, "new", "deep", "f1.txt")) == 1
+
+        cancelled = copy_many(pairs, cancel_check=lambda: True)
+        assert cancelled.files == 0 and not cancelled.errors
+    print("✅ Batch and tree copies OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Fast Copy Test")
+    print("=" * 60)
+    try:
+        test_copy_file()
+        test_fallback_when_unsupported()
+        test_permission_error_falls_back_per_file()
+        test_copy_many_and_tree()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test script for the parallel os.scandir directory scanner."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.fs_scan import scan_paths
+
+
+def _make_tree(root):
+    """Small project tree with a dependency directory that should be pruned"""
+    layout = {
+        "src/app.py": b"print('hi')\n",
+        "src/pkg/mod.py": b"x = 1\n",
+        "README.md": b"# readme\n",
+        "debug.log": b"noise\n",
+        "node_modules/lib/index.js": b"module.exports = {}\n",
+    }
+    for rel, data in layout.items():
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return layout
+
+
+def test_scan_records():
+    """Every file is reported once with its base dir, size and mtime"""
+    print("🧪 Testing scan records...")
+    with tempfile.TemporaryDirectory() as tmp:
+        layout = _make_tree(tmp)
+        records = list(scan_paths([tmp], workers=4))
+        found = {os.path.relpath(r.path, tmp): r for r in records}
+        assert set(found) == {rel.replace("/", os.sep) for rel in layout}
+        for rel, data in layout.items():
+            record = found[rel.replace("/", os.sep)]
+            assert record.base_dir == tmp
+            assert record.size == len(data)
+            assert record.mtime == os.path.getmtime(record.path)
+    print("✅ Scan records OK")
+
+
+def test_pruning_and_skips():
+    """Pruned directories are never listed; skipped files are left out"""
+    print("🧪 Testing directory pruning...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        dir_checks = []
+
+        def skip_dir(path):
+            dir_checks.append(os.path.relpath(path, tmp))
+            return os.path.basename(path) == "node_modules"
+
+        records = list(scan_paths([tmp], skip_file=lambda p: p.endswith(".log"),
+                                  skip_dir=skip_dir))
+        names = sorted(os.path.relpath(r.path, tmp) for r in records)
+        assert names == sorted(["README.md", os.path.join("src", "app.py"),
+                                os.path.join("src", "pkg", "mod.py")])
+        assert os.path.join("node_modules", "lib") not in dir_checks
+    print("✅ Pruning OK")
+
+
+def test_single_file_and_cancel():
+    """A file argument uses its parent as base; cancelling stops the scan"""
+    print("🧪 Testing file arguments and cancellation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp)
+        readme = os.path.join(tmp, "README.md")
+        records = list(scan_paths([readme]))
+        assert len(records) == 1 and records[0].base_dir == tmp
+        assert list(scan_paths([tmp], cancel_check=lambda: True)) == []
+    print("✅ File arguments and cancellation OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Directory Scanner Test")
+    print("=" * 60)
+    try:
+        test_scan_records()
+        test_pruning_and_skips()
+        test_single_file_and_cancel()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Test script for random access into .tar.gz archives via seek indexes."""
+
+import gzip
+import io
+import os
+import random
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.gzip_index import (
+    SeekableGzipReader,
+    _cached_checkpoints,
+    _checkpoint_cache,
+    build_tar_gz_index,
+    has_seek_points,
+    iter_tar_members,
+    load_seek_index,
+    open_tar_member,
+)
+from varchiver.engine.extraction_job import ExtractionJob
+from varchiver.utils.archive_index import write_index
+from varchiver.utils.parallel_compress import ParallelCompressedWriter
+
+rng = random.Random(6)
+FILES = {f"data/file_{i:02d}.bin": rng.randbytes(rng.randint(0, 200_000)) for i in range(30)}
+
+
+def _write_tar(stream):
+    with tarfile.open(fileobj=stream, mode="w") as tar:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _single_member_archive(tmp):
+    path = os.path.join(tmp, "single.tar.gz")
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+        _write_tar(gz)
+    return path
+
+
+def _multi_member_archive(tmp):
+    path = os.path.join(tmp, "multi.tar.gz")
+    writer = ParallelCompressedWriter(path, codec="gz", level=6, block_size=128 * 1024)
+    _write_tar(writer)
+    writer.close()
+    return path
+
+
+def _check_every_member(archive, entries):
+    # Reverse order forces a restart from an earlier seek point each time
+    for entry in reversed(entries):
+        tar, member = open_tar_member(archive, entry["offset"])
+        with tar:
+            assert member.name == entry["path"]
+            assert tar.extractfile(member).read() == FILES[member.name]
+
+
+def test_reader_seeks():
+    """Seeking lands on the same bytes a sequential read produces"""
+    print("🧪 Testing seekable gzip reader...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _single_member_archive(tmp)
+        with gzip.open(archive, "rb") as f:
+            plain = f.read()
+        with SeekableGzipReader(archive, span=256 * 1024) as reader:
+            reader.read()
+            assert reader.checkpoints
+            for offset in (len(plain) - 10, 5, len(plain) // 2, 0):
+                reader.seek(offset)
+                assert reader.read(10) == plain[offset:offset + 10]
+    print("✅ Reader seeks OK")
+
+
+def test_single_member_archive():
+    """Foreign single-member archives are indexed on first pass"""
+    print("🧪 Testing single-member .tar.gz...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _single_member_archive(tmp)
+        entries = build_tar_gz_index(archive, span=256 * 1024)
+        assert sorted(e["path"] for e in entries) == sorted(FILES)
+        assert load_seek_index(archive) == [(0, 0)]
+        assert _cached_checkpoints(archive)
+        _check_every_member(archive, entries)
+    print("✅ Single-member archive OK")
+
+
+def test_multi_member_archive():
+    """Block-parallel archives resume at persisted member boundaries"""
+    print("🧪 Testing multi-member .tar.gz...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _multi_member_archive(tmp)
+        entries = build_tar_gz_index(archive)
+        assert len(load_seek_index(archive)) > 1
+        _check_every_member(archive, entries)
+    print("✅ Multi-member archive OK")
+
+
+def test_one_pass_over_many_members():
+    """iter_tar_members reads every selected member through one forward pass"""
+    print("🧪 Testing many members through one reader...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _single_member_archive(tmp)
+        entries = build_tar_gz_index(archive, span=256 * 1024)
+        wanted = entries[::3]
+        restarts = []
+        original = SeekableGzipReader._restart
+
+        def counting_restart(self, *args):
+            restarts.append(args[0])
+            return original(self, *args)
+
+        SeekableGzipReader._restart = counting_restart
+        try:
+            found = []
+            for tar, member in iter_tar_members(archive, [e["offset"] for e in reversed(wanted)]):
+                found.append(member.name)
+                assert tar.extractfile(member).read() == FILES[member.name]
+        finally:
+            SeekableGzipReader._restart = original
+        assert found == [e["path"] for e in wanted]
+        # Only the opening position and forward jumps to checkpoints
+        assert restarts == sorted(restarts)
+    print("✅ One pass OK")
+
+
+def test_no_seek_points_falls_back():
+    """Selected members use the seek index, or one stream once no seek point is left"""
+    print("🧪 Testing fallback for single-member archives...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _single_member_archive(tmp)
+        entries = build_tar_gz_index(archive, span=256 * 1024)
+        write_index(archive, entries)
+        assert has_seek_points(archive)
+        wanted = [entries[0]["path"], entries[-1]["path"]]
+        seek_out = os.path.join(tmp, "seek")
+        job = ExtractionJob(archive, seek_out, collision_strategy="skip", file_list=wanted)
+        assert job._extract_tar_gz_random_access()
+        for name in wanted:
+            with open(os.path.join(seek_out, name), "rb") as f:
+                assert f.read() == FILES[name]
+
+        _checkpoint_cache.clear()  # As after a restart
+        assert not has_seek_points(archive)
+        out = os.path.join(tmp, "out")
+        job = ExtractionJob(archive, out, collision_strategy="skip", file_list=wanted)
+        assert not job._extract_tar_gz_random_access()
+        errors = []
+        job.error.connect(lambda msg, _perm: errors.append(msg))
+        job.run()
+        assert not errors, errors
+        for name in wanted:
+            with open(os.path.join(out, name), "rb") as f:
+                assert f.read() == FILES[name]
+    print("✅ Fallback OK")
+
+
+def test_random_access_refuses_outside_members():
+    """A '../' member selected through the seek index is not written outside"""
+    print("🧪 Testing random access with an escaping member...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "evil.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            # A large first member so decompressor checkpoints exist past 0
+            for name, data in (("ok.bin", rng.randbytes(512 * 1024)), ("../evil", b"data")):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        write_index(archive, build_tar_gz_index(archive, span=64 * 1024))
+        assert has_seek_points(archive)
+        job = ExtractionJob(archive, os.path.join(tmp, "out"), collision_strategy="skip",
+                            file_list=["../evil"])
+        try:
+            job._extract_tar_gz_random_access()
+        except tarfile.TarError:
+            pass
+        else:
+            raise AssertionError("'../evil' was extracted")
+        assert not os.path.exists(os.path.join(tmp, "evil"))
+    print("✅ Escaping member refused OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Gzip Seek Index Test")
+    print("=" * 60)
+    try:
+        test_reader_seeks()
+        test_single_member_archive()
+        test_multi_member_archive()
+        test_one_pass_over_many_members()
+        test_no_seek_points_falls_back()
+        test_random_access_refuses_outside_members()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Test script for the concurrent job scheduler."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.engine.callbacks import Callback
+from varchiver.engine.scheduler import JobScheduler, CANCELLED, DONE, FAILED, PAUSED, RUNNING
+
+
+class FakeJob:
+    """Reports progress in steps until done or cancelled"""
+
+    live = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, steps=5, delay=0.01, fail=False):
+        self.progress = Callback()
+        self.status = Callback()
+        self.error = Callback()
+        self.finished = Callback()
+        self.steps = steps
+        self.delay = delay
+        self.fail = fail
+        self.cancelled = False
+
+    def run(self):
+        with FakeJob.lock:
+            FakeJob.live += 1
+            FakeJob.peak = max(FakeJob.peak, FakeJob.live)
+        try:
+            for step in range(1, self.steps + 1):
+                if self.cancelled:
+                    return
+                time.sleep(self.delay)
+                self.progress.emit(step * 100 // self.steps)
+            if self.fail:
+                self.error.emit("boom", False)
+                return
+            self.finished.emit("ok")
+        finally:
+            with FakeJob.lock:
+                FakeJob.live -= 1
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_ordering_and_budgets():
+    """Largest jobs start first, within max_jobs and the CPU budget"""
+    print("🧪 Testing ordering and budgets...")
+    FakeJob.peak = 0
+    scheduler = JobScheduler(max_jobs=3, cpu_budget=6)
+    started, shares = [], []
+    scheduler.job_updated.connect(
+        lambda j: j.state == RUNNING and j.label not in started and started.append(j.label))
+
+    def factory(workers):
+        shares.append(workers)
+        return FakeJob()
+
+    with scheduler.batch():
+        for size in (10, 50, 30, 40, 20):
+            scheduler.submit('extract', f"size{size}", factory, size=size)
+        scheduler.submit('extract', "urgent", factory, size=1, priority=1)
+    assert scheduler.wait(10)
+    assert started[:4] == ["urgent", "size50", "size40", "size30"]
+    assert FakeJob.peak <= 3
+    assert shares[:3] == [2, 2, 2]
+    assert scheduler.counts()[DONE] == 6
+    print("✅ Ordering and budgets OK")
+
+
+def test_pause_resume_cancel():
+    """Paused jobs stop at their next report, cancelled ones never finish"""
+    print("🧪 Testing pause, resume and cancel...")
+    scheduler = JobScheduler(max_jobs=1)
+    with scheduler.batch():
+        first = scheduler.submit('extract', "first", lambda w: FakeJob(steps=50), size=2)
+        second = scheduler.submit('extract', "second", lambda w: FakeJob(), size=1)
+    _wait_for(lambda: first.progress > 0)
+    scheduler.pause(first.id)
+    assert first.state == PAUSED
+    time.sleep(0.05)
+    held = first.progress
+    time.sleep(0.05)
+    assert first.progress == held < 100
+    scheduler.cancel(second.id)
+    assert second.state == CANCELLED
+    scheduler.resume(first.id)
+    assert scheduler.wait(10)
+    assert first.state == DONE and first.result == "ok"
+    assert second.started is None
+
+    failing = scheduler.submit('extract', "failing", lambda w: FakeJob(fail=True))
+    slow = scheduler.submit('extract', "slow", lambda w: FakeJob(steps=1000))
+    _wait_for(lambda: slow.progress > 0)
+    scheduler.cancel(slow.id)
+    assert scheduler.wait(10)
+    assert failing.state == FAILED and failing.errors == ["boom"]
+    assert slow.state == CANCELLED
+    print("✅ Pause, resume and cancel OK")
+
+
+def test_extract_and_create():
+    """Real extraction and archive jobs run side by side"""
+    print("🧪 Testing concurrent extraction and creation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archives = []
+        for i in range(8):
+            path = os.path.join(tmp, f"a{i}.zip")
+            with zipfile.ZipFile(path, "w") as archive:
+                for j in range(i + 1):
+                    archive.writestr(f"dir/f{j}.txt", f"{i}-{j}" * 100)
+            archives.append(path)
+        src = os.path.join(tmp, "src")
+        os.makedirs(src)
+        with open(os.path.join(src, "hello.txt"), "w") as f:
+            f.write("hello")
+
+        scheduler = JobScheduler(max_jobs=4, cpu_budget=4)
+        finished = []
+        scheduler.job_finished.connect(finished.append)
+        with scheduler.batch():
+            for path in archives:
+                scheduler.submit_extraction(path, os.path.join(tmp, "out", os.path.basename(path)),
+                                            collision_strategy="skip")
+            created = scheduler.submit_archive([src], os.path.join(tmp, "new.zip"))
+        assert scheduler.wait(60)
+        assert len(finished) == 9 and all(j.state == DONE for j in finished), \
+            [(j.label, j.state, j.errors) for j in finished]
+        for i in range(8):
+            assert len(os.listdir(os.path.join(tmp, "out", f"a{i}.zip", "dir"))) == i + 1
+        assert created.result == os.path.join(tmp, "new.zip")
+        with zipfile.ZipFile(created.result) as archive:
+            assert archive.read("hello.txt") == b"hello"
+    print("✅ Concurrent extraction and creation OK")
+
+
+def test_unattended_collisions():
+    """'ask' extractions skip instead of waiting; silent jobs are FAILED"""
+    print("🧪 Testing unattended collisions...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("f.txt", "new")
+            archive.writestr("g.txt", "other")
+        out = os.path.join(tmp, "out")
+        os.makedirs(out)
+        with open(os.path.join(out, "f.txt"), "w") as f:
+            f.write("old")
+
+        scheduler = JobScheduler(max_jobs=2)
+        job = scheduler.submit_extraction(path, out, collision_strategy="ask")
+
+        class SilentJob(FakeJob):
+            def run(self):
+                pass
+
+        silent = scheduler.submit("extract", "silent", lambda workers: SilentJob())
+        assert scheduler.wait(30)
+        assert job.state == DONE, (job.state, job.errors)
+        with open(os.path.join(out, "f.txt")) as f:
+            assert f.read() == "old"
+        assert sorted(os.listdir(out)) == ["f.txt", "g.txt"]
+        assert silent.state == FAILED and silent.errors
+    print("✅ Unattended collisions OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Job Scheduler Test")
+    print("=" * 60)
+    try:
+        test_ordering_and_budgets()
+        test_pause_resume_cancel()
+        test_extract_and_create()
+        test_unattended_collisions()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test script for the bounded, persistent archive listing cache."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.listing_cache import ListingCache
+
+LISTING = [
+    {"path": "project/", "size": 0, "is_dir": True},
+    {"path": "project/main.py", "size": 120, "is_dir": False},
+    {"path": "project/data.bin", "size": 4096, "is_dir": False},
+]
+
+
+def _make_archive(tmp, name="sample.zip", data=b"placeholder"):
+    path = os.path.join(tmp, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_memory_hits_and_invalidation():
+    """A changed archive misses; counters track hits and misses"""
+    print("🧪 Testing in-memory cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _make_archive(tmp)
+        cache = ListingCache(cache_dir=None)
+        assert cache.get(archive) is None
+        cache.put(archive, LISTING)
+        assert cache.get(archive) == LISTING
+        with open(archive, "ab") as f:
+            f.write(b"more")
+        assert cache.get(archive) is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    print("✅ In-memory cache OK")
+
+
+def test_bounds():
+    """The LRU drops the oldest listing beyond the entry and byte budgets"""
+    print("🧪 Testing cache bounds...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archives = [_make_archive(tmp, f"a{i}.zip") for i in range(3)]
+        cache = ListingCache(cache_dir=None, max_entries=2)
+        for archive in archives:
+            cache.put(archive, LISTING)
+        assert cache.get(archives[0]) is None
+        assert cache.get(archives[2]) == LISTING
+
+        small = ListingCache(cache_dir=None, max_bytes=1000)
+        small.put(archives[0], LISTING)
+        small.put(archives[1], LISTING)
+        assert small.stats()["entries"] == 1
+        assert small.stats()["bytes"] <= 1000
+    print("✅ Cache bounds OK")
+
+
+def test_persistence():
+    """Listings survive a new cache instance unless persist=False"""
+    print("🧪 Testing persisted listings...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        archive = _make_archive(tmp)
+        secret = _make_archive(tmp, "secret.7z")
+        first = ListingCache(cache_dir=cache_dir)
+        first.put(archive, LISTING)
+        first.put(secret, LISTING, persist=False)
+
+        second = ListingCache(cache_dir=cache_dir)
+        assert second.get(archive) == LISTING
+        assert second.get(secret) is None
+        assert len(os.listdir(cache_dir)) == 1
+
+        pruned = ListingCache(cache_dir=cache_dir, max_disk_bytes=0)
+        pruned.put(secret, LISTING)
+        assert os.listdir(cache_dir) == []
+    print("✅ Persisted listings OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Listing Cache Test")
+    print("=" * 60)
+    try:
+        test_memory_hits_and_invalidation()
+        test_bounds()
+        test_persistence()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test script for the block-parallel compressed stream writer."""
+
+import io
+import os
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.parallel_compress import ParallelCompressedWriter
+
+
+def _write_tar(path, codec, files, block_size=64 * 1024):
+    """Write files into a tar compressed through ParallelCompressedWriter"""
+    stream = ParallelCompressedWriter(path, codec=codec, level=6, workers=4, block_size=block_size)
+    with tarfile.open(fileobj=stream, mode="w") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    stream.close()
+    return stream
+
+
+def test_multi_block_tar_roundtrip():
+    """Tarballs written as concatenated blocks read back with tarfile"""
+    print("🧪 Testing block-parallel tar output...")
+    files = {f"dir/file_{i}.bin": os.urandom(5000) * (i + 1) for i in range(40)}
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec, ext in (("gz", ".tar.gz"), ("bz2", ".tar.bz2"), ("xz", ".tar.xz")):
+            path = os.path.join(tmp, "out" + ext)
+            stream = _write_tar(path, codec, files)
+            assert len(stream.seek_points) > 1, "expected several independent blocks"
+            assert stream.bytes_out == os.path.getsize(path)
+            with tarfile.open(path, "r:*") as tar:
+                for name, data in files.items():
+                    assert tar.extractfile(name).read() == data
+            print(f"✅ {codec}: {len(stream.seek_points)} blocks OK")
+
+
+def test_empty_stream():
+    """Closing without writing still produces a valid compressed file"""
+    print("🧪 Testing empty stream...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "empty.tar.gz")
+        _write_tar(path, "gz", {})
+        with tarfile.open(path, "r:gz") as tar:
+            assert tar.getnames() == []
+    print("✅ Empty stream OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Parallel Compressed Writer Test")
+    print("=" * 60)
+    try:
+        test_multi_block_tar_roundtrip()
+        test_empty_stream()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test script for parallel ZIP extraction."""
+
+import os
+import stat
+import sys
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils import parallel_unzip
+from varchiver.utils.parallel_unzip import extract_zip_parallel, partition_members
+
+
+def _make_archive(tmp, count=40):
+    """ZIP with a directory entry, executable members and mixed sizes"""
+    archive = os.path.join(tmp, "in.zip")
+    contents = {}
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo("empty_dir/"), b"")
+        for i in range(count):
+            name = f"pkg_{i % 4}/file_{i}.txt"
+            data = (f"row {i}\n" * (i * 50)).encode()
+            info = zipfile.ZipInfo(name)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o755 if i % 2 else 0o644) << 16
+            zf.writestr(info, data)
+            contents[name] = data
+    return archive, contents
+
+
+def _check_output(out, contents):
+    assert os.path.isdir(os.path.join(out, "empty_dir"))
+    for i, (name, data) in enumerate(contents.items()):
+        path = os.path.join(out, name)
+        with open(path, "rb") as f:
+            assert f.read() == data
+        assert stat.S_IMODE(os.stat(path).st_mode) == (0o755 if i % 2 else 0o644)
+
+
+def test_partition_members():
+    """Batches cover every member once and stay near the byte target"""
+    print("🧪 Testing member partitioning...")
+    infos = []
+    for i in range(100):
+        info = zipfile.ZipInfo(f"f{i}")
+        info.compress_size = (i % 10 + 1) * 1000
+        infos.append(info)
+    batches = partition_members(infos, batch_bytes=20_000)
+    names = [i.filename for batch in batches for i in batch]
+    assert sorted(names) == sorted(i.filename for i in infos)
+    assert all(sum(i.compress_size for i in b) < 30_000 for b in batches)
+    print("✅ Partitioning OK")
+
+
+def test_serial_extraction():
+    """Small archives are extracted in-process with permissions applied"""
+    print("🧪 Testing in-process extraction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive, contents = _make_archive(tmp)
+        out = os.path.join(tmp, "out")
+        progress = []
+        result = extract_zip_parallel(archive, out, workers=1,
+                                      progress_callback=lambda done, total: progress.append((done, total)))
+        assert result["errors"] == []
+        assert result["files"] == len(contents)
+        assert progress[-1][0] == progress[-1][1] == sum(len(d) for d in contents.values())
+        _check_output(out, contents)
+    print("✅ In-process extraction OK")
+
+
+def test_process_pool_extraction():
+    """Batches extracted on worker processes produce the same tree"""
+    print("🧪 Testing process pool extraction...")
+    threshold = parallel_unzip.PARALLEL_THRESHOLD
+    parallel_unzip.PARALLEL_THRESHOLD = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive, contents = _make_archive(tmp)
+            out = os.path.join(tmp, "out")
+            result = extract_zip_parallel(archive, out, workers=2, batch_bytes=1)
+            assert result["errors"] == []
+            _check_output(out, contents)
+    finally:
+        parallel_unzip.PARALLEL_THRESHOLD = threshold
+    print("✅ Process pool extraction OK")
+
+
+def test_directory_entries_stay_inside():
+    """'..' and absolute directory entries are created under the destination"""
+    print("🧪 Testing directory entry sanitizing...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "evil.zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr(zipfile.ZipInfo("../../escaped/"), b"")
+            zf.writestr(zipfile.ZipInfo("/abs_escaped/"), b"")
+            zf.writestr("ok.txt", b"ok")
+        out = os.path.join(tmp, "deep", "out")
+        result = extract_zip_parallel(archive, out, workers=1)
+        assert result["errors"] == []
+        assert not os.path.exists(os.path.join(tmp, "escaped"))
+        assert os.path.isdir(os.path.join(out, "escaped"))
+        assert os.path.isdir(os.path.join(out, "abs_escaped"))
+    print("✅ Directory entries OK")
+
+
+def test_concurrent_serial_jobs():
+    """In-process jobs on one archive never close each other's handle"""
+    print("🧪 Testing concurrent in-process jobs...")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive, contents = _make_archive(tmp, count=200)
+        results = []
+
+        def run(i):
+            out = os.path.join(tmp, f"out{i}")
+            results.append(extract_zip_parallel(archive, out, workers=1, batch_bytes=1))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 6 and all(r["errors"] == [] for r in results), \
+            [r["errors"][:1] for r in results]
+        assert parallel_unzip._worker_archives == {}
+    print("✅ Concurrent jobs OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Parallel ZIP Extraction Test")
+    print("=" * 60)
+    try:
+        test_partition_members()
+        test_serial_extraction()
+        test_process_pool_extraction()
+        test_directory_entries_stay_inside()
+        test_concurrent_serial_jobs()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
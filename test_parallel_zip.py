@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Test script for the parallel ZIP writer."""
+
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.parallel_zip import ParallelZipWriter
+
+
+def _make_files(root, count=50):
+    """Create a mix of small, empty and compressible files"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"sub_{i % 5}", f"file_{i}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write((f"line {i}\n" * (i * 37)).encode())
+        paths.append(path)
+    return paths
+
+
+def test_parallel_zip_roundtrip():
+    """Members written in parallel read back intact and in order"""
+    print("🧪 Testing parallel ZIP round trip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        paths = _make_files(src)
+        archive = os.path.join(tmp, "out.zip")
+
+        written = []
+        with ParallelZipWriter(archive, compression_level=6, workers=4,
+                               on_written=lambda info: written.append(info.filename)) as writer:
+            for path in paths:
+                writer.add(path, os.path.relpath(path, src))
+
+        expected = [os.path.relpath(p, src) for p in paths]
+        assert written == expected
+
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == expected
+            for path, name in zip(paths, expected):
+                with open(path, "rb") as f:
+                    assert zf.read(name) == f.read()
+    print("✅ Round trip OK")
+
+
+def test_stored_and_large_members():
+    """Level 0 stores members; files over the threshold go through ZipFile.write"""
+    print("🧪 Testing stored and large members...")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_files(tmp, count=10)
+        archive = os.path.join(tmp, "stored.zip")
+        with ParallelZipWriter(archive, compression_level=0, workers=2,
+                               large_file_threshold=100) as writer:
+            for path in paths:
+                writer.add(path, os.path.basename(path))
+
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.testzip() is None
+            assert all(i.compress_type == zipfile.ZIP_STORED for i in zf.infolist())
+            assert len(zf.infolist()) == len(paths)
+    print("✅ Stored/large members OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Parallel ZIP Writer Test")
+    print("=" * 60)
+    try:
+        test_parallel_zip_roundtrip()
+        test_stored_and_large_members()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
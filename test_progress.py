@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Test script for rate-limited, byte-based progress reporting."""
+
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.progress import ProgressReporter, format_duration
+from varchiver.engine.archive_job import ArchiveJob
+from varchiver.engine.extraction_job import ExtractionJob
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limit_and_bytes():
+    """Reports are coalesced to one per interval and percentages follow bytes"""
+    print("🧪 Testing rate limiting and byte-based percentages...")
+    clock = FakeClock()
+    percents, statuses = [], []
+    reporter = ProgressReporter(percents.append, statuses.append, label="Adding to",
+                                total_bytes=1000, total_files=10, interval=0.05, clock=clock)
+    # One big file is most of the bytes: nine small ones barely move the bar.
+    # The first report goes out at once, the rest wait for the interval.
+    for i in range(9):
+        reporter.advance(10, current="src")
+    assert percents == [1] and statuses == ["Adding to src: 1/10 files, 10 B of 1000 B"], statuses
+    clock.now += 1
+    reporter.advance(910, current="src")
+    assert percents == [1, 100]
+    assert statuses[-1] == "Adding to src: 10/10 files, 1000 B of 1000 B, 1000 B/s", statuses[-1]
+    reporter.finish()  # Nothing changed, so nothing is repeated
+    assert percents == [1, 100] and len(statuses) == 2
+    assert reporter.summary().startswith("10 files, 1000 B in 1.0s")
+    print("✅ Rate limiting and byte-based percentages OK")
+
+
+def test_growing_totals_and_eta():
+    """No percentage while totals grow; ETA from the recent rate once they are final"""
+    print("🧪 Testing streaming totals and ETA...")
+    clock = FakeClock()
+    percents, statuses = [], []
+    reporter = ProgressReporter(percents.append, statuses.append, totals_known=False, clock=clock)
+    reporter.add_total(4 * 1024 * 1024, 4)
+    reporter.advance(1024 * 1024)
+    assert percents == [] and statuses == ["Processing: 1 files, 1.0 MB"]
+    reporter.set_total()
+    clock.now += 1
+    reporter.advance(1024 * 1024)
+    assert percents == [50]
+    assert reporter.eta == 1.0
+    assert statuses[-1] == "Processing: 2/4 files, 2.0 MB of 4.0 MB, 2.0 MB/s, 0:01 left", statuses[-1]
+    assert format_duration(3725) == "1:02:05" and format_duration(59.6) == "1:00"
+    print("✅ Streaming totals and ETA OK")
+
+
+def test_threads():
+    """Counts from many threads add up and reports never overlap"""
+    print("🧪 Testing concurrent updates...")
+    reporter = ProgressReporter(total_bytes=8 * 10000, total_files=8 * 10000, interval=0)
+
+    def work():
+        for _ in range(10000):
+            reporter.advance(1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert reporter.bytes_done == reporter.files_done == 80000
+    assert reporter.percent == 100
+    print("✅ Concurrent updates OK")
+
+
+def test_jobs_coalesce():
+    """Creating and extracting many files reports a handful of times, ending at 100"""
+    print("🧪 Testing job reports...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        os.makedirs(src)
+        for i in range(2000):
+            with open(os.path.join(src, f"f{i:04d}.txt"), "w") as f:
+                f.write("x" * i)
+        archive = os.path.join(tmp, "out.zip")
+
+        job = ArchiveJob([src], archive)
+        percents, statuses, errors = [], [], []
+        job.progress.connect(percents.append)
+        job.status.connect(statuses.append)
+        job.error.connect(lambda message, _: errors.append(message))
+        job.run()
+        assert not errors, errors
+        assert percents[-1] == 100 and percents == sorted(percents)
+        # Per-file reporting used to send ~2,000 statuses and ~200 progress updates
+        assert len(statuses) < 200 and len(percents) <= 101, (len(statuses), len(percents))
+        assert any(" of " in status and "/s" in status for status in statuses), statuses
+
+        with zipfile.ZipFile(archive) as zf:
+            assert len(zf.namelist()) == 2000
+
+        job = ExtractionJob(archive, os.path.join(tmp, "out"))
+        percents = []
+        job.progress.connect(percents.append)
+        job.run()
+        assert percents[-1] == 100 and len(percents) <= 101
+    print("✅ Job reports OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Progress Reporter Test")
+    print("=" * 60)
+    try:
+        test_rate_limit_and_bytes()
+        test_growing_totals_and_eta()
+        test_threads()
+        test_jobs_coalesce()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
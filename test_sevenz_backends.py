@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test script for selecting and using 7z backends."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.sevenz import SevenZipHandler
+from varchiver.utils import sevenz_backends
+from varchiver.utils.sevenz_backends import (BACKEND_ENV, IterStream, get_backend,
+                                             set_default_backend)
+
+
+def test_backend_selection():
+    """Explicit names win over the default, which wins over the environment"""
+    print("🧪 Testing backend selection...")
+    previous_env = os.environ.pop(BACKEND_ENV, None)
+    try:
+        assert get_backend("cli").name == "cli"
+        assert get_backend().name == "cli"  # In-process backends are opt-in
+        os.environ[BACKEND_ENV] = "cli"
+        assert get_backend().name == "cli"
+        set_default_backend("cli")
+        assert get_backend(None).name == "cli"
+        try:
+            get_backend("nope")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown backend accepted")
+        try:
+            set_default_backend("nope")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown default accepted")
+    finally:
+        set_default_backend(None)
+        os.environ.pop(BACKEND_ENV, None)
+        if previous_env is not None:
+            os.environ[BACKEND_ENV] = previous_env
+    print("✅ Backend selection OK")
+
+
+def test_iter_stream():
+    """Blocks of any size read back as one continuous stream"""
+    print("🧪 Testing block stream...")
+    blocks = [b"ab", b"", b"cdef", b"g"]
+    stream = IterStream(iter(blocks))
+    buffer = bytearray(3)
+    out = b""
+    while True:
+        count = stream.readinto(buffer)
+        if not count:
+            break
+        out += bytes(buffer[:count])
+    assert out == b"abcdefg"
+    print("✅ Block stream OK")
+
+
+def test_in_process_backends_agree():
+    """Installed in-process backends list the same members and read them back"""
+    print("🧪 Testing in-process backends...")
+    if not sevenz_backends.PY7ZR_AVAILABLE:
+        print("⏭️  py7zr not installed, skipping")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        os.makedirs(os.path.join(src, "sub dir"))
+        with open(os.path.join(src, "sub dir", "notes.txt"), "w") as f:
+            f.write("line\n" * 1000)
+        archive = os.path.join(tmp, "sample.7z")
+        with sevenz_backends.py7zr.SevenZipFile(archive, "w") as z:
+            z.writeall(src, "src")
+
+        names = [n for n in ("libarchive", "py7zr") if sevenz_backends._IMPORTABLE[n]]
+        listings = {}
+        for name in names:
+            handler = SevenZipHandler(archive, backend=name)
+            listings[name] = {e["path"]: (e["size"], e["is_dir"]) for e in handler.infolist()}
+        assert listings["py7zr"]["src/sub dir/notes.txt"] == (5000, False)
+        assert all(listing == listings["py7zr"] for listing in listings.values())
+
+        if sevenz_backends.LIBARCHIVE_AVAILABLE:
+            handler = SevenZipHandler(archive, backend="libarchive")
+            with handler.open("src/sub dir/notes.txt") as f:
+                assert f.read() == b"line\n" * 1000
+    print("✅ In-process backends OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 7z Backend Test")
+    print("=" * 60)
+    try:
+        test_backend_selection()
+        test_iter_stream()
+        test_in_process_backends_agree()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Test script for 7z listings and batched 7z extraction."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.sevenz import SevenZipHandler, parse_slt_listing
+from varchiver.utils.sevenz_backends import BACKENDS
+
+SLT_OUTPUT = """Path = docs
+Folder = +
+Size = 0
+Packed Size = 0
+Modified = 2024-11-29 18:36:33.1234567
+Attributes = D_ drwxr-xr-x
+CRC =
+Encrypted = -
+Method =
+Block =
+
+Path = docs/release notes = final.txt
+Folder = -
+Size = 22914
+Packed Size = 6864
+Modified = 2024-11-29 18:36:33
+Attributes = A_ -rw-r--r--
+CRC = 3610A686
+Encrypted = -
+Method = LZMA2:24
+Block = 0
+
+Path = bin/run tool.sh
+Folder = -
+Size = 120
+Packed Size =
+Modified = 2024-11-30 09:00:00
+Attributes = A_ -rwxr-xr-x
+CRC = 0000BEEF
+Encrypted = +
+Method = LZMA2:24 7zAES:19
+Block = 0
+"""
+
+
+def test_parse_slt_listing():
+    """Blocks become entries; names with spaces and ' = ' survive"""
+    print("🧪 Testing technical listing parser...")
+    entries = {e["path"]: e for e in parse_slt_listing(SLT_OUTPUT)}
+    assert list(entries) == ["docs", "docs/release notes = final.txt", "bin/run tool.sh"]
+
+    docs = entries["docs"]
+    assert docs["is_dir"] and docs["mode"] == 0o755
+    assert docs["modified"] == "2024-11-29 18:36:33"
+    assert docs["mtime"] % 1 > 0.12
+
+    notes = entries["docs/release notes = final.txt"]
+    assert notes["name"] == "release notes = final.txt"
+    assert (notes["size"], notes["compressed_size"]) == (22914, 6864)
+    assert notes["crc"] == "3610A686" and not notes["is_dir"]
+
+    tool = entries["bin/run tool.sh"]
+    assert tool["mode"] == 0o755 and tool["encrypted"]
+    assert tool["compressed_size"] == 0
+    print("✅ Parser OK")
+
+
+def test_parse_without_ba():
+    """Archive properties printed before the separator are not members"""
+    print("🧪 Testing listing with archive header...")
+    header = "Path = archive.7z\nType = 7z\nPhysical Size = 4096\n\n----------\n"
+    entries = parse_slt_listing(header + SLT_OUTPUT)
+    assert [e["path"] for e in entries][0] == "docs"
+    assert len(entries) == 3
+    print("✅ Header skipping OK")
+
+
+def test_listing_cached_until_archive_changes():
+    """7z is run once; the .idx file serves a new handler; a change re-reads"""
+    print("🧪 Testing cached listing...")
+    original_check = SevenZipHandler._check_7z
+    original_read = SevenZipHandler._read_listing
+    calls = []
+
+    def fake_read(self):
+        calls.append(self.archive_path)
+        return parse_slt_listing(SLT_OUTPUT)
+
+    SevenZipHandler._check_7z = lambda self: None
+    SevenZipHandler._read_listing = fake_read
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "sample.7z")
+            with open(archive, "wb") as f:
+                f.write(b"7z placeholder")
+
+            handler = SevenZipHandler(archive, index_store=True)
+            assert handler.getinfo("bin/run tool.sh")["size"] == 120
+            assert handler.getinfo("missing") is None
+            assert len(handler.namelist()) == 3
+            assert len(handler.infolist()) == 3
+            assert len(calls) == 1
+            assert os.path.exists(os.path.join(tmp, "sample.idx"))
+
+            reopened = SevenZipHandler(archive, index_store=True)
+            assert reopened.getinfo("docs")["is_dir"]
+            assert len(calls) == 1
+
+            with open(archive, "ab") as f:
+                f.write(b"appended")
+            assert len(reopened.namelist()) == 3
+            assert len(calls) == 2
+
+            # In-process listings may lack fields such as 'mode' and are not stored
+            os.remove(os.path.join(tmp, "sample.idx"))
+            in_process = SevenZipHandler(archive, index_store=True)
+            in_process.backend = BACKENDS["py7zr"]
+            assert len(in_process.namelist()) == 3
+            assert not os.path.exists(os.path.join(tmp, "sample.idx"))
+    finally:
+        SevenZipHandler._check_7z = original_check
+        SevenZipHandler._read_listing = original_read
+    print("✅ Cached listing OK")
+
+
+def test_extract_many_batches_members():
+    """Files go to 7z in listfile chunks; directories are created directly"""
+    print("🧪 Testing batched extraction...")
+    original_check = SevenZipHandler._check_7z
+    original_read = SevenZipHandler._read_listing
+    original_run = SevenZipHandler._run_7z_with_progress
+    runs = []
+
+    def fake_run(self, cmd, cwd=None, progress_callback=None, cancel_check=None):
+        with open(cmd[-1][1:], encoding="utf-8") as f:
+            runs.append((cmd, f.read().splitlines()))
+        progress_callback(100)
+
+    SevenZipHandler._check_7z = lambda self: None
+    SevenZipHandler._read_listing = lambda self: parse_slt_listing(SLT_OUTPUT)
+    SevenZipHandler._run_7z_with_progress = fake_run
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "sample.7z")
+            with open(archive, "wb") as f:
+                f.write(b"7z placeholder")
+            out = os.path.join(tmp, "out")
+            progress = []
+            handler = SevenZipHandler(archive)
+            handler.extract_many(["docs", "docs/release notes = final.txt", "bin/run tool.sh"],
+                                 out, progress_callback=progress.append, chunk_size=1)
+            assert os.path.isdir(os.path.join(out, "docs"))
+            assert [names for _, names in runs] == [["docs/release notes = final.txt"],
+                                                    ["bin/run tool.sh"]]
+            cmd = runs[0][0]
+            assert cmd[:2] == ["7z", "x"] and "-spd" in cmd and "-o" + out in cmd
+            assert progress == [50, 100]
+    finally:
+        SevenZipHandler._check_7z = original_check
+        SevenZipHandler._read_listing = original_read
+        SevenZipHandler._run_7z_with_progress = original_run
+    print("✅ Batched extraction OK")
+
+
+def test_extract_many_rejects_escaping_dirs():
+    """Directory members that resolve outside the destination are refused"""
+    print("🧪 Testing directory members outside the destination...")
+    original_check = SevenZipHandler._check_7z
+    original_read = SevenZipHandler._read_listing
+    SevenZipHandler._check_7z = lambda self: None
+    SevenZipHandler._read_listing = lambda self: parse_slt_listing(SLT_OUTPUT)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "sample.7z")
+            with open(archive, "wb") as f:
+                f.write(b"7z placeholder")
+            out = os.path.join(tmp, "a", "out")
+            handler = SevenZipHandler(archive)
+            for member in ("../../x/", "/abs/"):
+                try:
+                    handler.extract_many([member], out)
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError(f"{member} was extracted")
+            assert not os.path.exists(os.path.join(tmp, "x"))
+            handler.extract_many(["docs/../docs2/"], out)
+            assert os.path.isdir(os.path.join(out, "docs2"))
+    finally:
+        SevenZipHandler._check_7z = original_check
+        SevenZipHandler._read_listing = original_read
+    print("✅ Escaping directories OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 7z Listing Test")
+    print("=" * 60)
+    try:
+        test_parse_slt_listing()
+        test_parse_without_ba()
+        test_listing_cached_until_archive_changes()
+        test_extract_many_batches_members()
+        test_extract_many_rejects_escaping_dirs()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Test script for streaming reads of 7z members."""
+
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.sevenz import SevenZipHandler, SevenZipMemberReader, parse_slt_listing
+
+# Stands in for '7z e -so': writes 64 chunks of 64 KiB, then exits with the given code
+WRITER = ("import sys\n"
+          "for i in range(64):\n"
+          "    sys.stdout.buffer.write(bytes([i]) * 65536)\n"
+          "sys.stdout.flush()\n"
+          "sys.stderr.write('ERROR: Data Error')\n"
+          "sys.exit(int(sys.argv[1]))\n")
+
+
+def _open_reader(exit_code=0):
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen([sys.executable, "-c", WRITER, str(exit_code)],
+                            stdout=subprocess.PIPE, stderr=stderr_file)
+    reader = SevenZipMemberReader(proc, stderr_file, "member.bin", 64 * 65536)
+    return proc, io.BufferedReader(reader, buffer_size=65536)
+
+
+def test_incremental_read():
+    """Data arrives in pieces and the process is reaped at end of stream"""
+    print("🧪 Testing incremental reads...")
+    proc, stream = _open_reader()
+    with stream:
+        first = stream.read(10)
+        assert first == b"\x00" * 10
+        rest = stream.read()
+    assert len(first) + len(rest) == 64 * 65536
+    assert rest[-1] == 63
+    assert proc.returncode == 0
+    print("✅ Incremental reads OK")
+
+
+def test_early_close_kills_process():
+    """Closing before the end stops the writer instead of draining it"""
+    print("🧪 Testing early close...")
+    proc, stream = _open_reader()
+    stream.read(1)
+    stream.close()
+    assert proc.poll() is not None
+    print("✅ Early close OK")
+
+
+def test_error_surfaces_at_end():
+    """A failing 7z run raises once its output is exhausted"""
+    print("🧪 Testing error reporting...")
+    _, stream = _open_reader(exit_code=2)
+    try:
+        stream.read()
+    except Exception as e:
+        assert "Data Error" in str(e)
+    else:
+        raise AssertionError("expected the 7z error to be raised")
+    finally:
+        stream.close()
+    print("✅ Error reporting OK")
+
+
+def test_copy_to_tar():
+    """Members stream into a tar with their sizes, modes and directories"""
+    print("🧪 Testing streaming re-archive to tar...")
+    listing = parse_slt_listing(
+        "Path = pkg\nFolder = +\nSize = 0\nAttributes = D_ drwxr-xr-x\n\n"
+        "Path = pkg/tool.sh\nFolder = -\nSize = 5\nModified = 2024-01-02 03:04:05\n"
+        "Attributes = A_ -rwxr-xr-x\n")
+    originals = (SevenZipHandler._check_7z, SevenZipHandler._read_listing, SevenZipHandler.open)
+    SevenZipHandler._check_7z = lambda self: None
+    SevenZipHandler._read_listing = lambda self: listing
+    SevenZipHandler.open = lambda self, name, mode="r": io.BytesIO(b"hello")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "in.7z")
+            with open(archive, "wb") as f:
+                f.write(b"7z placeholder")
+            out = os.path.join(tmp, "out.tar.gz")
+            progress = []
+            with tarfile.open(out, "w:gz") as tar:
+                SevenZipHandler(archive).copy_to_tar(
+                    tar, progress_callback=lambda done, total: progress.append((done, total)))
+            with tarfile.open(out) as tar:
+                members = {m.name: m for m in tar.getmembers()}
+                assert members["pkg"].isdir()
+                assert members["pkg/tool.sh"].mode == 0o755
+                assert tar.extractfile("pkg/tool.sh").read() == b"hello"
+            assert progress == [(5, 5)]
+    finally:
+        SevenZipHandler._check_7z, SevenZipHandler._read_listing, SevenZipHandler.open = originals
+    print("✅ Streaming re-archive OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 7z Streaming Read Test")
+    print("=" * 60)
+    try:
+        test_incremental_read()
+        test_early_close_kills_process()
+        test_error_surfaces_at_end()
+        test_copy_to_tar()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
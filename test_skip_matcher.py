@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Test script for the compiled skip pattern matcher."""
+
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils.pattern_utils import SkipMatcher, get_skip_matcher
+from varchiver.utils.constants import DEFAULT_SKIP_PATTERNS
+from varchiver.engine.archive_job import ArchiveJob
+from varchiver.engine.update_job import DirectoryUpdateJob
+
+ALL_GROUPS = list(DEFAULT_SKIP_PATTERNS)
+
+
+def test_default_groups():
+    """Default groups skip dependency dirs, build output and editor files"""
+    print("🧪 Testing default pattern groups...")
+    matcher = SkipMatcher.from_groups(["deps", "build", "ide", "logs"])
+    assert matcher.match("/home/u/proj/node_modules/react/index.js")
+    assert matcher.match("proj/__pycache__/mod.cpython-311.pyc")
+    assert matcher.match("/home/u/proj/build/out.o")
+    assert matcher.match("C:\\work\\proj\\vendor\\lib.go")
+    assert matcher.match("/home/u/proj/server.LOG")
+    assert not matcher.match("/home/u/proj/src/build_tools.py")
+    assert not matcher.match("/home/u/proj/src/app.py")
+    print("✅ Default groups OK")
+
+
+def test_custom_patterns():
+    """Globs, '**/' prefixes and 'dir/**' suffixes"""
+    print("🧪 Testing custom patterns...")
+    matcher = SkipMatcher(["**/secret_*.txt", "data/raw/**", "*.min.js", "Thumbs.db"])
+    assert matcher.match("/p/config/secret_key.txt")
+    assert not matcher.match("/p/config/public_key.txt")
+    assert matcher.match("/p/data/raw/2024/a.csv")
+    assert not matcher.match("/p/data/clean/a.csv")
+    assert matcher.match("/p/static/app.min.js")
+    assert matcher.match("/p/photos/thumbs.db")
+    assert not SkipMatcher([]).match("/anything")
+    print("✅ Custom patterns OK")
+
+
+def test_match_dir():
+    """Directories are pruned by name or dir pattern, not by file extension"""
+    print("🧪 Testing directory matching...")
+    matcher = SkipMatcher(["node_modules", "data/raw/**", "*.log"])
+    assert matcher.match_dir("/p/web/node_modules")
+    assert matcher.match_dir("/p/data/raw")
+    assert not matcher.match_dir("/p/archive.log")
+    assert not matcher.match_dir("/p/src")
+    assert get_skip_matcher(["a"]) is get_skip_matcher(["a"])
+    print("✅ Directory matching OK")
+
+
+def _make_project(root):
+    for rel, data in (("src/a.py", "print('a')"), ("node_modules/x/index.js", "x"),
+                      ("build/out.o", "o")):
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(data)
+
+
+def test_jobs_ignore_parent_folders():
+    """Folders above the source (tmp, build, logs) never match a skip name"""
+    print("🧪 Testing jobs on trees under skip-named folders...")
+    patterns = SkipMatcher.from_groups(ALL_GROUPS).patterns
+    with tempfile.TemporaryDirectory() as base:
+        for parent in ("tmp", "build/proj", "logs/app"):
+            src = os.path.join(base, parent, "src_root")
+            _make_project(src)
+
+            archive = os.path.join(base, parent.replace("/", "_") + ".zip")
+            job = ArchiveJob([src], archive, skip_patterns=patterns)
+            errors = []
+            job.error.connect(lambda msg, _perm: errors.append(msg))
+            job.run()
+            assert not errors, errors
+            with zipfile.ZipFile(archive) as zf:
+                assert zf.namelist() == ["src/a.py"]
+
+            dest = os.path.join(base, parent, "dest")
+            job = DirectoryUpdateJob(src, dest, skip_patterns=patterns)
+            job.run()
+            assert os.path.exists(os.path.join(dest, "src", "a.py"))
+            assert not os.path.exists(os.path.join(dest, "build"))
+            assert not os.path.exists(os.path.join(dest, "node_modules"))
+    print("✅ Parent folders OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Skip Matcher Test")
+    print("=" * 60)
+    try:
+        test_default_groups()
+        test_custom_patterns()
+        test_match_dir()
+        test_jobs_ignore_parent_folders()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Test script for deduplicated snapshots."""
+
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver.utils import snapshot_store
+from varchiver.utils.snapshot_manager import SnapshotManager
+
+
+def _write(root, rel, data, mtime=1_600_000_000, mode=0o644):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+    os.chmod(path, mode)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _make_source(root):
+    _write(root, "a.txt", "alpha" * 100)
+    _write(root, "copy_of_a.txt", "alpha" * 100)
+    _write(root, "bin/run.sh", "#!/bin/sh\n", mode=0o755)
+    os.makedirs(os.path.join(root, "empty"))
+    os.symlink("a.txt", os.path.join(root, "latest"))
+
+
+def _blob_count(manager):
+    return sum(len(files) for _, _, files in os.walk(manager.store.objects_dir))
+
+
+def test_dedup_and_restore():
+    """Identical contents are stored once and restores reproduce the tree"""
+    print("🧪 Testing deduplicated snapshots...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        manager = SnapshotManager(os.path.join(tmp, "base"))
+
+        first = manager.create_snapshot(src, tags=["v1"])
+        assert first.size == 1010 and first.stored_size == 510
+        assert _blob_count(manager) == 2
+
+        second = manager.create_snapshot(src, parent_id=first.id)
+        assert second.id != first.id and second.stored_size == 0
+        assert _blob_count(manager) == 2
+
+        out = os.path.join(tmp, "restored")
+        result = manager.restore_snapshot(second.id, out)
+        assert result.files == 3 and not result.errors
+        with open(os.path.join(out, "copy_of_a.txt")) as f:
+            assert f.read() == "alpha" * 100
+        assert os.stat(os.path.join(out, "bin", "run.sh")).st_mode & 0o777 == 0o755
+        assert int(os.path.getmtime(os.path.join(out, "a.txt"))) == 1_600_000_000
+        assert os.path.isdir(os.path.join(out, "empty"))
+        assert os.readlink(os.path.join(out, "latest")) == "a.txt"
+    print("✅ Deduplicated snapshots OK")
+
+
+def test_unchanged_files_are_not_hashed():
+    """Files matching the previous snapshot's size and mtime reuse its digests"""
+    print("🧪 Testing parent reuse...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        manager = SnapshotManager(os.path.join(tmp, "base"))
+        manager.create_snapshot(src)
+
+        hashed = []
+        real_digest = snapshot_store.file_digest
+        snapshot_store.file_digest = lambda path: hashed.append(path) or real_digest(path)
+
+        # Reuse is decided under the store lock, where collection cannot run
+        store = manager.store
+        real_lock, real_has = store.lock, store.has
+        held = []
+        checked_while = []
+
+        @contextlib.contextmanager
+        def tracked_lock(exclusive=False):
+            with real_lock(exclusive):
+                held.append(True)
+                try:
+                    yield
+                finally:
+                    held.pop()
+
+        store.lock = tracked_lock
+        store.has = lambda digest: checked_while.append(bool(held)) or real_has(digest)
+        try:
+            _write(src, "a.txt", "ALPHA" * 100, mtime=1_700_000_000)
+            snap = manager.create_snapshot(src)
+        finally:
+            snapshot_store.file_digest = real_digest
+            store.lock, store.has = real_lock, real_has
+        assert checked_while and all(checked_while)
+        assert [os.path.basename(p) for p in hashed] == ["a.txt"]
+        assert snap.stored_size == 500
+    print("✅ Parent reuse OK")
+
+
+def test_garbage_collection():
+    """Deleting a snapshot frees only the blobs nothing else references"""
+    print("🧪 Testing garbage collection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src)
+        manager = SnapshotManager(os.path.join(tmp, "base"))
+        first = manager.create_snapshot(src)
+        _write(src, "a.txt", "changed", mtime=1_700_000_000)
+        second = manager.create_snapshot(src)
+        assert _blob_count(manager) == 3
+
+        assert manager.collect_garbage()["blobs_removed"] == 0
+        assert manager.delete_snapshot(first.id)
+        # a.txt's old contents are still copy_of_a.txt in the second snapshot
+        assert manager.collect_garbage(dry_run=True)["blobs_removed"] == 0
+        _write(src, "copy_of_a.txt", "changed too", mtime=1_700_000_000)
+        third = manager.create_snapshot(src)
+        assert manager.delete_snapshot(second.id)
+        stats = manager.collect_garbage()
+        assert stats == {"blobs_removed": 1, "bytes_freed": 500, "blobs_kept": 3}
+        assert _blob_count(manager) == 3
+
+        out = os.path.join(tmp, "restored")
+        assert manager.restore_snapshot(third.id, out).files == 3
+    print("✅ Garbage collection OK")
+
+
+def test_concurrent_creates_and_collection():
+    """Concurrent creates keep every entry, and a collection never frees their blobs"""
+    print("🧪 Testing concurrent snapshots and collection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SnapshotManager(os.path.join(tmp, "base"))
+        sources = []
+        for i in range(8):
+            src = os.path.join(tmp, f"src{i}")
+            _write(src, "own.txt", f"source {i}" * 100)
+            sources.append(src)
+        collectors = []
+
+        def collect_soon(done, total):
+            # Queued behind the create's shared lock, so it runs as soon as that is released
+            if not collectors:
+                collectors.append(threading.Thread(target=manager.collect_garbage))
+                collectors[0].start()
+
+        created = []
+
+        def create(i):
+            callback = collect_soon if i == 0 else None
+            created.append(manager.create_snapshot(sources[i], progress_callback=callback))
+
+        threads = [threading.Thread(target=create, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        collectors[0].join()
+
+        assert len({snap.id for snap in created}) == 8
+        assert {snap.id for snap in manager.list_snapshots()} == {snap.id for snap in created}
+        assert manager.collect_garbage()["blobs_removed"] == 0
+        for snap in created:
+            out = os.path.join(tmp, "out", snap.id)
+            assert manager.restore_snapshot(snap.id, out).files == 1
+    print("✅ Concurrent snapshots OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Snapshot Store Test")
+    print("=" * 60)
+    try:
+        test_dedup_and_restore()
+        test_unchanged_files_are_not_hashed()
+        test_garbage_collection()
+        test_concurrent_creates_and_collection()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Test script for archive verification and recorded source hashes."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the project root to the path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from varchiver import cli
+from varchiver.engine.archive_job import ArchiveJob
+from varchiver.engine.verify_job import VerifyJob, verify_archive
+from varchiver.utils import parallel_unzip
+from varchiver.utils.parallel_unzip import extract_zip_parallel, verify_zip_parallel
+from varchiver.utils.hash_manifest import hashes_path_for, load_hashes
+
+
+def _make_source(root, count=20):
+    os.makedirs(os.path.join(root, "sub"))
+    for i in range(count):
+        with open(os.path.join(root, "sub", f"f{i:02d}.txt"), "wb") as f:
+            f.write(f"file {i}\n".encode() * (i + 1) * 50)
+    with open(os.path.join(root, "needle.bin"), "wb") as f:
+        f.write(b"NEEDLE" * 1000)
+
+
+def _create(src, archive, **kwargs):
+    job = ArchiveJob([src], archive, record_hashes=True, **kwargs)
+    errors = []
+    job.error.connect(lambda message, _: errors.append(message))
+    job.run()
+    assert not errors, errors
+
+
+def test_zip_parallel():
+    """ZIP CRCs are checked across worker processes, and corruption is found"""
+    print("🧪 Testing parallel ZIP verification...")
+    threshold = parallel_unzip.PARALLEL_THRESHOLD
+    parallel_unzip.PARALLEL_THRESHOLD = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "src")
+            _make_source(src)
+            # Over a megabyte in total, so the members are split into several batches
+            for name in ("big1.bin", "big2.bin"):
+                with open(os.path.join(src, name), "wb") as f:
+                    f.write(os.urandom(1536 * 1024))
+            archive = os.path.join(tmp, "x.zip")
+            _create(src, archive, compression_level=0)  # Stored, so the needle is findable
+            recorded = load_hashes(archive)
+            assert len(recorded) == 23 and "needle.bin" in recorded
+
+            report = verify_archive(archive, workers=2, compare=True)
+            assert report["ok"], report["errors"]
+            assert report["members_checked"] == 23 and report["hashes_compared"] == 23
+
+            with open(archive, "r+b") as f:
+                data = f.read()
+                f.seek(data.index(b"NEEDLE") + 100)
+                f.write(b"X")
+            report = verify_archive(archive, workers=2, compare=True)
+            assert not report["ok"]
+            # The CRC failure is reported once, not again as a hash mismatch
+            assert [member for member, _ in report["errors"]] == ["needle.bin"], report["errors"]
+            assert "CRC" in report["errors"][0][1]
+    finally:
+        parallel_unzip.PARALLEL_THRESHOLD = threshold
+    print("✅ Parallel ZIP verification OK")
+
+
+def test_zip_verify_beside_extractions():
+    """In-process verifies and extractions of one ZIP each use their own handle"""
+    print("🧪 Testing verification alongside extractions...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src, count=300)
+        archive = os.path.join(tmp, "x.zip")
+        _create(src, archive)
+        results = []
+
+        def run(i):
+            if i % 2:
+                results.append(verify_zip_parallel(archive, workers=1, digests=True, batch_bytes=1))
+            else:
+                results.append(extract_zip_parallel(archive, os.path.join(tmp, f"out{i}"),
+                                                    workers=1, batch_bytes=1))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 8 and all(r["errors"] == [] for r in results), \
+            [r["errors"][:1] for r in results]
+    print("✅ Verification alongside extractions OK")
+
+
+def test_tar_against_source_hashes():
+    """Tar data has no checksums of its own; the recorded hashes catch changes"""
+    print("🧪 Testing tar contents against recorded hashes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src, count=2)
+        archive = os.path.join(tmp, "x.tar.gz")
+        _create(src, archive)
+        report = verify_archive(archive, compare=True)
+        assert report["ok"] and report["hashes_compared"] == 3, report
+
+        # A well-formed archive that no longer matches what was archived
+        with open(os.path.join(src, "needle.bin"), "wb") as f:
+            f.write(b"changed")
+        with open(os.path.join(src, "extra.txt"), "w") as f:
+            f.write("extra")
+        with tarfile.open(archive, "w:gz") as tar:
+            for name in ("needle.bin", "extra.txt", "sub/f00.txt"):
+                tar.add(os.path.join(src, name), name)
+        assert verify_archive(archive)["ok"]
+        report = verify_archive(archive, compare=True)
+        problems = {member: message for member, message in report["errors"]}
+        assert set(problems) == {"needle.bin", "extra.txt", "sub/f01.txt"}, problems
+        assert "differs" in problems["needle.bin"] and "missing" in problems["sub/f01.txt"]
+
+        os.remove(hashes_path_for(archive))
+        report = verify_archive(archive, compare=True)
+        assert not report["ok"] and "No source hashes" in report["errors"][0][1]
+    print("✅ Tar contents against recorded hashes OK")
+
+
+def test_job_and_cli():
+    """VerifyJob reports through callbacks; the CLI records hashes and writes a report"""
+    print("🧪 Testing VerifyJob and the CLI...")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        _make_source(src, count=3)
+        archive = os.path.join(tmp, "x.zip")
+        assert cli.main(["-q", "create", "--hashes", archive, src]) == 0
+        assert os.path.exists(hashes_path_for(archive))
+
+        job = VerifyJob(archive, compare=True)
+        reports, percents = [], []
+        job.finished.connect(reports.append)
+        job.progress.connect(percents.append)
+        job.run()
+        assert reports[0]["ok"] and percents[-1] == 100
+
+        report_path = os.path.join(tmp, "report.json")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = cli.main(["-q", "verify", "--compare", "--report", report_path, archive])
+        assert code == 0 and "4 matched against source hashes" in out.getvalue(), out.getvalue()
+        with open(report_path) as f:
+            saved = json.load(f)
+        assert saved["ok"] and saved["hashes_compared"] == 4 and saved["type"] == ".zip"
+    print("✅ VerifyJob and the CLI OK")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Archive Verification Test")
+    print("=" * 60)
+    try:
+        test_zip_parallel()
+        test_zip_verify_beside_extractions()
+        test_tar_against_source_hashes()
+        test_job_and_cli()
+        print("\n🎉 All tests completed successfully!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
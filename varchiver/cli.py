@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Headless command-line interface for Varchiver.
+
+Runs the same engines as the GUI (see varchiver.engine) without importing
+PyQt6, so archives can be created, extracted, listed, updated and verified
+on servers and from cron. Each command imports only the engine it needs.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# GUI collision strategy names for archive creation
+CREATE_COLLISIONS = {
+    'skip': 'Skip existing files',
+    'overwrite': 'Overwrite existing files',
+    'newer': 'Keep newer files',
+    'larger': 'Keep larger files',
+    'both': 'Keep both files',
+}
+EXTRACT_COLLISIONS = ['skip', 'overwrite', 'rename', 'newer', 'older', 'larger', 'smaller']
+
+
+class Reporter:
+    """Prints job status and progress to stderr, at most ten times a second"""
+
+    def __init__(self, quiet=False, stream=sys.stderr):
+        self.quiet = quiet
+        self.stream = stream
+        self.tty = stream.isatty()
+        self.percent = None
+        self.message = ''
+        self.errors = []
+        self._last = 0.0
+
+    def status(self, message):
+        self.message = message
+        self._show()
+
+    def progress(self, percent):
+        self.percent = percent
+        self._show()
+
+    def error(self, message, is_permission_error=False):
+        self.errors.append(message)
+        self._clear()
+        print(f"Error: {message}", file=sys.stderr)
+
+    def _show(self, force=False):
+        if self.quiet:
+            return
+        now = time.monotonic()
+        if not force and now - self._last < 0.1:
+            return
+        self._last = now
+        line = f"[{self.percent:3d}%] {self.message}" if self.percent is not None else self.message
+        if self.tty:
+            width = os.get_terminal_size(self.stream.fileno()).columns - 1
+            self.stream.write('\r' + line[:width].ljust(width))
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def _clear(self):
+        if self.tty and not self.quiet:
+            self.stream.write('\r' + ' ' * (os.get_terminal_size(self.stream.fileno()).columns - 1) + '\r')
+            self.stream.flush()
+
+    def done(self, message=None):
+        self._clear()
+        if message and not self.quiet:
+            print(message, file=sys.stderr)
+
+
+def _connect(job, reporter):
+    job.status.connect(reporter.status)
+    job.progress.connect(reporter.progress)
+    job.error.connect(reporter.error)
+
+
+def run_create(args, reporter):
+    from .engine.archive_job import ArchiveJob
+
+    missing = [path for path in args.sources if not os.path.exists(path)]
+    if missing:
+        reporter.error(f"Source not found: {missing[0]}")
+        return 1
+    job = ArchiveJob(
+        files=args.sources,
+        archive_name=args.archive,
+        collision_strategy=CREATE_COLLISIONS[args.collision],
+        skip_patterns=args.skip_patterns,
+        password=args.password,
+        compression_level=args.compression,
+        workers=args.workers,
+        record_hashes=args.hashes,
+    )
+    _connect(job, reporter)
+    counted = []
+    job.file_counted.connect(counted.append)
+    job.run()
+    if reporter.errors:
+        return 1
+    reporter.done(f"Created {args.archive} ({counted[-1] if counted else 0:,} files)")
+    return 0
+
+
+def run_extract(args, reporter):
+    from .engine.extraction_job import ExtractionJob
+
+    if not os.path.exists(args.archive):
+        reporter.error(f"Archive not found: {args.archive}")
+        return 1
+    output = args.output
+    if not output:
+        from .utils.archive_utils import get_archive_type
+        name = os.path.basename(args.archive.rstrip(os.sep))
+        archive_type = get_archive_type(args.archive)
+        output = name[:-len(archive_type)] if archive_type and name.endswith(archive_type) else name + '.extracted'
+    os.makedirs(output, exist_ok=True)
+    job = ExtractionJob(
+        args.archive,
+        output,
+        collision_strategy=args.collision,
+        skip_patterns=args.skip_patterns,
+        password=args.password,
+        preserve_permissions=args.preserve_permissions,
+        file_list=args.members or None,
+    )
+    _connect(job, reporter)
+    job.run()
+    if reporter.errors:
+        return 1
+    reporter.done(f"Extracted to {output}")
+    return 0
+
+
+def run_list(args, reporter):
+    from .engine.browse_job import list_archive
+
+    if not os.path.exists(args.archive):
+        reporter.error(f"Archive not found: {args.archive}")
+        return 1
+    try:
+        entries, _ = list_archive(args.archive, args.password, reporter.status)
+    except Exception as e:
+        reporter.error(str(e))
+        return 1
+    reporter.done()
+    if args.json:
+        json.dump(entries, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+        return 0
+    out = []
+    for entry in entries:
+        path = entry['path']
+        if entry.get('is_dir') and not path.endswith('/'):
+            path += '/'
+        if args.long:
+            mtime = entry.get('mtime')
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(mtime)) if mtime else entry.get('modified', '')[:16]
+            out.append(f"{entry.get('size', 0):>14,}  {when:16}  {path}")
+        else:
+            out.append(path)
+    sys.stdout.write('\n'.join(out) + ('\n' if out else ''))
+    return 0
+
+
+def run_update(args, reporter):
+    from .engine.update_job import DirectoryUpdateJob
+
+    if not os.path.exists(args.source):
+        reporter.error(f"Source not found: {args.source}")
+        return 1
+    job = DirectoryUpdateJob(
+        args.source,
+        args.target,
+        collision_strategy=args.collision,
+        skip_patterns=args.skip_patterns,
+        password=args.password,
+        incremental=True,
+        checksum=args.checksum,
+        delete=args.delete,
+    )
+    _connect(job, reporter)
+    job.run()
+    if reporter.errors:
+        return 1
+    reporter.done(reporter.message)  # The job's last status is its summary
+    return 0
+
+
+def run_verify(args, reporter):
+    from .engine.verify_job import verify_archive
+
+    if not os.path.exists(args.archive):
+        reporter.error(f"Archive not found: {args.archive}")
+        return 1
+    reporter.status(f"Verifying {args.archive}...")
+    report = verify_archive(args.archive, args.password, progress_callback=reporter.progress,
+                            status_callback=reporter.status, workers=args.workers,
+                            compare=args.compare)
+    reporter.done()
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+    if args.json:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+    else:
+        for member, message in report['errors']:
+            print(f"{member or args.archive}: {message}", file=sys.stderr)
+        state = "OK" if report['ok'] else f"FAILED ({len(report['errors'])} errors)"
+        line = f"{args.archive}: {state}, {report['members_checked']:,} members checked"
+        if args.compare:
+            line += f", {report['hashes_compared']:,} matched against source hashes"
+        print(line)
+    return 0 if report['ok'] else 1
+
+
+def create_parser():
+    """Create the CLI argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="varchiver-cli",
+        description="Varchiver archive operations without the GUI",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print errors and results")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    def common(sub, skip=True):
+        sub.add_argument("--password", "-p", help="Password for encrypted archives")
+        if skip:
+            sub.add_argument("--skip-patterns", "-s", nargs="+", help="Patterns to skip")
+
+    create = subparsers.add_parser("create", help="Create an archive from files and directories")
+    create.add_argument("archive", help="Archive to write; the extension picks the format")
+    create.add_argument("sources", nargs="+", help="Files or directories to archive")
+    create.add_argument("--compression", "-c", type=int, choices=range(0, 10), default=5,
+                        help="Compression level (0-9, default: 5)")
+    create.add_argument("--workers", "-w", type=int, default=None,
+                        help="Compression worker threads (default: one per CPU)")
+    create.add_argument("--collision", choices=sorted(CREATE_COLLISIONS), default="skip",
+                        help="What to do with duplicate member names (default: skip)")
+    create.add_argument("--hashes", action="store_true",
+                        help="Record source file hashes for 'verify --compare'")
+    common(create)
+
+    extract = subparsers.add_parser("extract", help="Extract an archive")
+    extract.add_argument("archive", help="Archive to extract")
+    extract.add_argument("members", nargs="*", help="Only extract these paths (and what is under them)")
+    extract.add_argument("--output", "-o", help="Output directory (default: the archive's name)")
+    extract.add_argument("--collision", choices=EXTRACT_COLLISIONS, default="skip",
+                         help="What to do with existing files (default: skip)")
+    extract.add_argument("--preserve-permissions", action="store_true", help="Preserve file permissions")
+    common(extract)
+
+    listing = subparsers.add_parser("list", help="List an archive's contents")
+    listing.add_argument("archive", help="Archive to list")
+    listing.add_argument("--long", "-l", action="store_true", help="Show sizes and dates")
+    listing.add_argument("--json", action="store_true", help="Print the listing as JSON")
+    common(listing, skip=False)
+
+    update = subparsers.add_parser("update", help="Bring a directory up to date from a directory or archive")
+    update.add_argument("source", help="Directory or archive to update from")
+    update.add_argument("target", help="Directory to update")
+    update.add_argument("--checksum", action="store_true",
+                        help="Hash same-size files whose mtimes differ instead of copying them")
+    update.add_argument("--delete", action="store_true", help="Remove target files missing from the source")
+    update.add_argument("--collision", choices=["skip", "overwrite", "rename"], default="overwrite",
+                        help="For archive sources: what to do with existing files (default: overwrite)")
+    common(update)
+
+    verify = subparsers.add_parser("verify", help="Check an archive's integrity")
+    verify.add_argument("archive", help="Archive to verify")
+    verify.add_argument("--json", action="store_true", help="Print the report as JSON")
+    verify.add_argument("--report", metavar="FILE", help="Also write the JSON report to FILE")
+    verify.add_argument("--compare", action="store_true",
+                        help="Check contents against the source hashes recorded by 'create --hashes'")
+    verify.add_argument("--workers", "-w", type=int, default=None,
+                        help="ZIP verification processes (default: one per CPU)")
+    common(verify, skip=False)
+
+    return parser
+
+
+COMMANDS = {
+    'create': run_create,
+    'extract': run_extract,
+    'list': run_list,
+    'update': run_update,
+    'verify': run_verify,
+}
+
+
+def main(argv=None):
+    """Entry point for the varchiver-cli console script"""
+    # Frozen builds relaunch this binary for ZIP worker processes
+    multiprocessing.freeze_support()
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+    reporter = Reporter(quiet=args.quiet)
+    try:
+        return COMMANDS[args.command](args, reporter)
+    except KeyboardInterrupt:
+        reporter.done("Interrupted")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
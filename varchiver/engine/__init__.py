@@ -0,0 +1,11 @@
+"""Qt-free archive engines.
+
+Each job here does the work of one of the GUI's threads (archive creation,
+extraction, browsing, directory updates) and reports through ``Callback``
+attributes with the same names and arguments as the thread's signals, so
+``varchiver.threads`` only wraps them in QThreads and ``varchiver.cli``
+runs them directly. ``scheduler`` runs many of them at once. Nothing in
+this package imports PyQt6. Import the job modules themselves; this
+package deliberately imports nothing, so the CLI only pays for the engine
+it uses.
+"""
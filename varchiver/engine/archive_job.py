@@ -0,0 +1,525 @@
+import os
+import time
+import itertools
+import tarfile
+import zipfile
+import rarfile
+import fnmatch
+from pathlib import Path
+from ..utils.constants import DEFAULT_SKIP_PATTERNS
+from ..utils.archive_utils import get_archive_type, TAR_TYPES
+from ..sevenz import SevenZipHandler
+from ..utils.pattern_utils import get_skip_matcher
+from ..utils.parallel_zip import ParallelZipWriter
+from ..utils.parallel_compress import ParallelCompressedWriter, TAR_CODECS, DEFAULT_BLOCK_SIZE
+from ..utils.archive_index import write_index
+from ..utils.gzip_index import write_seek_index
+from ..utils.fs_scan import scan_paths, DEFAULT_SCAN_WORKERS
+from ..utils.fast_copy import copy_many
+from ..utils.progress import ProgressReporter
+from ..utils.hash_manifest import hash_source, write_hashes
+from .callbacks import Callback
+
+class ArchiveJob:
+    """Create an archive (or a directory copy) from files and directories
+
+    Reports through Callbacks named like ArchiveThread's signals:
+    progress(int), finished(str), error(str, bool), status(str),
+    file_counted(int) and index_entry(dict).
+    """
+
+    def __init__(self, files, archive_name, collision_strategy='skip', skip_patterns=None, 
+                 password=None, compression_level=5, preserve_permissions=True, workers=None,
+                 block_size=None, record_hashes=False):
+        self.progress = Callback()
+        self.finished = Callback()  # Archive name
+        self.error = Callback()  # error message, is_permission_error
+        self.status = Callback()  # Current file being processed
+        self.file_counted = Callback()  # Total files found during counting
+        self.index_entry = Callback()  # File info as it's added to archive
+        self.files = files
+        self.archive_name = archive_name
+        self.collision_strategy = collision_strategy
+        self.skip_patterns = skip_patterns or []
+        self._skip_matcher = get_skip_matcher(self.skip_patterns)
+        self.password = password
+        self.compression_level = compression_level
+        self.preserve_permissions = preserve_permissions
+        self.workers = workers  # Compression worker threads; None means one per CPU
+        self.block_size = block_size  # Uncompressed bytes per block for compressed tar output
+        self.record_hashes = record_hashes  # Write a .arhashes manifest for later verification
+        self._hashes = {}  # arcname -> (digest, size) of its source file
+        self.existing_files = {}
+        # arcname -> {'size': int, 'mtime': float} for every member written so far.
+        # Collision checks consult this instead of re-listing the archive per file.
+        self._member_index = {}
+        self._index_entries = []  # Entries written to the .arindex once the archive is closed
+        self.archive_type = get_archive_type(archive_name)
+        self._cancelled = False
+        self._total_files = 0
+        self._processed_files = 0
+        self._scan_complete = False
+        self._scan_stats = {}  # source path -> (size, mtime) cached from the scan
+        self._reporter = None
+
+    def run(self):
+        """Create the archive"""
+        try:
+            # Files stream from the scanner into the archive writer as they are found
+            self._processed_files = 0
+            self._total_files = 0
+            self._scan_complete = False
+            self._hashes = {}
+            # Totals grow as the scan streams in; percentages start once it is done
+            self._reporter = ProgressReporter(self.progress.emit, self.status.emit,
+                                              label="Adding to", totals_known=False)
+            files = self._iter_files()
+            first = next(files, None)
+            if self._cancelled:
+                return
+            if first is None:
+                raise Exception("No files to archive")
+            all_files = itertools.chain([first], files)
+                
+            # Create archive with collected files
+            self.status.emit("Creating archive...")
+            
+            if self.archive_type == '.zip':
+                self._create_zip_archive(all_files)
+            elif self.archive_type in TAR_TYPES:
+                self._create_tar_archive(all_files)
+            elif self.archive_type == '.7z':
+                self._create_7z_archive(all_files)
+            elif self.archive_type == '.rar':
+                self._create_rar_archive(all_files)
+            elif self.archive_type == 'dir':
+                self._create_directory_archive(all_files)
+                
+            if not self._cancelled:
+                self._reporter.finish()
+                if self.record_hashes and self.archive_type != 'dir':
+                    self.status.emit("Saving source hashes...")
+                    write_hashes(self.archive_name, self._hashes)
+                self.status.emit("Archive created successfully")
+                self.finished.emit(self.archive_name)
+                
+        except Exception as e:
+            self.error.emit(str(e), False)
+
+    def cancel(self):
+        """Cancel the archiving operation"""
+        self._cancelled = True
+        self.status.emit("Cancelling operation...")
+        
+    def _iter_files(self):
+        """Yield (file_path, base_dir) for every file to archive, counting them as they are found"""
+        for record in scan_paths(self.files, skip_file=self._should_skip,
+                                 skip_dir=self._should_skip_dir, workers=DEFAULT_SCAN_WORKERS,
+                                 cancel_check=lambda: self._cancelled, relative_skip=True):
+            self._total_files += 1
+            self._scan_stats[record.path] = (record.size, record.mtime)
+            self._reporter.add_total(record.size, 1)
+            if self._total_files % 1000 == 0:
+                rel_path = os.path.relpath(record.path, record.base_dir)
+                self.status.emit(f"On {rel_path.split(os.sep)[0]}: {self._total_files:,}")
+            yield record.path, record.base_dir
+        if not self._cancelled:
+            self._scan_complete = True
+            self._reporter.set_total()
+            self.file_counted.emit(self._total_files)
+
+    def _count_files(self, path):
+        """Count files under path that would be archived"""
+        return sum(1 for _ in scan_paths([path], skip_file=self._should_skip,
+                                         skip_dir=self._should_skip_dir,
+                                         cancel_check=lambda: self._cancelled,
+                                         relative_skip=True))
+
+    def _advance(self, file_path, current):
+        """Count file_path as done; the reporter decides when to tell anyone"""
+        self._processed_files += 1
+        stats = self._scan_stats.get(file_path)
+        self._reporter.advance(stats[0] if stats else 0, 1, current)
+
+    def _should_skip(self, filepath):
+        """Check if file should be skipped based on patterns (path relative to its scan root)"""
+        return self._skip_matcher.match(filepath)
+
+    def _should_skip_dir(self, dirpath):
+        """Check if a whole directory should be pruned from the scan (path relative to its scan root)"""
+        return self._skip_matcher.match_dir(dirpath)
+
+    def _handle_collision(self, file_path, archive_path, archive):
+        """Handle file collision based on strategy"""
+        if not self._file_exists_in_archive(archive_path, archive):
+            return archive_path
+
+        if self.collision_strategy == 'Skip existing files':
+            return None
+        elif self.collision_strategy == 'Overwrite existing files':
+            return archive_path
+        elif self.collision_strategy == 'Keep newer files':
+            file_time = os.path.getmtime(file_path)
+            archive_time = self._get_archive_file_time(archive_path, archive)
+            return archive_path if file_time > archive_time else None
+        elif self.collision_strategy == 'Keep larger files':
+            file_size = os.path.getsize(file_path)
+            archive_size = self._get_archive_file_size(archive_path, archive)
+            return archive_path if file_size > archive_size else None
+        elif self.collision_strategy == 'Keep both files':
+            # Generate a new unique name
+            base, ext = os.path.splitext(archive_path)
+            counter = 1
+            while self._file_exists_in_archive(f"{base}_{counter}{ext}", archive):
+                counter += 1
+            return f"{base}_{counter}{ext}"
+        elif self.collision_strategy == 'Ask for each file':
+            # This should be handled by the UI thread
+            self.status.emit(f"Collision: {archive_path}")
+            return None
+        else:
+            # Default to skip
+            return None
+
+    def _reset_member_index(self, archive=None):
+        """Start a fresh member index, seeding it from an archive that already has contents"""
+        self._member_index = {}
+        self._index_entries = []
+        if isinstance(archive, SevenZipHandler) and os.path.exists(archive.archive_path):
+            # 7z appends to an existing archive, so pick up what is already there once
+            try:
+                for info in archive.list_contents():
+                    self._member_index[info['path']] = {
+                        'size': info.get('size', 0),
+                        'mtime': self._parse_7z_mtime(info.get('modified', '')),
+                    }
+            except Exception as e:
+                print(f"Warning: Could not read existing 7z members: {e}")
+
+    def _record_member(self, arc_path, src_path):
+        """Remember a member written to the archive for later collision checks"""
+        if self.record_hashes:
+            self._hashes[arc_path] = hash_source(src_path)
+        cached = self._scan_stats.get(src_path)
+        if cached:
+            self._member_index[arc_path] = {'size': cached[0], 'mtime': cached[1]}
+            return
+        try:
+            stat = os.stat(src_path)
+            self._member_index[arc_path] = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        except OSError:
+            self._member_index[arc_path] = {'size': 0, 'mtime': 0}
+
+    @staticmethod
+    def _parse_7z_mtime(modified):
+        """Convert a 7z 'YYYY-MM-DD HH:MM:SS' listing timestamp to epoch seconds"""
+        from datetime import datetime
+        try:
+            return datetime.strptime(modified[:19], '%Y-%m-%d %H:%M:%S').timestamp()
+        except (TypeError, ValueError):
+            return 0
+
+    def _file_exists_in_archive(self, path, archive):
+        """Check if file exists in archive"""
+        return path in self._member_index
+
+    def _get_archive_file_time(self, path, archive):
+        """Get file modification time from archive"""
+        info = self._member_index.get(path)
+        return info['mtime'] if info else 0
+
+    def _get_archive_file_size(self, path, archive):
+        """Get file size from archive"""
+        info = self._member_index.get(path)
+        return info['size'] if info else 0
+
+    def _add_to_archive(self, archive, src_path, arc_path):
+        """Add a file to the archive and emit its info"""
+        try:
+            # Get file info before adding
+            stat = os.stat(src_path)
+            is_dir = os.path.isdir(src_path)
+            
+            # Create index entry
+            entry = {
+                'name': os.path.basename(arc_path),
+                'path': arc_path,
+                'path_parts': [p for p in arc_path.split('/') if p],
+                'size': 0 if is_dir else stat.st_size,
+                'compressed': 0,  # Will be updated after compression if available
+                'mtime': stat.st_mtime,
+                'is_dir': is_dir
+            }
+            
+            # Add to archive
+            if isinstance(archive, zipfile.ZipFile):
+                if not is_dir:
+                    archive.write(src_path, arc_path)
+                    info = archive.getinfo(arc_path)
+                    entry['compressed'] = info.compress_size
+                    entry['offset'] = info.header_offset
+            elif isinstance(archive, tarfile.TarFile):
+                entry['offset'] = archive.offset
+                archive.add(src_path, arc_path)
+                entry['compressed'] = entry['size']  # No compression in tar
+            elif isinstance(archive, rarfile.RarFile):
+                archive.write(src_path, arc_path)
+                info = archive.getinfo(arc_path)
+                entry['compressed'] = info.compress_size
+            elif isinstance(archive, SevenZipHandler):
+                archive.write(src_path, arc_path)
+                # 7z sizes will be available after closing
+            
+            self._record_member(arc_path, src_path)
+            self._index_entries.append(entry)
+
+            # Emit index entry
+            self.index_entry.emit(entry)
+            
+        except Exception as e:
+            print(f"Error adding {src_path}: {e}")
+            raise
+
+    def _save_index(self):
+        """Write the .arindex for the finished archive"""
+        if self._cancelled:
+            return
+        try:
+            self.status.emit("Saving archive index...")
+            write_index(self.archive_name, self._index_entries)
+        except Exception as e:
+            print(f"Warning: Could not save index: {e}")
+
+    def _create_zip_archive(self, files):
+        """Create a ZIP archive"""
+        if not self.password:
+            self._create_zip_archive_parallel(files)
+            return
+        try:
+            compression = zipfile.ZIP_DEFLATED
+            if self.password:
+                # Use ZIP_ENCRYPTED when password is provided
+                compression |= zipfile.ZIP_ENCRYPTED
+                
+            with zipfile.ZipFile(self.archive_name, 'w', compression=compression, compresslevel=self.compression_level) as archive:
+                if self.password:
+                    archive.setpassword(self.password.encode())
+                self._reset_member_index()
+                    
+                for file_path, base_dir in files:
+                    if self._cancelled:
+                        break
+                        
+                    rel_path = os.path.relpath(file_path, base_dir)
+                    first_dir = rel_path.split(os.sep)[0]
+                    
+                    arc_path = self._handle_collision(file_path, rel_path, archive)
+                    if arc_path:
+                        self._add_to_archive(archive, file_path, arc_path)
+                    self._advance(file_path, first_dir)
+
+            self._save_index()
+                    
+        except Exception as e:
+            raise Exception(f"Failed to create archive: {str(e)}")
+
+    def _create_zip_archive_parallel(self, files):
+        """Create a ZIP archive, compressing members on a worker pool"""
+        def on_written(info):
+            entry = {
+                'name': os.path.basename(info.filename),
+                'path': info.filename,
+                'path_parts': [p for p in info.filename.split('/') if p],
+                'size': info.file_size,
+                'compressed': info.compress_size,
+                'mtime': self._get_archive_file_time(info.filename, None),
+                'offset': info.header_offset,
+                'is_dir': False
+            }
+            self._index_entries.append(entry)
+            self.index_entry.emit(entry)
+
+        try:
+            writer = ParallelZipWriter(self.archive_name, compression_level=self.compression_level,
+                                       workers=self.workers, on_written=on_written)
+            self.status.emit(f"Compressing with {writer.workers} workers...")
+            self._reset_member_index()
+            try:
+                for file_path, base_dir in files:
+                    if self._cancelled:
+                        break
+
+                    rel_path = os.path.relpath(file_path, base_dir)
+                    first_dir = rel_path.split(os.sep)[0]
+
+                    arc_path = self._handle_collision(file_path, rel_path, None)
+                    if arc_path:
+                        self._record_member(arc_path, file_path)
+                        writer.add(file_path, arc_path)
+                    self._advance(file_path, first_dir)
+            except Exception:
+                writer.abort()
+                raise
+            writer.close()
+            self._save_index()
+
+        except Exception as e:
+            raise Exception(f"Failed to create archive: {str(e)}")
+
+    def _create_tar_archive(self, files):
+        """Create TAR archive, compressing the stream block-parallel for compressed formats"""
+        stream = None
+        try:
+            codec = TAR_CODECS.get(self.archive_type)
+            if codec:
+                stream = ParallelCompressedWriter(self.archive_name, codec=codec,
+                                                  level=self.compression_level, workers=self.workers,
+                                                  block_size=self.block_size or DEFAULT_BLOCK_SIZE)
+                self.status.emit(f"Compressing with {stream.workers} workers...")
+                archive = tarfile.open(fileobj=stream, mode='w')
+            else:
+                archive = tarfile.open(self.archive_name, 'w')
+            start_time = time.monotonic()
+            
+            with archive:
+                self._reset_member_index()
+                for file_path, base_dir in files:
+                    if self._cancelled:
+                        break
+                        
+                    rel_path = os.path.relpath(file_path, base_dir)
+                    first_dir = rel_path.split(os.sep)[0]
+                    
+                    arc_path = self._handle_collision(file_path, rel_path, archive)
+                    if arc_path:
+                        header_offset = archive.offset
+                        archive.add(file_path, arc_path)
+                        self._record_member(arc_path, file_path)
+                        
+                        member = self._member_index[arc_path]
+                        self._index_entries.append({
+                            'path': arc_path,
+                            'size': member['size'],
+                            'compressed': member['size'],  # TAR doesn't store compressed size
+                            'mtime': member['mtime'],
+                            'offset': header_offset,  # Offset in the uncompressed tar stream
+                            'is_dir': False
+                        })
+                    
+                    self._advance(file_path, first_dir)
+
+            if stream:
+                stream.close()
+                elapsed = time.monotonic() - start_time
+                if elapsed > 0:
+                    self.status.emit(f"Compressed {stream.bytes_in / (1024 * 1024):.1f} MB "
+                                     f"at {stream.bytes_in / elapsed / (1024 * 1024):.1f} MB/s")
+                if codec == 'gz' and not self._cancelled:
+                    # Every block is its own gzip member, so block starts are free seek points
+                    write_seek_index(self.archive_name, stream.seek_points)
+                
+            self._save_index()
+                    
+        except Exception as e:
+            if stream and not stream.closed:
+                stream.abort()
+            raise Exception(f"Failed to create archive: {str(e)}")
+
+    def _create_7z_archive(self, files):
+        """Create 7Z archive"""
+        try:
+            # Create 7z handler with indexing enabled
+            archive = SevenZipHandler(self.archive_name, index_store=True)
+            if self.password:
+                archive.password = self.password
+            self._reset_member_index(archive)
+            
+            archive.skip_patterns = self.skip_patterns
+            
+            # Decide every member's name first, then hand the whole batch to 7z
+            entries = []
+            for file_path, base_dir in files:
+                if self._cancelled:
+                    break
+                    
+                # Calculate relative path from base directory
+                rel_path = os.path.relpath(file_path, base_dir)
+                arc_path = self._handle_collision(file_path, rel_path, archive)
+                if arc_path:
+                    entries.append((file_path, arc_path))
+                    self._record_member(arc_path, file_path)
+
+            if entries and not self._cancelled:
+                # 7z reports a percentage of its input; turn it back into bytes and files
+                total_bytes = sum(self._scan_stats[path][0] for path, _ in entries)
+                self._reporter.set_total(total_bytes, len(entries))
+
+                def on_progress(percent):
+                    self._processed_files = len(entries) * percent // 100
+                    self._reporter.update(total_bytes * percent // 100, self._processed_files, "7z")
+
+                archive.write_many(entries, compression_level=self.compression_level,
+                                   progress_callback=on_progress,
+                                   cancel_check=lambda: self._cancelled)
+            
+            archive.close()
+
+            if not self._cancelled:
+                self._index_entries = [{
+                    'path': info['path'],
+                    'size': info.get('size', 0),
+                    'compressed': info.get('compressed_size', 0),
+                    'mtime': self._parse_7z_mtime(info.get('modified', '')),
+                    'is_dir': info.get('is_dir', False)
+                } for info in archive.list_contents()]
+                self._save_index()
+                
+        except Exception as e:
+            raise Exception(f"Failed to create archive: {str(e)}")
+
+    def _create_rar_archive(self, files):
+        """Create RAR archive"""
+        with rarfile.RarFile(self.archive_name, 'w') as archive:
+            if self.password:
+                archive.setpassword(self.password)
+            self._reset_member_index()
+            self._add_files_to_archive(archive, files)
+
+    def _add_files_to_archive(self, archive, files):
+        """Add files to the archive"""
+        for file_path, base_dir in files:
+            if self._cancelled:
+                break
+
+            rel_path = os.path.relpath(file_path, base_dir)
+            arc_path = self._handle_collision(file_path, rel_path, archive)
+            if arc_path:
+                archive.write(file_path, arc_path)
+                self._record_member(arc_path, file_path)
+            self._advance(file_path, rel_path.split(os.sep)[0])
+
+    def _create_directory_archive(self, files):
+        """Create a directory structure by copying files on a thread pool"""
+        os.makedirs(self.archive_name, exist_ok=True)
+        rel_paths = {}
+
+        def pairs():
+            for src_path, base_dir in files:
+                rel_path = os.path.relpath(src_path, base_dir)
+                rel_paths[src_path] = rel_path
+                yield src_path, os.path.join(self.archive_name, rel_path)
+
+        def on_copied(src_path, target_path, strategy, size):
+            rel_path = rel_paths.pop(src_path)
+            self._processed_files += 1
+            self._reporter.advance(size, 1, rel_path.split(os.sep)[0])
+            self.index_entry.emit({
+                'name': rel_path,
+                'size': size,
+                'mtime': self._scan_stats[src_path][1]
+            })
+
+        result = copy_many(pairs(), on_copied=on_copied,
+                           cancel_check=lambda: self._cancelled)
+        for src_path, message in result.errors:
+            self.error.emit(f"Failed to copy {src_path}: {message}", 'Permission denied' in message)
@@ -0,0 +1,222 @@
+import os
+import time
+import zipfile
+import tarfile
+from ..utils.archive_utils import get_archive_type, open_tar, TAR_TYPES
+from ..utils.archive_index import ArchiveIndex, load_index_entries, write_index
+from ..utils.archive_tree import build_tree, NodeTreeSource, IndexTreeSource
+from ..utils.listing_cache import get_listing_cache
+from ..utils.progress import ProgressReporter
+from .callbacks import Callback
+
+
+def read_listing(archive_path, password=None, status_callback=None, progress_callback=None):
+    """Read an archive's listing from the archive itself
+
+    Returns a list of {'path', 'size', 'is_dir'} dicts (7z entries also
+    carry 'modified'). A .tar.gz gets a .arindex with seek offsets written
+    on the way, so later extraction of single members can skip most of the
+    stream.
+    """
+    def status(message):
+        if status_callback:
+            status_callback(message)
+
+    def progress(percent):
+        if progress_callback:
+            progress_callback(percent)
+
+    # Format-specific modules are imported per branch so that a headless
+    # listing only pays for the format it reads
+    archive_type = get_archive_type(archive_path)
+    files = []
+
+    if archive_type == '.zip':
+        status("Reading ZIP archive...")
+        with zipfile.ZipFile(archive_path, 'r') as archive:
+            if password:
+                archive.setpassword(password.encode())
+            files = [{'path': info.filename, 'size': info.file_size, 'is_dir': info.filename.endswith('/')} 
+                    for info in archive.infolist()]
+
+    elif archive_type in ('.tar.gz', '.tgz'):
+        from ..utils.gzip_index import build_tar_gz_index
+        status("Reading TAR archive and building seek index...")
+        # Seek index construction is the first half of the progress bar
+        reporter = ProgressReporter(lambda percent: progress(percent // 2), status_callback,
+                                    label="Reading TAR archive",
+                                    total_bytes=os.path.getsize(archive_path))
+
+        def on_index_progress(done, total):
+            reporter.update(done, reporter.files_done + 1)
+
+        files = build_tar_gz_index(archive_path, progress_callback=on_index_progress)
+        reporter.finish()
+        try:
+            write_index(archive_path, files)
+        except OSError as e:
+            print(f"Warning: Could not write index: {e}")
+
+    elif archive_type in TAR_TYPES:
+        status("Reading TAR archive...")
+        with open_tar(archive_path) as archive:
+            files = [{'path': member.name, 'size': member.size, 'is_dir': member.isdir()} 
+                    for member in archive.getmembers()]
+
+    elif archive_type == '.rar':
+        import rarfile
+        status("Reading RAR archive...")
+        with rarfile.RarFile(archive_path, 'r') as archive:
+            if password:
+                archive.setpassword(password)
+            files = [{'path': info.filename, 'size': info.file_size, 'is_dir': info.isdir} 
+                    for info in archive.infolist()]
+
+    elif archive_type == '.7z':
+        from ..sevenz import SevenZipHandler
+        status("Reading 7z archive...")
+        progress(10)
+        archive = None
+        try:
+            archive = SevenZipHandler(archive_path)
+            if password:
+                archive.password = password
+
+            # Get file list from archive
+            status("Listing archive contents...")
+            progress(30)
+            files = [{'path': f['path'], 
+                      'size': f.get('size', 0), 
+                      'is_dir': f.get('is_dir', False),
+                      'modified': f.get('modified', '')} 
+                     for f in archive.list_contents()]
+            if not files:
+                raise Exception("No files found in archive")
+        except Exception as e:
+            raise Exception(f"Error reading 7z archive: {str(e)}")
+        finally:
+            if archive:
+                archive.close()
+
+    return files
+
+
+def open_index(archive_path):
+    """Open the archive's .arindex if it is still valid, migrating a legacy one"""
+    try:
+        index = ArchiveIndex.open(archive_path)
+        if index is None and load_index_entries(archive_path):
+            index = ArchiveIndex.open(archive_path)
+        return index
+    except Exception as e:
+        print(f"Warning: Could not load index: {e}")
+        return None
+
+
+def list_archive(archive_path, password=None, status_callback=None, progress_callback=None):
+    """An archive's listing from its index, the listing cache, or the archive, in that order
+
+    Returns (entries, source) where source is 'index', 'cache' or 'archive'.
+    Listings read from the archive are added to the cache (in memory only
+    for password-protected archives).
+    """
+    index = open_index(archive_path)
+    if index is not None:
+        with index:
+            return list(index), 'index'
+    cache = get_listing_cache()
+    cached = cache.get(archive_path)
+    if cached:
+        return cached, 'cache'
+    files = read_listing(archive_path, password, status_callback, progress_callback)
+    if files:
+        cache.put(archive_path, files, persist=not password)
+    return files, 'archive'
+
+
+class BrowseJob:
+    """Load an archive's contents for browsing
+
+    Reports through Callbacks named like BrowseThread's signals:
+    contents_ready(list), source_ready(object), error(str), progress(int)
+    and status(str).
+    """
+
+    def __init__(self, archive_path, password=None):
+        self.contents_ready = Callback()  # Top-level TreeNodes of the archive
+        self.source_ready = Callback()  # A tree source for ArchiveTreeModel
+        self.error = Callback()  # Error messages
+        self.progress = Callback()  # Progress percentage (0-100)
+        self.status = Callback()  # Status messages
+        self.archive_path = archive_path
+        self.password = password
+        self._cancelled = False
+        self._cache = get_listing_cache()
+
+    def run(self):
+        """Load the listing and emit a tree source for it"""
+        try:
+            self.status.emit("Opening archive...")
+            self.progress.emit(0)
+
+            # A persisted index is best: the view reads it lazily, so nothing is loaded up front
+            index = open_index(self.archive_path)
+            if index is not None:
+                self.status.emit(f"Using archive index ({len(index):,} entries)...")
+                self.source_ready.emit(IndexTreeSource(index))
+                self.progress.emit(100)
+                self.status.emit("Ready")
+                return
+
+            # Then a listing cached in memory or on disk by an earlier browse
+            cached_contents = self._cache.get(self.archive_path)
+            if cached_contents:
+                self.status.emit("Using cached contents...")
+                self.progress.emit(90)
+                self._process_files(cached_contents)
+                self.progress.emit(100)
+                return
+
+            files = read_listing(self.archive_path, self.password,
+                                 self.status.emit, self.progress.emit)
+
+            # Process files and update progress
+            if files:
+                # Listings of encrypted archives are not written to disk
+                self._cache.put(self.archive_path, files, persist=not self.password)
+                self.status.emit("Processing files...")
+                self.progress.emit(60)
+                self._process_files(files)
+                self.progress.emit(100)
+            else:
+                self.error.emit("No files found in archive")
+                
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _process_files(self, files):
+        """Build the directory tree from a flat listing and emit its top-level nodes"""
+        try:
+            if self._cancelled:
+                return
+
+            total_files = len(files)
+            self.status.emit(f"Processing {total_files:,} files...")
+
+            root = build_tree(files, progress_callback=self.progress.emit,
+                              cancel_check=lambda: self._cancelled)
+            if root is None:
+                return
+
+            self.status.emit("Finalizing...")
+            self.contents_ready.emit(root.sorted_children())
+            self.source_ready.emit(NodeTreeSource(root))
+            self.progress.emit(100)
+            self.status.emit("Ready")
+
+        except Exception as e:
+            self.error.emit(f"Error processing files: {str(e)}")
+
+    def cancel(self):
+        """Cancel the operation"""
+        self._cancelled = True
@@ -0,0 +1,28 @@
+"""Signal-like callbacks for the Qt-free jobs."""
+
+from typing import Callable, List
+
+
+class Callback:
+    """Stand-in for a pyqtSignal: emit() calls every connected function in order"""
+
+    __slots__ = ('_slots',)
+
+    def __init__(self):
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Callable) -> None:
+        self._slots.remove(slot)
+
+    def emit(self, *args) -> None:
+        for slot in list(self._slots):
+            slot(*args)
+
+
+def forward_signals(job, qobject, names) -> None:
+    """Connect each named Callback on job to the signal of the same name on qobject"""
+    for name in names:
+        getattr(job, name).connect(getattr(qobject, name).emit)
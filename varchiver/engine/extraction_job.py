@@ -0,0 +1,718 @@
+import contextlib
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+import rarfile
+import fnmatch
+import time
+from ..utils.archive_utils import get_archive_type, open_tar, format_size, extract_tar_member, TAR_TYPES
+from ..sevenz import SevenZipHandler
+from ..utils.archive_index import ArchiveIndex
+from ..utils.gzip_index import has_seek_points, iter_tar_members
+from ..utils.parallel_unzip import extract_zip_parallel
+from ..utils.fast_copy import copy_file, copy_many
+from ..utils.pattern_utils import get_skip_matcher
+from ..utils.progress import ProgressReporter
+from datetime import datetime
+from .callbacks import Callback
+
+class ExtractionJob:
+    """Extract an archive (or copy a directory) into extract_path
+
+    Reports through Callbacks named like ExtractionThread's signals:
+    progress(int), finished(str), error(str, bool), status(str),
+    collision_question(str) and collision_dialog_requested(list). The
+    'ask' collision strategy needs someone to answer: wait_for_collision_response
+    and wait_for_resolutions are replaced by whoever runs the job (the GUI
+    thread blocks on a dialog); by default nothing is overwritten.
+    """
+
+    def __init__(self, archive_name, extract_path, collision_strategy='skip', skip_patterns=None, password=None, preserve_permissions=True, file_list=None,
+                 workers=None):
+        self.progress = Callback()  # Progress percentage (0-100)
+        self.finished = Callback()  # Path where files were extracted
+        self.error = Callback()  # error message, is_permission_error
+        self.status = Callback()  # Current file being processed
+        self.collision_question = Callback()  # A collision needs user input
+        self.collision_dialog_requested = Callback()  # All collisions, for one dialog
+        self.archive_name = archive_name
+        self.extract_path = extract_path
+        self.collision_strategy = collision_strategy
+        self.skip_patterns = skip_patterns or []
+        self._skip_matcher = get_skip_matcher(self.skip_patterns)
+        self.password = password
+        self.preserve_permissions = preserve_permissions
+        self.file_list = file_list
+        self.workers = workers  # ZIP extraction processes; None means one per CPU
+        self._cancelled = False
+        self._collision_resolutions = {}
+        self._renamed = {}  # target path -> free name chosen by the 'rename' strategy
+        self.wait_for_collision_response = lambda: False
+        self.wait_for_resolutions = lambda: False
+
+    def run(self):
+        """Run the extraction operation"""
+        self.archive = None
+        try:
+            if self.file_list and self._extract_tar_gz_random_access():
+                self.finished.emit(self.extract_path)
+                return
+
+            # Tar archives are extracted in one sequential pass; 'ask' needs
+            # every collision up front for its dialog, so it keeps the two-pass path
+            if get_archive_type(self.archive_name) in TAR_TYPES and self.collision_strategy != 'ask':
+                if self._extract_tar_streaming() and not self._cancelled:
+                    self.finished.emit(self.extract_path)
+                return
+
+            self.archive = self._open_archive()
+            if not self.archive:
+                return
+
+            # Get list of files to extract
+            members = self._get_archive_members(self.archive)
+            if not members:
+                return
+            if self.file_list:
+                members = [m for m in members if self._is_selected(m)]
+
+            # Filter members based on skip patterns
+            filtered_members = []
+            for member in members:
+                if not self._skip_matcher.match(member):
+                    filtered_members.append(member)
+
+            # Check for duplicates and collisions
+            duplicates = self._find_duplicates(filtered_members)
+            if duplicates:
+                self.error.emit(
+                    f"Archive contains duplicate entries:\n" + 
+                    "\n".join(f"- {d}" for d in duplicates), 
+                    False
+                )
+                return
+
+            # Check for existing files
+            collisions = self._check_collisions(filtered_members)
+            if collisions and self.collision_strategy == 'ask':
+                # Emit signal for UI to show collision dialog
+                self.collision_dialog_requested.emit(collisions)
+                # Wait for resolutions
+                if not self.wait_for_resolutions():
+                    return
+
+            if isinstance(self.archive, zipfile.ZipFile):
+                self._extract_zip_parallel(filtered_members)
+                if not self._cancelled:
+                    self.finished.emit(self.extract_path)
+                return
+
+            if isinstance(self.archive, SevenZipHandler) and len(filtered_members) > 1:
+                self._extract_7z_batch(filtered_members)
+                if not self._cancelled:
+                    self.finished.emit(self.extract_path)
+                return
+
+            if isinstance(self.archive, DirectoryHandler) and len(filtered_members) > 1:
+                self._extract_directory_batch(filtered_members)
+                if not self._cancelled:
+                    self.finished.emit(self.extract_path)
+                return
+
+            # Extract files
+            reporter = self._reporter(total_files=len(filtered_members))
+            for i, member in enumerate(filtered_members):
+                if self._cancelled:
+                    break
+                reporter.update(files_done=i, current=member)
+
+                target_path = os.path.join(self.extract_path, member)
+                
+                # Skip if collision resolution says to skip
+                if target_path in self._collision_resolutions:
+                    if self._collision_resolutions[target_path] == 'skip':
+                        continue
+
+                # Create parent directory if needed
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+                # Handle collision based on strategy
+                if os.path.exists(target_path):
+                    if not self._handle_collision(target_path):
+                        continue
+
+                # Extract the file
+                renamed = self._renamed.get(target_path)
+                if renamed:
+                    with self._staging_dir() as staging_dir:
+                        self._extract_member(self.archive, member, staging_dir)
+                        self._move_renamed(staging_dir, [(member, renamed)])
+                else:
+                    self._extract_member(self.archive, member)
+
+            if not self._cancelled:
+                reporter.update(files_done=len(filtered_members))
+                reporter.finish()
+            self.finished.emit(self.extract_path)
+
+        except Exception as e:
+            self.error.emit(str(e), False)
+        finally:
+            if hasattr(self.archive, 'close'):
+                self.archive.close()
+
+    def _is_selected(self, member):
+        """Whether member is one of the requested paths or lies under one"""
+        name = member.rstrip('/')
+        return any(name == p.rstrip('/') or name.startswith(p.rstrip('/') + '/') for p in self.file_list)
+
+    def _extract_tar_gz_random_access(self):
+        """Extract the selected members of a .tar.gz using its seek index
+
+        Only used when both the .arindex (member offsets) and the gzip seek
+        index are present and current, and the collision strategy needs no
+        archive lookups. Returns False to fall back to a sequential pass,
+        which is also used when the archive has no seek point past its start
+        (a single gzip member indexed by an earlier process): seeking would
+        then re-inflate the archive from offset 0.
+        """
+        if get_archive_type(self.archive_name) not in ('.tar.gz', '.tgz'):
+            return False
+        if self.collision_strategy not in ('skip', 'overwrite') or not has_seek_points(self.archive_name):
+            return False
+        index = ArchiveIndex.open(self.archive_name)
+        if index is None:
+            return False
+
+        with index:
+            selected = {}
+            for path in self.file_list:
+                path = path.rstrip('/')
+                entry = index.find(path) or index.find(path + '/')
+                if entry:
+                    selected[entry['path']] = entry
+                for entry in index.iter_prefix(path + '/'):
+                    selected[entry['path']] = entry
+        if not selected or any(e['offset'] is None for e in selected.values()):
+            return False
+
+        members = [e for e in selected.values()
+                   if not self._skip_matcher.match(e['path'])]
+        reporter = self._reporter(total_bytes=sum(e['size'] or 0 for e in members),
+                                  total_files=len(members))
+        to_extract = {}
+        for entry in members:
+            target_path = os.path.join(self.extract_path, entry['path'])
+            if os.path.exists(target_path) and not entry['is_dir'] and not self._handle_collision(target_path):
+                reporter.advance(entry['size'] or 0)
+                continue
+            to_extract[entry['offset']] = entry
+
+        # One reader visits the members in stream order, only ever seeking forward
+        with contextlib.closing(iter_tar_members(self.archive_name, list(to_extract))) as found:
+            for tar, member in found:
+                if self._cancelled:
+                    return True
+                entry = to_extract[member.offset]
+                extract_tar_member(tar, member, self.extract_path, set_attrs=self.preserve_permissions)
+                reporter.advance(entry['size'] or 0, current=entry['path'])
+        reporter.finish()
+        return True
+
+    def cancel(self):
+        """Cancel the extraction operation"""
+        self._cancelled = True
+
+    def _reporter(self, **totals):
+        """A ProgressReporter feeding this job's progress and status callbacks"""
+        return ProgressReporter(self.progress.emit, self.status.emit, label="Extracting", **totals)
+
+    def _extract_tar_streaming(self):
+        """Extract a tar archive in a single forward pass over the stream
+
+        Members are visited in archive order and written as they are
+        decompressed, so compressed tars are never rewound or decompressed
+        twice. Skip patterns, selection and collision decisions are applied
+        per member from its header.
+
+        A duplicate member name is only seen once the stream reaches it, so
+        the error for it stops the extraction there, after the members that
+        precede it have been written. Returns False if that happened.
+        """
+        # Progress is by position in the (compressed) archive file
+        reporter = self._reporter(total_bytes=os.path.getsize(self.archive_name))
+        written = 0
+        seen = set()
+        start = time.monotonic()
+
+        with open(self.archive_name, 'rb') as raw, open_tar(self.archive_name, stream=True, fileobj=raw) as tar:
+            for member in tar:
+                if self._cancelled:
+                    break
+                name = member.name
+                if self._skip_matcher.match(name):
+                    continue
+                if self.file_list and not self._is_selected(name):
+                    continue
+
+                norm_path = os.path.normpath(name.lower())
+                if norm_path in seen:
+                    self.error.emit(f"Archive contains duplicate entries:\n- {name}", False)
+                    return False
+                seen.add(norm_path)
+
+                target_path = os.path.join(self.extract_path, name)
+                if os.path.lexists(target_path) and not member.isdir():
+                    member_info = {'mtime': member.mtime, 'size': member.size}
+                    if not self._handle_collision(target_path, member_info):
+                        continue
+
+                renamed = self._renamed.get(target_path)
+                if renamed:
+                    with self._staging_dir() as staging_dir:
+                        extract_tar_member(tar, member, staging_dir, set_attrs=self.preserve_permissions)
+                        self._move_renamed(staging_dir, [(name.lstrip('/'), renamed)])
+                else:
+                    extract_tar_member(tar, member, self.extract_path, set_attrs=self.preserve_permissions)
+                written += member.size
+                reporter.update(raw.tell(), reporter.files_done + 1, name)
+
+        elapsed = time.monotonic() - start
+        if elapsed > 0 and written:
+            self.status.emit(f"Extracted {format_size(written)} at {format_size(int(written / elapsed))}/s")
+        if not self._cancelled:
+            self.progress.emit(100)
+        return True
+
+    def _extract_zip_parallel(self, members):
+        """Resolve collisions here, then inflate the remaining ZIP members on a process pool"""
+        to_extract = []
+        for member in members:
+            target_path = os.path.join(self.extract_path, member)
+            if self._collision_resolutions.get(target_path) == 'skip':
+                continue
+            if os.path.exists(target_path) and not member.endswith('/'):
+                if not self._handle_collision(target_path):
+                    continue
+            to_extract.append(member)
+
+        reporter = self._reporter()
+
+        def on_progress(done, total):
+            if total != reporter.total_bytes:
+                reporter.set_total(total)
+            reporter.update(done)
+
+        to_extract, renamed = self._split_renamed(to_extract)
+        self.status.emit(f"Extracting {len(to_extract) + len(renamed):,} files...")
+        result = extract_zip_parallel(self.archive_name, self.extract_path, to_extract,
+                                      password=self.password,
+                                      preserve_permissions=self.preserve_permissions,
+                                      workers=self.workers,
+                                      progress_callback=on_progress,
+                                      cancel_check=lambda: self._cancelled)
+        if renamed and not self._cancelled:
+            with self._staging_dir() as staging_dir:
+                staged = extract_zip_parallel(self.archive_name, staging_dir, [m for m, _ in renamed],
+                                              password=self.password,
+                                              preserve_permissions=self.preserve_permissions,
+                                              workers=self.workers,
+                                              cancel_check=lambda: self._cancelled)
+                result['errors'].extend(staged['errors'])
+                failed = {name for name, _ in staged['errors']}
+                self._move_renamed(staging_dir, [(m, t) for m, t in renamed if m not in failed])
+        if not self._cancelled:
+            reporter.finish()
+        if result['errors']:
+            name, message = result['errors'][0]
+            raise Exception(f"Failed to extract {len(result['errors'])} files "
+                            f"(first: {name}: {message})")
+
+    def _extract_7z_batch(self, members):
+        """Resolve collisions here, then extract the remaining 7z members in one 7z run"""
+        to_extract = []
+        for member in members:
+            target_path = os.path.join(self.extract_path, member)
+            if self._collision_resolutions.get(target_path) == 'skip':
+                continue
+            if os.path.exists(target_path) and not os.path.isdir(target_path):
+                if not self._handle_collision(target_path):
+                    continue
+            to_extract.append(member)
+
+        in_place, renamed = self._split_renamed(to_extract)
+
+        # 7z reports a percentage; count it as files so the status shows progress and ETA
+        reporter = self._reporter(total_files=len(to_extract))
+
+        def on_progress(percent, offset=0, count=len(in_place)):
+            reporter.update(files_done=offset + count * percent // 100)
+
+        self.status.emit(f"Extracting {len(to_extract):,} files...")
+        try:
+            if in_place:
+                self.archive.extract_many(in_place, self.extract_path, progress_callback=on_progress,
+                                          cancel_check=lambda: self._cancelled)
+            if renamed:
+                # Renamed members go through a staging directory in one more 7z run
+                with self._staging_dir() as staging_dir:
+                    self.archive.extract_many([m for m, _ in renamed], staging_dir,
+                                              progress_callback=lambda p: on_progress(p, len(in_place),
+                                                                                      len(renamed)),
+                                              cancel_check=lambda: self._cancelled)
+                    self._move_renamed(staging_dir, renamed)
+        except Exception:
+            if self._cancelled:
+                return
+            raise
+        reporter.finish()
+
+        if self.preserve_permissions:
+            final_paths = [(m, os.path.join(self.extract_path, m)) for m in in_place] + renamed
+            for member, target_path in final_paths:
+                mode = self._get_member_mode(self.archive, member)
+                if mode and os.path.exists(target_path):
+                    try:
+                        os.chmod(target_path, mode)
+                    except OSError as e:
+                        self.error.emit(f"Error setting permissions for {member}: {str(e)}", True)
+
+    def _extract_directory_batch(self, members):
+        """Resolve collisions here, then copy the remaining files on a thread pool"""
+        to_extract = []
+        for member in members:
+            target_path = os.path.join(self.extract_path, member)
+            if self._collision_resolutions.get(target_path) == 'skip':
+                continue
+            if os.path.exists(target_path) and not self._handle_collision(target_path):
+                continue
+            to_extract.append(member)
+
+        total = len(to_extract)
+        reporter = ProgressReporter(self.progress.emit, self.status.emit, label="Copying",
+                                    total_files=total)
+
+        def on_progress(result):
+            reporter.update(result.bytes, result.files)
+
+        self.status.emit(f"Copying {total:,} files...")
+        in_place, renamed = self._split_renamed(to_extract)
+        result = self.archive.extract_many(in_place, self.extract_path,
+                                           preserve_metadata=self.preserve_permissions,
+                                           progress_callback=on_progress,
+                                           cancel_check=lambda: self._cancelled,
+                                           targets=renamed)
+        reporter.finish()
+        if result.errors:
+            name, message = result.errors[0]
+            raise Exception(f"Failed to copy {len(result.errors)} files "
+                            f"(first: {name}: {message})")
+
+    def _handle_collision(self, target_path, member_info=None):
+        """Handle file collision based on strategy
+
+        member_info ({'mtime', 'size'}) avoids looking the member up in the
+        archive, which streaming extraction cannot do.
+        """
+        if not os.path.exists(target_path):
+            return True
+
+        if self.collision_strategy == 'skip':
+            return False
+        elif self.collision_strategy == 'overwrite':
+            try:
+                if os.path.isfile(target_path):
+                    os.remove(target_path)
+                elif os.path.isdir(target_path):
+                    os.rmdir(target_path)
+                return True
+            except Exception as e:
+                self.error.emit(f"Error overwriting {target_path}: {str(e)}", False)
+                return False
+        elif self.collision_strategy == 'rename':
+            if os.path.isdir(target_path):
+                return True  # Directories are merged, not renamed
+            base, ext = os.path.splitext(target_path)
+            counter = 1
+            new_path = target_path
+            taken = set(self._renamed.values())
+            while os.path.lexists(new_path) or new_path in taken:
+                new_path = f"{base}_{counter}{ext}"
+                counter += 1
+            # Callers write the member to this path instead of target_path
+            self._renamed[target_path] = new_path
+            self.status.emit(f"Renamed to {os.path.basename(new_path)}")
+            return True
+        elif self.collision_strategy == 'newer':
+            try:
+                existing_mtime = os.path.getmtime(target_path)
+                archive_mtime = member_info['mtime'] if member_info else self._get_member_mtime(target_path)
+                return archive_mtime > existing_mtime
+            except Exception as e:
+                self.error.emit(f"Error comparing modification times: {str(e)}", False)
+                return False
+        elif self.collision_strategy == 'older':
+            try:
+                existing_mtime = os.path.getmtime(target_path)
+                archive_mtime = member_info['mtime'] if member_info else self._get_member_mtime(target_path)
+                return archive_mtime < existing_mtime
+            except Exception as e:
+                self.error.emit(f"Error comparing modification times: {str(e)}", False)
+                return False
+        elif self.collision_strategy == 'larger':
+            try:
+                existing_size = os.path.getsize(target_path)
+                archive_size = member_info['size'] if member_info else self._get_member_size(target_path)
+                return archive_size > existing_size
+            except Exception as e:
+                self.error.emit(f"Error comparing file sizes: {str(e)}", False)
+                return False
+        elif self.collision_strategy == 'smaller':
+            try:
+                existing_size = os.path.getsize(target_path)
+                archive_size = member_info['size'] if member_info else self._get_member_size(target_path)
+                return archive_size < existing_size
+            except Exception as e:
+                self.error.emit(f"Error comparing file sizes: {str(e)}", False)
+                return False
+        elif self.collision_strategy == 'ask':
+            # Emit a signal to ask the user
+            self.collision_question.emit(target_path)
+            # Wait for response
+            if not self.wait_for_collision_response():
+                return False
+            return True
+
+        return False
+
+    def _find_duplicates(self, members):
+        """Find duplicate entries in the archive"""
+        seen = set()
+        duplicates = []
+        for member in members:
+            norm_path = os.path.normpath(member.lower())
+            if norm_path in seen:
+                duplicates.append(member)
+            seen.add(norm_path)
+        return duplicates
+
+    def _check_collisions(self, members):
+        """Check for existing files that would be overwritten"""
+        collisions = []
+        for member in members:
+            target_path = os.path.join(self.extract_path, member)
+            if os.path.exists(target_path):
+                # Get info about existing file
+                existing_info = {
+                    'size': os.path.getsize(target_path),
+                    'modified': os.path.getmtime(target_path)
+                }
+                # Get info about archive member
+                archive_info = {
+                    'size': self._get_member_size(target_path),
+                    'modified': self._get_member_mtime(target_path)
+                }
+                collisions.append((member, target_path, archive_info))
+        return collisions
+
+    def _open_archive(self):
+        """Open archive based on type"""
+        try:
+            archive_type = get_archive_type(self.archive_name)
+            
+            if archive_type == 'dir':
+                return DirectoryHandler(self.archive_name, self.progress, self.status)
+            elif archive_type == '.zip':
+                archive = zipfile.ZipFile(self.archive_name, 'r')
+                if self.password:
+                    archive.setpassword(self.password.encode())
+                return archive
+            elif archive_type in TAR_TYPES:
+                return open_tar(self.archive_name)
+            elif archive_type == '.rar':
+                archive = rarfile.RarFile(self.archive_name, 'r')
+                if self.password:
+                    archive.setpassword(self.password)
+                return archive
+            elif archive_type == '.7z':
+                archive = SevenZipHandler(self.archive_name)
+                if self.password:
+                    archive.password = self.password
+                return archive
+            else:
+                self.error.emit(f"Unsupported archive type: {archive_type}", False)
+                return None
+                
+        except Exception as e:
+            self.error.emit(str(e), False)
+            return None
+
+    def _get_archive_members(self, archive):
+        """Get list of files in the archive"""
+        try:
+            if isinstance(archive, (zipfile.ZipFile, rarfile.RarFile, SevenZipHandler, DirectoryHandler)):
+                return archive.namelist()
+            elif isinstance(archive, tarfile.TarFile):
+                return archive.getnames()
+            return []
+        except Exception as e:
+            self.error.emit(str(e), False)
+            return []
+
+    def _split_renamed(self, members):
+        """(members written in place, [(member, new path)] for those the 'rename' strategy moved)"""
+        in_place, renamed = [], []
+        for member in members:
+            new_path = self._renamed.get(os.path.join(self.extract_path, member))
+            if new_path:
+                renamed.append((member, new_path))
+            else:
+                in_place.append(member)
+        return in_place, renamed
+
+    @contextlib.contextmanager
+    def _staging_dir(self):
+        """A temporary directory inside extract_path for members extracted under a new name"""
+        os.makedirs(self.extract_path, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix='.varchiver-', dir=self.extract_path)
+        try:
+            yield staging_dir
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _move_renamed(self, staging_dir, renamed):
+        """Move (member, new path) pairs from staging_dir to their new names"""
+        for member, new_path in renamed:
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            os.replace(os.path.join(staging_dir, member), new_path)
+
+    def _extract_member(self, archive, member, dest=None):
+        """Extract a single member from the archive into dest (default extract_path)"""
+        dest = dest or self.extract_path
+        try:
+            if isinstance(archive, (zipfile.ZipFile, rarfile.RarFile)):
+                archive.extract(member, dest)
+            elif isinstance(archive, tarfile.TarFile):
+                extract_tar_member(archive, archive.getmember(member), dest)
+            elif isinstance(archive, SevenZipHandler):
+                archive.extract(member, dest)
+            elif isinstance(archive, DirectoryHandler):
+                archive.extract(member, dest)
+
+            # Handle permissions if needed
+            if self.preserve_permissions:
+                target_path = os.path.join(dest, member)
+                if os.path.exists(target_path):
+                    mode = self._get_member_mode(archive, member)
+                    if mode:
+                        try:
+                            os.chmod(target_path, mode)
+                        except Exception as e:
+                            self.error.emit(f"Error setting permissions for {member}: {str(e)}", True)
+
+        except Exception as e:
+            raise Exception(f"Failed to extract {member}: {str(e)}")
+
+    def _get_member_mtime(self, target_path):
+        """Get modification time of archive member"""
+        member_name = os.path.relpath(target_path, self.extract_path)
+        if isinstance(self.archive, zipfile.ZipFile):
+            info = self.archive.getinfo(member_name)
+            return datetime(*info.date_time).timestamp()
+        elif isinstance(self.archive, tarfile.TarFile):
+            info = self.archive.getmember(member_name)
+            return info.mtime
+        elif isinstance(self.archive, SevenZipHandler):
+            info = self.archive.getinfo(member_name)
+            return info.get('mtime', 0)
+        return 0
+
+    def _get_member_size(self, target_path):
+        """Get size of archive member"""
+        member_name = os.path.relpath(target_path, self.extract_path)
+        if isinstance(self.archive, zipfile.ZipFile):
+            info = self.archive.getinfo(member_name)
+            return info.file_size
+        elif isinstance(self.archive, tarfile.TarFile):
+            info = self.archive.getmember(member_name)
+            return info.size
+        elif isinstance(self.archive, SevenZipHandler):
+            info = self.archive.getinfo(member_name)
+            return info.get('size', 0)
+        return 0
+
+    def _get_member_mode(self, archive, member):
+        """Get the permission mode for a member"""
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                return (archive.getinfo(member).external_attr >> 16) & 0o777
+            elif isinstance(archive, tarfile.TarFile):
+                return archive.getmember(member).mode
+            elif isinstance(archive, rarfile.RarFile):
+                return archive.getinfo(member).mode
+            elif isinstance(archive, SevenZipHandler):
+                return archive.getinfo(member).get('mode')
+            elif isinstance(archive, DirectoryHandler):
+                return os.stat(os.path.join(archive.directory_path, member)).st_mode
+            return None
+        except Exception:
+            return None
+
+class DirectoryHandler:
+    """Handler for directory operations that mimics archive interface"""
+    def __init__(self, directory_path, progress_signal=None, status_signal=None):
+        self.directory_path = directory_path
+        self._file_list = None
+        self._progress_signal = progress_signal
+        self._status_signal = status_signal
+
+    def namelist(self):
+        """Get list of files in directory"""
+        if self._file_list is None:
+            self._file_list = []
+            total_items = sum([len(files) for _, _, files in os.walk(self.directory_path)])
+            processed = 0
+            
+            if self._status_signal:
+                self._status_signal.emit("Reading directory contents...")
+            
+            for root, _, files in os.walk(self.directory_path):
+                for file in files:
+                    full_path = os.path.join(root, file)
+                    rel_path = os.path.relpath(full_path, self.directory_path)
+                    self._file_list.append(rel_path)
+                    processed += 1
+                    
+                    if self._progress_signal and total_items > 0:
+                        progress = int(processed * 100 / total_items)
+                        self._progress_signal.emit(progress)
+            
+            if self._status_signal:
+                self._status_signal.emit(f"Found {len(self._file_list)} files")
+                
+        return self._file_list
+
+    def extract(self, member, path):
+        """Copy file to target path"""
+        src = os.path.join(self.directory_path, member)
+        dst = os.path.join(path, member)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        copy_file(src, dst)
+
+    def extract_many(self, members, path, preserve_metadata=True,
+                     progress_callback=None, cancel_check=None, targets=()):
+        """Copy many files to path on a thread pool; returns a fast_copy.CopyResult
+
+        targets are extra (member, destination file) pairs copied in the same run.
+        """
+        pairs = [(os.path.join(self.directory_path, member), os.path.join(path, member))
+                 for member in members]
+        pairs += [(os.path.join(self.directory_path, member), target) for member, target in targets]
+        return copy_many(pairs, preserve_metadata=preserve_metadata,
+                         progress_callback=progress_callback, cancel_check=cancel_check)
+
+    def close(self):
+        """No-op for compatibility"""
+        pass
@@ -0,0 +1,376 @@
+"""Run many extraction and archive-creation jobs at once.
+
+JobScheduler keeps up to ``max_jobs`` jobs running, each on its own
+thread, within two global budgets:
+
+* CPU: ``cpu_budget`` worker processes/threads are shared by the running
+  jobs. A job is started with an equal share of what is left, so a lone
+  archive gets every core and 300 archives get a few each.
+* I/O: at most ``io_per_device`` running jobs read or write any one
+  storage device, so a queue on a single disk does not thrash it.
+
+Queued jobs run highest ``priority`` first, then largest archive first:
+starting the big ones early keeps a long archive from running alone at
+the end of the queue. Jobs can be paused, resumed and cancelled; a
+running job pauses at its next progress or status report.
+"""
+
+import contextlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .callbacks import Callback
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PAUSED = 'paused'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+DEFAULT_MAX_JOBS = 4
+DEFAULT_IO_PER_DEVICE = 2
+
+# Nobody answers 'ask' collision prompts for a scheduled job, so it gets
+# this strategy instead, which leaves existing files untouched
+UNATTENDED_COLLISION_STRATEGY = 'skip'
+
+
+def _device_of(path) -> Optional[int]:
+    """st_dev of path, or of its nearest existing parent"""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+
+def _size_of(paths) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path) if os.path.isfile(path) else 0
+        except OSError:
+            pass
+    return total
+
+
+class ScheduledJob:
+    """A job in a JobScheduler: what it is, its state and its last progress"""
+
+    def __init__(self, job_id, kind, label, factory, size, priority, paths):
+        self.id = job_id
+        self.kind = kind  # 'extract' or 'create'
+        self.label = label
+        self.size = size
+        self.priority = priority
+        self.devices = {dev for dev in map(_device_of, paths) if dev is not None}
+        self.state = QUEUED
+        self.progress = 0
+        self.message = ''
+        self.errors: List[str] = []
+        self.result = None  # What the job's finished callback reported
+        self.workers = None  # CPU share granted when started
+        self.started = None
+        self.ended = None
+        self.job = None
+        self._factory = factory
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancelled = False
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.monotonic()) - self.started
+
+    def _sort_key(self, seq):
+        return (-self.priority, -self.size, seq)
+
+    def _checkpoint(self):
+        """Called from the job's thread at each report; blocks while paused"""
+        self._resume.wait()
+
+
+class JobScheduler:
+    """Runs ScheduledJobs concurrently within a CPU and I/O budget
+
+    Callbacks (emitted from worker threads):
+    job_added(ScheduledJob), job_updated(ScheduledJob) on state or progress
+    changes, job_finished(ScheduledJob) and all_done() when nothing is
+    queued or running.
+    """
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS, cpu_budget: Optional[int] = None,
+                 io_per_device: int = DEFAULT_IO_PER_DEVICE):
+        self.job_added = Callback()
+        self.job_updated = Callback()
+        self.job_finished = Callback()
+        self.all_done = Callback()
+        self.max_jobs = max(1, max_jobs)
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+        self.io_per_device = max(1, io_per_device)
+        self.jobs: Dict[int, ScheduledJob] = {}
+        self._queue = []  # heap of (sort key, ScheduledJob)
+        self._running: Dict[int, ScheduledJob] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._paused = False
+        self._holding = 0
+
+    # Submitting
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Start nothing until the block ends, so jobs submitted together are
+        ordered and given CPU shares as a whole"""
+        self._holding += 1
+        try:
+            yield self
+        finally:
+            self._holding -= 1
+            self._dispatch()
+
+    def submit(self, kind: str, label: str, factory: Callable[[int], object], size: int = 0,
+               priority: int = 0, paths=()) -> ScheduledJob:
+        """Queue a job built by factory(workers) when it starts
+
+        The job must have run() and cancel() and progress, status, error
+        and finished Callbacks, like ExtractionJob and ArchiveJob. paths are
+        the files and directories it reads or writes, for the I/O budget.
+        """
+        with self._lock:
+            scheduled = ScheduledJob(next(self._ids), kind, label, factory, size, priority, paths)
+            self.jobs[scheduled.id] = scheduled
+            heapq.heappush(self._queue, (scheduled._sort_key(next(self._seq)), scheduled))
+        self.job_added.emit(scheduled)
+        self._dispatch()
+        return scheduled
+
+    def submit_extraction(self, archive_name, output_dir, priority=0, **kwargs) -> ScheduledJob:
+        """Queue an ExtractionJob; kwargs are its keyword arguments
+
+        An 'ask' collision_strategy becomes UNATTENDED_COLLISION_STRATEGY.
+        """
+        from .extraction_job import ExtractionJob
+
+        if kwargs.get('collision_strategy') == 'ask':
+            kwargs['collision_strategy'] = UNATTENDED_COLLISION_STRATEGY
+
+        def factory(workers):
+            return ExtractionJob(archive_name, output_dir, workers=workers, **kwargs)
+
+        return self.submit('extract', os.path.basename(archive_name.rstrip(os.sep)), factory,
+                           size=_size_of([archive_name]), priority=priority,
+                           paths=(archive_name, output_dir))
+
+    def submit_archive(self, files, archive_name, priority=0, **kwargs) -> ScheduledJob:
+        """Queue an ArchiveJob; kwargs are its keyword arguments"""
+        from .archive_job import ArchiveJob
+
+        def factory(workers):
+            return ArchiveJob(files, archive_name, workers=workers, **kwargs)
+
+        return self.submit('create', os.path.basename(archive_name), factory,
+                           size=_size_of(files), priority=priority,
+                           paths=list(files) + [archive_name])
+
+    # Control
+
+    def pause(self, job_id: int) -> None:
+        """Pause a queued or running job; a running one stops at its next report"""
+        with self._lock:
+            scheduled = self.jobs[job_id]
+            if scheduled.state not in (QUEUED, RUNNING):
+                return
+            scheduled._resume.clear()
+            scheduled.state = PAUSED
+        self.job_updated.emit(scheduled)
+
+    def resume(self, job_id: int) -> None:
+        with self._lock:
+            scheduled = self.jobs[job_id]
+            if scheduled.state != PAUSED:
+                return
+            scheduled.state = RUNNING if scheduled.id in self._running else QUEUED
+            scheduled._resume.set()
+        self.job_updated.emit(scheduled)
+        self._dispatch()
+
+    def cancel(self, job_id: int) -> None:
+        """Cancel a job; queued jobs never start, running ones are asked to stop"""
+        with self._lock:
+            scheduled = self.jobs[job_id]
+            if scheduled.state in FINAL_STATES or scheduled._cancelled:
+                return
+            scheduled._cancelled = True
+            running = scheduled.id in self._running
+            if not running:
+                scheduled.state = CANCELLED
+                self._queue = [(key, s) for key, s in self._queue if s is not scheduled]
+                heapq.heapify(self._queue)
+            scheduled._resume.set()
+        if running:
+            # A job still being built is cancelled by _run once it exists
+            if scheduled.job is not None:
+                scheduled.job.cancel()
+        else:
+            self.job_finished.emit(scheduled)
+            self._dispatch()
+            self._check_idle()
+
+    def pause_all(self) -> None:
+        """Stop starting jobs and pause the running ones"""
+        self._paused = True
+        for job_id in list(self.jobs):
+            self.pause(job_id)
+
+    def resume_all(self) -> None:
+        self._paused = False
+        for job_id in list(self.jobs):
+            self.resume(job_id)
+        self._dispatch()
+
+    def cancel_all(self) -> None:
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def set_max_jobs(self, max_jobs: int) -> None:
+        self.max_jobs = max(1, max_jobs)
+        self._dispatch()
+
+    def clear_finished(self) -> None:
+        """Forget jobs that are done, failed or cancelled"""
+        with self._lock:
+            for job_id in [i for i, s in self.jobs.items() if s.state in FINAL_STATES]:
+                del self.jobs[job_id]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state"""
+        with self._lock:
+            counts = dict.fromkeys((QUEUED, RUNNING, PAUSED, DONE, FAILED, CANCELLED), 0)
+            for scheduled in self.jobs.values():
+                counts[scheduled.state] += 1
+            return counts
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is queued or running; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(self._is_idle, timeout)
+
+    # Scheduling
+
+    def _is_idle(self) -> bool:
+        return not self._running and not any(s.state == QUEUED for _, s in self._queue)
+
+    def _fits_io(self, scheduled) -> bool:
+        for device in scheduled.devices:
+            busy = sum(1 for running in self._running.values() if device in running.devices)
+            if busy >= self.io_per_device:
+                return False
+        return True
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while the job count and the budgets allow"""
+        to_start = []
+        with self._lock:
+            if self._paused or self._holding:
+                return
+            used_cpu = sum(s.workers for s in self._running.values())
+            skipped = []
+            while self._queue and len(self._running) < self.max_jobs:
+                key, scheduled = heapq.heappop(self._queue)
+                # Paused jobs and jobs whose devices are busy keep their place
+                if scheduled.state != QUEUED or not self._fits_io(scheduled):
+                    skipped.append((key, scheduled))
+                    continue
+                # An equal share of the CPU left for this job and the others that can start
+                slots = min(self.max_jobs - len(self._running), 1 + len(self._queue))
+                free_cpu = self.cpu_budget - used_cpu
+                if free_cpu < 1 and self._running:
+                    skipped.append((key, scheduled))
+                    break
+                scheduled.workers = max(1, free_cpu // slots)
+                used_cpu += scheduled.workers
+                scheduled.state = RUNNING
+                scheduled.started = time.monotonic()
+                self._running[scheduled.id] = scheduled
+                to_start.append(scheduled)
+            for item in skipped:
+                heapq.heappush(self._queue, item)
+
+        for scheduled in to_start:
+            self.job_updated.emit(scheduled)
+            threading.Thread(target=self._run, args=(scheduled,), daemon=True,
+                             name=f"varchiver-job-{scheduled.id}").start()
+
+    def _run(self, scheduled: ScheduledJob) -> None:
+        try:
+            job = scheduled._factory(scheduled.workers)
+            scheduled.job = job
+            if scheduled._cancelled:
+                job.cancel()
+
+            def on_progress(percent):
+                scheduled.progress = percent
+                scheduled._checkpoint()
+                self.job_updated.emit(scheduled)
+
+            def on_status(message):
+                scheduled.message = message
+                scheduled._checkpoint()
+                self.job_updated.emit(scheduled)
+
+            def on_error(message, is_permission_error=False):
+                scheduled.errors.append(message)
+
+            def on_finished(result=None):
+                scheduled.result = result
+
+            job.progress.connect(on_progress)
+            job.status.connect(on_status)
+            job.error.connect(on_error)
+            job.finished.connect(on_finished)
+            job.run()
+        except Exception as e:
+            scheduled.errors.append(str(e))
+
+        with self._lock:
+            del self._running[scheduled.id]
+            scheduled.ended = time.monotonic()
+            if scheduled._cancelled:
+                scheduled.state = CANCELLED
+            elif scheduled.result is None:
+                # A job that returns without reporting finished or an error
+                # (e.g. waiting on an answer nobody gives) did not complete
+                if not scheduled.errors:
+                    scheduled.errors.append("Stopped without finishing")
+                scheduled.state = FAILED
+            else:
+                scheduled.state = DONE
+                scheduled.progress = 100
+        self.job_finished.emit(scheduled)
+        self._dispatch()
+        self._check_idle()
+
+    def _check_idle(self) -> None:
+        """Wake wait() and emit all_done once nothing is queued or running"""
+        with self._idle:
+            idle = self._is_idle()
+            if idle:
+                self._idle.notify_all()
+        if idle:
+            self.all_done.emit()
@@ -0,0 +1,428 @@
+import os
+import shutil
+import tempfile
+import zipfile
+import tarfile
+import rarfile
+from pathlib import Path
+from ..utils.archive_utils import get_archive_type, format_size
+from ..utils.dir_sync import sync_directories
+from ..utils.fast_copy import copy_file
+from ..utils.pattern_utils import get_skip_matcher
+from ..utils.progress import ProgressReporter
+from ..sevenz import SevenZipHandler
+from .callbacks import Callback
+
+class DirectoryUpdateJob:
+    """Update a directory from another directory or archive
+
+    Reports through Callbacks named like DirectoryUpdateThread's signals:
+    progress(int), finished(str), error(str, bool), status(str),
+    file_counted(int) and sync_stats(dict).
+    """
+
+    def __init__(self, source_path, target_path, collision_strategy='skip', skip_patterns=None, password=None,
+                 incremental=False, checksum=False, delete=False):
+        """
+        Args:
+            incremental: For directory sources, copy only new or changed files
+                (size + mtime) instead of applying collision_strategy per file
+            checksum: With incremental, hash same-size files whose mtimes differ
+            delete: With incremental, remove target files missing from the source
+        """
+        self.progress = Callback()
+        self.finished = Callback()
+        self.error = Callback()  # error message, is_permission_error
+        self.status = Callback()  # Current file being processed
+        self.file_counted = Callback()  # Total files found during counting
+        self.sync_stats = Callback()  # SyncStats.as_dict() after an incremental sync
+        self.source_path = source_path
+        self.target_path = target_path
+        self.collision_strategy = collision_strategy
+        self.skip_patterns = skip_patterns or []
+        self._skip_matcher = get_skip_matcher(self.skip_patterns)
+        self.password = password
+        self.incremental = incremental
+        self.checksum = checksum
+        self.delete = delete
+        self._cancelled = False
+        self._total_files = 0
+        self._processed_files = 0
+        self._reporter = None
+
+    def run(self):
+        """Run the directory update"""
+        try:
+            # Determine if source is a directory or archive
+            source_type = get_archive_type(self.source_path)
+            
+            # Handle directory source
+            if source_type == 'dir' and self.incremental:
+                self._sync_from_directory()
+            elif source_type == 'dir':
+                self._update_from_directory()
+            # Handle archive source
+            else:
+                self._update_from_archive()
+
+        except Exception as e:
+            self.error.emit(str(e), False)
+        finally:
+            self.finished.emit(self.target_path)
+
+    def _update_from_directory(self):
+        """Update target directory from source directory"""
+        try:
+            # First, count total files for progress tracking
+            self._count_files(self.source_path)
+            self.file_counted.emit(self._total_files)
+            self._reporter = ProgressReporter(self.progress.emit, self.status.emit,
+                                              label="Processing", total_files=self._total_files)
+
+            # Now perform the update
+            for root, dirs, files in os.walk(self.source_path):
+                if self._cancelled:
+                    break
+                # Get relative path from source root
+                rel_path = os.path.relpath(root, self.source_path)
+                dirs[:] = [d for d in dirs
+                           if not self._should_skip_dir(os.path.join(rel_path, d))]
+
+                target_dir = os.path.join(self.target_path, rel_path)
+
+                # Create target directory if it doesn't exist
+                os.makedirs(target_dir, exist_ok=True)
+
+                # Process files in current directory
+                for file in files:
+                    if self._cancelled:
+                        break
+
+                    source_file = os.path.join(root, file)
+                    target_file = os.path.join(target_dir, file)
+
+                    rel_file = os.path.relpath(source_file, self.source_path)
+
+                    # Skip if file matches skip patterns
+                    if self._should_skip(rel_file):
+                        continue
+
+                    # Handle file based on collision strategy
+                    if os.path.exists(target_file):
+                        if self.collision_strategy == 'skip':
+                            self._reporter.advance(0, 1, rel_file)
+                            continue
+                        elif self.collision_strategy == 'rename':
+                            target_file = self._get_unique_name(target_file)
+                        elif self._same_file_state(source_file, target_file):
+                            # Identical size and mtime: copying would change nothing
+                            self._processed_files += 1
+                            self._reporter.advance(0, 1, rel_file)
+                            continue
+
+                    # Copy the file
+                    try:
+                        _, size = copy_file(source_file, target_file)
+                    except PermissionError:
+                        self.error.emit(f"Permission denied: {target_file}", True)
+                        self._reporter.advance(0, 1, rel_file)
+                        continue
+                    except Exception as e:
+                        self.error.emit(f"Failed to copy {source_file}: {str(e)}", False)
+                        self._reporter.advance(0, 1, rel_file)
+                        continue
+
+                    self._processed_files += 1
+                    self._reporter.advance(size, 1, rel_file)
+
+            if not self._cancelled:
+                self._reporter.finish()
+
+        except Exception as e:
+            self.error.emit(f"Directory update failed: {str(e)}", False)
+
+    def _same_file_state(self, source_file, target_file):
+        """Whether both files have the same size and mtime (to the second)"""
+        try:
+            source_stat = os.stat(source_file)
+            target_stat = os.stat(target_file)
+        except OSError:
+            return False
+        return (source_stat.st_size == target_stat.st_size
+                and int(source_stat.st_mtime) == int(target_stat.st_mtime))
+
+    def _sync_from_directory(self):
+        """Bring the target in line with the source, copying only what changed"""
+        reporter = ProgressReporter(self.progress.emit, self.status.emit, label="Copying")
+
+        def on_progress(done, total):
+            if total != reporter.total_bytes:
+                reporter.set_total(total)
+            reporter.update(done)
+
+        def on_status(message):
+            # Copy progress comes from the reporter, which adds throughput and ETA
+            if not message.startswith("Copying:"):
+                self.status.emit(message)
+
+        try:
+            stats = sync_directories(
+                self.source_path, self.target_path,
+                skip=self._should_skip,
+                skip_dir=self._should_skip_dir,
+                checksum=self.checksum,
+                delete=self.delete,
+                progress_callback=on_progress,
+                status_callback=on_status,
+                cancel_check=lambda: self._cancelled,
+            )
+        except Exception as e:
+            self.error.emit(f"Directory sync failed: {str(e)}", False)
+            return
+        reporter.finish()
+        if not reporter.total_bytes:
+            self.progress.emit(100)  # Nothing needed copying
+
+        self._total_files = stats.files_checked
+        self._processed_files = stats.files_checked
+        self.file_counted.emit(stats.files_checked)
+        for rel_path, message in stats.errors:
+            self.error.emit(f"Failed to sync {rel_path}: {message}", 'Permission denied' in message)
+        summary = (f"Synced {stats.files_checked:,} files: {stats.files_copied:,} copied "
+                   f"({format_size(stats.bytes_copied)}), {stats.files_unchanged:,} unchanged")
+        if stats.strategies:
+            rate = stats.bytes_copied / stats.copy_seconds if stats.copy_seconds else 0
+            summary += f" via {', '.join(stats.strategies)} at {format_size(int(rate))}/s"
+        if self.delete:
+            summary += f", {stats.files_deleted:,} deleted"
+        self.status.emit(summary)
+        self.sync_stats.emit(stats.as_dict())
+
+    def _update_from_archive(self):
+        """Update target directory from archive"""
+        try:
+            # Open the archive
+            archive = self._open_archive()
+            if not archive:
+                return
+
+            try:
+                # Get list of files
+                members = self._get_archive_members(archive)
+                if not members:
+                    self.error.emit("No files found in archive", False)
+                    return
+
+                self._total_files = len(members)
+                self.file_counted.emit(self._total_files)
+                self._reporter = ProgressReporter(self.progress.emit, self.status.emit,
+                                                  label="Processing", total_files=self._total_files)
+
+                # Process each file
+                pending_7z = []
+                for member in members:
+                    if self._cancelled:
+                        break
+
+                    try:
+                        # Skip if file matches skip patterns
+                        if self._should_skip(member):
+                            continue
+
+                        # Determine target path
+                        target_file = os.path.join(self.target_path, member)
+                        target_dir = os.path.dirname(target_file)
+
+                        # Create target directory if needed
+                        os.makedirs(target_dir, exist_ok=True)
+
+                        # Handle file based on collision strategy
+                        if os.path.exists(target_file):
+                            if self.collision_strategy == 'skip':
+                                self._reporter.advance(0, 1, member)
+                                continue
+                            elif self.collision_strategy == 'rename':
+                                target_file = self._get_unique_name(target_file)
+
+                        # 7z members are collected and extracted together below
+                        if isinstance(archive, SevenZipHandler):
+                            pending_7z.append((member, target_file))
+                            continue
+
+                        # Extract the file
+                        self._extract_member(archive, member, target_file)
+
+                        self._processed_files += 1
+                        self._reporter.advance(0, 1, member)
+
+                    except Exception as e:
+                        self.error.emit(f"Failed to extract {member}: {str(e)}", False)
+                        continue
+
+                if pending_7z and not self._cancelled:
+                    self._extract_7z_batch(archive, pending_7z)
+                if not self._cancelled:
+                    self._reporter.finish()
+
+            finally:
+                if isinstance(archive, SevenZipHandler):
+                    archive.close()
+                elif hasattr(archive, 'close'):
+                    archive.close()
+
+        except Exception as e:
+            self.error.emit(f"Archive update failed: {str(e)}", False)
+
+    def _extract_7z_batch(self, archive, pending):
+        """Extract (member, target_file) pairs from a 7z archive with as few 7z runs as possible
+
+        Members kept at their own path go straight into the target directory
+        in one run; renamed ones are extracted together into a staging
+        directory and then moved to their new names.
+        """
+        in_place = [m for m, t in pending if t == os.path.join(self.target_path, m)]
+        renamed = [(m, t) for m, t in pending if t != os.path.join(self.target_path, m)]
+        done_before = self._processed_files
+
+        reported_before = self._reporter.files_done
+
+        def on_progress(percent, offset=0, count=len(in_place)):
+            self._processed_files = done_before + offset + count * percent // 100
+            self._reporter.update(files_done=reported_before + offset + count * percent // 100)
+
+        try:
+            self.status.emit(f"Extracting {len(pending):,} files from 7z archive...")
+            if in_place:
+                archive.extract_many(in_place, self.target_path, progress_callback=on_progress,
+                                     cancel_check=lambda: self._cancelled)
+            if renamed:
+                staging_dir = tempfile.mkdtemp(prefix='.varchiver-', dir=self.target_path)
+                try:
+                    archive.extract_many([m for m, _ in renamed], staging_dir,
+                                         progress_callback=lambda p: on_progress(p, len(in_place), len(renamed)),
+                                         cancel_check=lambda: self._cancelled)
+                    for member, target_file in renamed:
+                        os.replace(os.path.join(staging_dir, member), target_file)
+                finally:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+        except Exception as e:
+            if not self._cancelled:
+                self.error.emit(f"Failed to extract from 7z archive: {str(e)}", False)
+            return
+        self._processed_files = done_before + len(pending)
+        self._reporter.update(files_done=reported_before + len(pending))
+
+    def _count_files(self, path):
+        """Count total number of files for progress tracking"""
+        try:
+            for root, dirs, files in os.walk(path):
+                if self._cancelled:
+                    break
+                rel_root = os.path.relpath(root, path)
+                dirs[:] = [d for d in dirs if not self._should_skip_dir(os.path.join(rel_root, d))]
+                for file in files:
+                    if not self._should_skip(os.path.join(rel_root, file)):
+                        self._total_files += 1
+        except Exception as e:
+            self.error.emit(f"Failed to count files: {str(e)}", False)
+
+    def _should_skip(self, filename):
+        """Check if file should be skipped based on patterns
+
+        filename is relative to the source root (or an archive member name),
+        so the folders the source sits in never match a pattern.
+        """
+        return self._skip_matcher.match(filename)
+
+    def _should_skip_dir(self, dirpath):
+        """Check if a directory (relative to the source root) should be pruned"""
+        return self._skip_matcher.match_dir(dirpath)
+
+    def _get_unique_name(self, filepath):
+        """Generate a unique filename by appending a number"""
+        if not os.path.exists(filepath):
+            return filepath
+
+        base, ext = os.path.splitext(filepath)
+        counter = 1
+        while True:
+            new_path = f"{base} ({counter}){ext}"
+            if not os.path.exists(new_path):
+                return new_path
+            counter += 1
+
+    def _open_archive(self):
+        """Open archive based on type"""
+        try:
+            archive_type = get_archive_type(self.source_path)
+            
+            if not os.path.exists(self.source_path):
+                raise Exception("Archive not found")
+                
+            if archive_type == '.zip':
+                archive = zipfile.ZipFile(self.source_path)
+                if self.password:
+                    archive.setpassword(self.password.encode())
+            elif archive_type in ('.tar', '.tar.gz', '.tar.bz2', '.tar.xz'):
+                archive = tarfile.open(self.source_path)
+            elif archive_type == '.rar':
+                archive = rarfile.RarFile(self.source_path)
+                if self.password:
+                    archive.setpassword(self.password)
+            elif archive_type == '.7z':
+                archive = SevenZipHandler(self.source_path)
+                if self.password:
+                    archive.password = self.password
+            else:
+                raise Exception(f"Unsupported archive type: {archive_type}")
+                
+            return archive
+            
+        except Exception as e:
+            self.error.emit(str(e), False)
+            return None
+
+    def _get_archive_members(self, archive):
+        """Get list of files in the archive"""
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                return archive.namelist()
+            elif isinstance(archive, tarfile.TarFile):
+                return [m.name for m in archive.getmembers()]
+            elif isinstance(archive, rarfile.RarFile):
+                return archive.namelist()
+            elif isinstance(archive, SevenZipHandler):
+                return archive.namelist()
+            else:
+                raise Exception("Unknown archive type")
+                
+        except Exception as e:
+            self.error.emit(f"Failed to read archive contents: {str(e)}", False)
+            return None
+
+    def _extract_member(self, archive, member, target_path):
+        """Extract a single member from the archive"""
+        try:
+            if isinstance(archive, zipfile.ZipFile):
+                with archive.open(member) as source, open(target_path, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+            elif isinstance(archive, tarfile.TarFile):
+                archive.extract(member, os.path.dirname(target_path))
+                if os.path.exists(target_path) and target_path != os.path.join(os.path.dirname(target_path), member):
+                    os.rename(os.path.join(os.path.dirname(target_path), member), target_path)
+            elif isinstance(archive, rarfile.RarFile):
+                archive.extract(member, os.path.dirname(target_path))
+                if os.path.exists(target_path) and target_path != os.path.join(os.path.dirname(target_path), member):
+                    os.rename(os.path.join(os.path.dirname(target_path), member), target_path)
+            elif isinstance(archive, SevenZipHandler):
+                archive.extract(member, os.path.dirname(target_path))
+                if os.path.exists(target_path) and target_path != os.path.join(os.path.dirname(target_path), member):
+                    os.rename(os.path.join(os.path.dirname(target_path), member), target_path)
+            else:
+                raise Exception("Unknown archive type")
+        except Exception as e:
+            raise Exception(f"Failed to extract {member}: {str(e)}")
+
+    def cancel(self):
+        """Cancel the update operation"""
+        self._cancelled = True
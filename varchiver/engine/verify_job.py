@@ -0,0 +1,196 @@
+import os
+import time
+import zipfile
+import zlib
+import rarfile
+from typing import Any, Callable, Dict, Optional
+from ..utils.archive_utils import get_archive_type, open_tar, TAR_TYPES
+from ..utils.hash_manifest import compare_hashes, load_hashes, new_digest
+from ..utils.parallel_unzip import verify_zip_parallel
+from ..utils.progress import ProgressReporter
+from ..sevenz import SevenZipHandler
+from .callbacks import Callback
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_through(f, cancel_check, digest=None) -> int:
+    """Read a member to the end, which is where zipfile and rarfile check its CRC"""
+    total = 0
+    while True:
+        if cancel_check and cancel_check():
+            raise Exception("Operation cancelled")
+        chunk = f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return total
+        total += len(chunk)
+        if digest:
+            digest.update(chunk)
+
+
+def verify_archive(archive_path: str, password: Optional[str] = None,
+                   progress_callback: Optional[Callable[[int], None]] = None,
+                   cancel_check: Optional[Callable[[], bool]] = None,
+                   status_callback: Optional[Callable[[str], None]] = None,
+                   workers: Optional[int] = None,
+                   compare: bool = False) -> Dict[str, Any]:
+    """Check an archive's integrity by decompressing every member
+
+    ZIP members are read through on a process pool so their CRC32s are
+    checked in parallel, RAR members are read through the same way on one
+    thread, tar members are read so header checksums and the compressed
+    stream are validated, and 7z archives are tested with '7z t'.
+
+    With compare, every member's contents are also hashed and checked
+    against the source hashes recorded when the archive was created (its
+    .arhashes manifest); an archive without one fails the comparison.
+
+    Args:
+        archive_path: Archive to check
+        password: Password for encrypted archives
+        progress_callback: Called with 0-100
+        cancel_check: Returns True to stop
+        status_callback: Called with throughput and time left
+        workers: ZIP worker processes (defaults to CPU count)
+        compare: Check contents against the recorded source hashes
+
+    Returns:
+        {'archive', 'type', 'ok', 'cancelled', 'members_checked',
+        'bytes_checked', 'hashes_compared', 'seconds',
+        'errors': [[member or None, message], ...]}
+    """
+    archive_type = get_archive_type(archive_path)
+    report = {'archive': archive_path, 'type': archive_type, 'ok': False, 'cancelled': False,
+              'members_checked': 0, 'bytes_checked': 0, 'hashes_compared': 0, 'seconds': 0.0,
+              'errors': []}
+    reporter = ProgressReporter(progress_callback, status_callback, label="Verifying")
+    start = time.monotonic()
+    digests = {} if compare else None
+
+    def check_members(archive, infos, name_of, is_dir):
+        reporter.set_total(sum(info.file_size for info in infos if not is_dir(info)))
+        for info in infos:
+            if is_dir(info):
+                continue
+            digest = new_digest() if compare else None
+            try:
+                with archive.open(info) as f:
+                    report['bytes_checked'] += _read_through(f, cancel_check, digest)
+                if digest:
+                    digests[name_of(info)] = digest.hexdigest()
+            except (zipfile.BadZipFile, zlib.error, rarfile.Error, OSError, RuntimeError, EOFError) as e:
+                report['errors'].append([name_of(info), str(e)])
+            report['members_checked'] += 1
+            reporter.update(report['bytes_checked'], report['members_checked'])
+
+    try:
+        recorded = None
+        if compare:
+            recorded = load_hashes(archive_path)
+            if recorded is None:
+                raise ValueError("No source hashes were recorded for this archive")
+
+        if archive_type == '.zip':
+            def on_progress(done, total):
+                if total != reporter.total_bytes:
+                    reporter.set_total(total)
+                reporter.update(done)
+
+            result = verify_zip_parallel(archive_path, password, workers=workers, digests=compare,
+                                         progress_callback=on_progress, cancel_check=cancel_check)
+            report['members_checked'] = result['files']
+            report['bytes_checked'] = result['bytes']
+            report['errors'].extend([name, message] for name, message in result['errors'])
+            if compare:
+                digests.update(result['digests'])
+        elif archive_type == '.rar':
+            with rarfile.RarFile(archive_path) as archive:
+                if password:
+                    archive.setpassword(password)
+                check_members(archive, archive.infolist(), lambda i: i.filename, lambda i: i.isdir())
+        elif archive_type in TAR_TYPES:
+            # Progress is by position in the (compressed) archive file
+            reporter.set_total(os.path.getsize(archive_path))
+            with open(archive_path, 'rb') as raw, open_tar(archive_path, stream=True, fileobj=raw) as tar:
+                for member in tar:
+                    if member.isfile():
+                        digest = new_digest() if compare else None
+                        report['bytes_checked'] += _read_through(tar.extractfile(member), cancel_check, digest)
+                        if digest:
+                            digests[member.name] = digest.hexdigest()
+                    report['members_checked'] += 1
+                    reporter.update(raw.tell(), report['members_checked'], member.name)
+        elif archive_type == '.7z':
+            archive = SevenZipHandler(archive_path)
+            if password:
+                archive.password = password
+            archive.test(progress_callback=progress_callback, cancel_check=cancel_check)
+            files = [e for e in archive.infolist() if not e['is_dir']]
+            report['members_checked'] = len(files)
+            report['bytes_checked'] = sum(e['size'] for e in files)
+            if compare:
+                # '7z t' has checked the CRCs; hashing needs each member streamed once more
+                reporter = ProgressReporter(progress_callback, status_callback, label="Hashing",
+                                            total_bytes=report['bytes_checked'], total_files=len(files))
+                for entry in files:
+                    digest = new_digest()
+                    with archive.open(entry['path']) as f:
+                        _read_through(f, cancel_check, digest)
+                    digests[entry['path']] = digest.hexdigest()
+                    reporter.advance(entry['size'], current=entry['path'])
+        else:
+            raise ValueError(f"Unsupported archive type: {archive_type}")
+
+        if compare and not (cancel_check and cancel_check()):
+            report['hashes_compared'] = len(digests.keys() & recorded.keys())
+            # Members that failed their CRC check are already reported
+            failed = {name for name, _ in report['errors']}
+            report['errors'].extend(error for error in compare_hashes(recorded, digests)
+                                    if error[0] not in failed)
+    except Exception as e:
+        # Damage to the archive as a whole (bad central directory, truncated stream, ...)
+        report['errors'].append([None, str(e)])
+
+    reporter.finish()
+    report['seconds'] = round(time.monotonic() - start, 3)
+    report['cancelled'] = bool(cancel_check and cancel_check())
+    report['ok'] = not report['errors'] and not report['cancelled']
+    return report
+
+
+class VerifyJob:
+    """Verify an archive with verify_archive
+
+    Reports through Callbacks named like VerifyThread's signals:
+    progress(int), status(str), error(str, bool) and finished(dict), which
+    carries the report.
+    """
+
+    def __init__(self, archive_path, password=None, workers=None, compare=False):
+        self.progress = Callback()
+        self.status = Callback()
+        self.error = Callback()  # error message, is_permission_error
+        self.finished = Callback()  # verify_archive's report
+        self.archive_path = archive_path
+        self.password = password
+        self.workers = workers
+        self.compare = compare
+        self._cancelled = False
+
+    def run(self):
+        """Verify the archive"""
+        try:
+            self.status.emit(f"Verifying {os.path.basename(self.archive_path)}...")
+            report = verify_archive(self.archive_path, self.password,
+                                    progress_callback=self.progress.emit,
+                                    cancel_check=lambda: self._cancelled,
+                                    status_callback=self.status.emit,
+                                    workers=self.workers, compare=self.compare)
+            if not report['cancelled']:
+                self.finished.emit(report)
+        except Exception as e:
+            self.error.emit(str(e), False)
+
+    def cancel(self):
+        """Cancel the verification"""
+        self._cancelled = True
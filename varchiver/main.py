@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 import argparse
 
@@ -35,6 +36,13 @@ def parse_args(args):
         default=5,
         help="Compression level (0-9, default: 5)",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Compression worker threads for archive creation (default: one per CPU)",
+    )
     parser.add_argument("--skip-patterns", "-s", nargs="+", help="Patterns to skip")
     parser.add_argument(
         "--collision",
@@ -53,6 +61,10 @@ def parse_args(args):
 
 def main(args=None):
     """Main entry point for Varchiver"""
+    # In a frozen (PyInstaller) build, let ZIP worker processes run their task
+    # instead of launching another copy of the app
+    multiprocessing.freeze_support()
+
     if args is None:
         args = sys.argv[1:]
 
@@ -90,6 +102,8 @@ def main(args=None):
     # Create main widget
     widget = MainWidget()
     widget.setWindowIcon(app.windowIcon())
+    widget.compression_slider.setValue(args.compression)
+    widget.compression_workers = args.workers
     widget.show()
 
     # Handle command line arguments
@@ -1,29 +1,65 @@
 import subprocess
 import re
+import io
 import os
+import json
+import tarfile
 import tempfile
 from typing import List, Dict, Optional, Any
-import fnmatch
-from pathlib import Path
-from PyQt6.QtWidgets import QInputDialog, QLineEdit
-import sys
-from .utils.pattern_utils import should_skip_file
+import shutil
+from .utils.pattern_utils import get_skip_matcher
+from .utils.sevenz_backends import (
+    BACKENDS, SevenZipMemberReader, check_7z_cli, get_backend, parse_slt_listing,
+    raise_7z_error,
+)
+
+# Files per 7z invocation when adding through a listfile
+LISTFILE_CHUNK_SIZE = 20000
+
+_PERCENT_RE = re.compile(rb'(\d{1,3})%')
+
+# Bumped when the .idx layout changes; older index files are ignored
+INDEX_VERSION = 2
+
+_CLI_BACKEND = BACKENDS['cli']
+
 
 class SevenZipHandler:
-    """Handler for 7z archives using 7z command-line tool"""
-    def __init__(self, archive_path: str, index_store: bool = False):
+    """Handler for 7z archives using the 7z command-line tool
+
+    Listing and member reads can instead go through an in-process backend
+    (see utils.sevenz_backends); writing and batch extraction always use 7z.
+    """
+    def __init__(self, archive_path: str, index_store: bool = False, backend: Optional[str] = None):
         """Initialize SevenZipHandler
         
         Args:
             archive_path: Path to archive
             index_store: If True, store archive index in a .idx file for faster loading
+            backend: 'cli', 'libarchive', 'py7zr' or 'auto' for listing and reading
+                members; None uses the process default (see sevenz_backends)
         """
         self.archive_path = os.path.abspath(archive_path)
+        self.backend = get_backend(backend)
         self._password = None
         self._index_store = index_store
         self._index_path = os.path.splitext(self.archive_path)[0] + '.idx'
-        self._check_7z()
+        self._listing = None  # path -> entry, valid while the archive is unchanged
+        self._listing_state = None
+        self.skip_patterns = []
+        if not self.backend.in_process:
+            self._check_7z()
         
+    @property
+    def skip_patterns(self) -> List[str]:
+        """Patterns for members to leave out when adding or extracting"""
+        return self._skip_patterns
+
+    @skip_patterns.setter
+    def skip_patterns(self, patterns: Optional[List[str]]):
+        self._skip_patterns = list(patterns or [])
+        self._skip_matcher = get_skip_matcher(self._skip_patterns)
+
     @property
     def password(self) -> Optional[str]:
         """Get password"""
@@ -32,51 +68,82 @@ class SevenZipHandler:
     @password.setter
     def password(self, value: Optional[str]):
         """Set password"""
+        if value != self._password:
+            self._invalidate_listing()
         self._password = value
         
     def _check_7z(self) -> None:
-        """Check if 7z command is available"""
-        try:
-            result = subprocess.run(['7z', '--help'], capture_output=True, text=True)
-            if result.returncode != 0:
-                raise Exception("7z command is not working properly")
-        except FileNotFoundError:
-            raise Exception("7z command not found. Please install p7zip.")
+        """Check if 7z command is available (the check itself runs once per process)"""
+        error = check_7z_cli()
+        if error:
+            raise Exception(error)
             
     def _run_7z_command(self, cmd: List[str]) -> str:
         """Run 7z command and handle common errors"""
+        self._check_7z()
         try:
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             # Check for common errors
             if result.returncode != 0:
-                stderr = result.stderr.strip()
-                if 'Wrong password' in stderr or 'password is incorrect' in stderr:
-                    raise Exception("Incorrect password")
-                elif 'No such file or directory' in stderr:
-                    raise FileNotFoundError(f"Archive not found: {self.archive_path}")
-                elif stderr:
-                    raise Exception(f"7z command failed: {stderr}")
-                else:
-                    raise Exception("Unknown 7z error")
+                self._raise_7z_error(result.stderr)
             
             return result.stdout
             
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to run 7z command: {e}")
 
+    def _raise_7z_error(self, stderr: str) -> None:
+        """Raise the exception matching a failed 7z run's stderr"""
+        raise_7z_error(stderr, self.archive_path)
+
+    def _run_7z_with_progress(self, cmd: List[str], cwd: Optional[str] = None,
+                              progress_callback=None, cancel_check=None) -> None:
+        """Run a 7z command with -bsp1, reporting its percentage as it runs
+
+        Args:
+            cmd: Full 7z command line
+            cwd: Working directory for the run
+            progress_callback: Called with 0-100 as 7z reports progress
+            cancel_check: Polled between output reads; returning True kills 7z
+        """
+        self._check_7z()
+        with tempfile.TemporaryFile() as stderr_file:
+            # stdin is closed so a missing password fails instead of prompting
+            proc = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE, stderr=stderr_file)
+            try:
+                last = -1
+                while True:
+                    chunk = proc.stdout.read1(4096)
+                    if not chunk:
+                        break
+                    if cancel_check and cancel_check():
+                        proc.kill()
+                        raise Exception("Operation cancelled")
+                    found = _PERCENT_RE.findall(chunk)
+                    if found and progress_callback:
+                        percent = min(100, int(found[-1]))
+                        if percent != last:
+                            last = percent
+                            progress_callback(percent)
+                proc.wait()
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                self._raise_7z_error(stderr_file.read().decode(errors='replace'))
+
     def namelist(self) -> List[str]:
         """Get list of file names in the archive"""
-        contents = self.list_contents()
-        return [entry['path'] for entry in contents]
+        return list(self._get_listing())
         
     def getinfo(self, name: str) -> Optional[Dict[str, Any]]:
         """Get info for a specific file"""
-        contents = self.list_contents()
-        for entry in contents:
-            if entry['path'] == name:
-                return entry
-        return None
+        return self._get_listing().get(name.replace('\\', '/'))
 
     def write(self, filename: str, arcname: Optional[str] = None) -> None:
         """Add a file or directory to the archive"""
@@ -100,6 +167,7 @@ class SevenZipHandler:
             cmd.extend(['-r'])
             
         cmd.extend([self.archive_path, filename])
+        self._invalidate_listing()
             
         try:
             self._run_7z_command(cmd)
@@ -111,18 +179,8 @@ class SevenZipHandler:
 
     def read(self, name: str) -> bytes:
         """Read file from archive"""
-        if not os.path.exists(self.archive_path):
-            raise FileNotFoundError(f"Archive not found: {self.archive_path}")
-            
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cmd = ['7z', 'e', '-so', self.archive_path, name]
-            if self._get_password():
-                cmd.extend(['-p' + self._get_password()])
-                
-            result = subprocess.run(cmd, capture_output=True)
-            if result.returncode != 0:
-                raise Exception(f"Failed to extract file: {result.stderr.decode()}")
-            return result.stdout
+        with self.open(name) as f:
+            return f.read()
 
     def extract(self, member: str, path: Optional[str] = None) -> None:
         """Extract a member from the archive"""
@@ -164,6 +222,8 @@ class SevenZipHandler:
         if not filenames:
             raise ValueError("No files to add")
             
+        self._invalidate_listing()
+
         # Build 7z command
         cmd = ['7z', 'a', '-t7z']  
         if self._get_password():
@@ -204,6 +264,165 @@ class SevenZipHandler:
                 raise ValueError("No valid files to add")
             self._run_7z_command(cmd)
             
+    def write_many(self, entries: List[tuple], compression_level: Optional[int] = None,
+                   progress_callback=None, cancel_check=None,
+                   chunk_size: int = LISTFILE_CHUNK_SIZE) -> None:
+        """Add many files with one 7z run per listfile chunk
+
+        Each entry is a (file_path, arcname) pair. Files whose path ends with
+        their arcname are added relative to the directory that precedes it,
+        which keeps the archive layout without a per-file 7z call. Entries
+        renamed on the way in (e.g. collision copies) are hard-linked or copied
+        into a staging directory under their arcname first.
+
+        Args:
+            entries: (file_path, arcname) pairs to add
+            compression_level: 7z -mx level 0-9, or None for the 7z default
+            progress_callback: Called with overall 0-100 progress
+            cancel_check: Returning True aborts the running 7z process
+            chunk_size: Maximum files per 7z invocation
+        """
+        groups: Dict[str, List[str]] = {}
+        staged = []
+        for file_path, arcname in entries:
+            arcname = arcname.replace('\\', '/')
+            if self._should_skip(arcname):
+                continue
+            src = os.path.abspath(file_path)
+            suffix = os.sep + arcname.replace('/', os.sep)
+            if src.endswith(suffix):
+                groups.setdefault(src[:-len(suffix)] or os.sep, []).append(arcname)
+            else:
+                staged.append((src, arcname))
+
+        staging_dir = None
+        try:
+            if staged:
+                staging_dir = tempfile.mkdtemp(prefix='.varchiver-7z-',
+                                               dir=os.path.dirname(self.archive_path))
+                for src, arcname in staged:
+                    target = os.path.join(staging_dir, arcname)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    try:
+                        os.link(src, target)
+                    except OSError:
+                        shutil.copy2(src, target)
+                groups.setdefault(staging_dir, []).extend(arcname for _, arcname in staged)
+
+            runs = [(cwd, names[i:i + chunk_size])
+                    for cwd, names in groups.items()
+                    for i in range(0, len(names), chunk_size)]
+            total = sum(len(names) for _, names in runs)
+            done = 0
+            for cwd, names in runs:
+                def report(percent, done=done, count=len(names)):
+                    if progress_callback and total:
+                        progress_callback(int((done + count * percent / 100) * 100 / total))
+                self._add_listfile(cwd, names, compression_level, report, cancel_check)
+                done += len(names)
+        finally:
+            if staging_dir:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _run_with_listfile(self, cmd: List[str], names: List[str], cwd: Optional[str] = None,
+                           progress_callback=None, cancel_check=None) -> None:
+        """Run cmd with names passed through an appended @listfile"""
+        with tempfile.NamedTemporaryFile('w', suffix='.lst', delete=False, encoding='utf-8') as listfile:
+            listfile.write('\n'.join(names) + '\n')
+            listfile_path = listfile.name
+        try:
+            self._run_7z_with_progress(cmd + ['@' + listfile_path], cwd=cwd,
+                                       progress_callback=progress_callback,
+                                       cancel_check=cancel_check)
+        finally:
+            os.unlink(listfile_path)
+
+    def _add_listfile(self, cwd: str, names: List[str], compression_level: Optional[int],
+                      progress_callback=None, cancel_check=None) -> None:
+        """Run a single '7z a' over names (relative to cwd) passed via @listfile"""
+        self._invalidate_listing()
+        # -spd: names are literal paths, not wildcards; -bso0: no per-file chatter
+        cmd = ['7z', 'a', '-t7z', '-bsp1', '-bso0', '-spd', '-scsUTF-8']
+        if compression_level is not None:
+            cmd.append(f'-mx={compression_level}')
+        if self._get_password():
+            cmd.append('-p' + self._get_password())
+        cmd.append(self.archive_path)
+        self._run_with_listfile(cmd, names, cwd=cwd, progress_callback=progress_callback,
+                                cancel_check=cancel_check)
+
+    def extract_many(self, members: List[str], path: Optional[str] = None,
+                     progress_callback=None, cancel_check=None,
+                     chunk_size: int = LISTFILE_CHUNK_SIZE) -> None:
+        """Extract many members with one 7z run per listfile chunk
+
+        A solid archive is decoded once per run instead of once per member.
+        Directory members are created directly rather than listed, since 7z
+        would otherwise extract everything beneath them, including members
+        the caller left out; one whose name resolves outside path raises
+        ValueError instead. Existing files are overwritten; callers resolve
+        collisions before calling.
+
+        Args:
+            members: Archive paths to extract
+            path: Destination directory, defaults to the current directory
+            progress_callback: Called with overall 0-100 progress
+            cancel_check: Returning True aborts the running 7z process
+            chunk_size: Maximum members per 7z invocation
+        """
+        if not os.path.exists(self.archive_path):
+            raise FileNotFoundError(f"Archive not found: {self.archive_path}")
+        path = path or os.getcwd()
+        root = os.path.abspath(path)
+
+        listing = self._get_listing()
+        names = []
+        for member in members:
+            member = member.replace('\\', '/')
+            if self._should_skip(member):
+                continue
+            entry = listing.get(member.rstrip('/'))
+            if member.endswith('/') or (entry is not None and entry['is_dir']):
+                target = os.path.normpath(os.path.join(root, member))
+                if os.path.commonpath([root, target]) != root:
+                    raise ValueError(f"Archive member points outside the destination: {member}")
+                os.makedirs(target, exist_ok=True)
+            else:
+                names.append(member)
+        if not names:
+            return
+
+        # -spd: names are literal paths; -aoa: overwrite without prompting
+        cmd = ['7z', 'x', '-bsp1', '-bso0', '-spd', '-scsUTF-8', '-aoa', '-y', '-o' + path]
+        if self._get_password():
+            cmd.append('-p' + self._get_password())
+        cmd.append(self.archive_path)
+
+        chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+        done = 0
+        for chunk in chunks:
+            def report(percent, done=done, count=len(chunk)):
+                if progress_callback:
+                    progress_callback(int((done + count * percent / 100) * 100 / len(names)))
+            self._run_with_listfile(cmd, chunk, progress_callback=report, cancel_check=cancel_check)
+            done += len(chunk)
+
+    def test(self, progress_callback=None, cancel_check=None) -> None:
+        """Check every member's CRC with '7z t'; raises if the archive is damaged
+
+        Args:
+            progress_callback: Called with 0-100 as 7z reports progress
+            cancel_check: Returning True aborts the running 7z process
+        """
+        if not os.path.exists(self.archive_path):
+            raise FileNotFoundError(f"Archive not found: {self.archive_path}")
+        cmd = ['7z', 't', '-bsp1', '-bso0', '-y']
+        if self._get_password():
+            cmd.append('-p' + self._get_password())
+        cmd.append(self.archive_path)
+        self._run_7z_with_progress(cmd, progress_callback=progress_callback,
+                                   cancel_check=cancel_check)
+
     def write_str(self, data: str, arcname: str) -> None:
         """Write a string to a file in the archive"""
         # Create a temporary file
@@ -232,277 +451,157 @@ class SevenZipHandler:
         """Get list of FileInfo objects for files in the archive"""
         return self.list_contents()
 
-    def open(self, name: str, mode: str = 'r') -> Any:
-        """Open a file in the archive"""
+    def open(self, name: str, mode: str = 'r') -> io.BufferedIOBase:
+        """Open a member for streaming binary reads
+
+        With the 7z tool, the member is decompressed by a '7z e -so'
+        process whose stdout is read incrementally; when the caller stops
+        reading, the full pipe blocks 7z, so memory use stays at the pipe
+        and read buffers. Closing the file early terminates 7z. The
+        libarchive backend streams the member in-process instead.
+        """
         if mode not in ['r', 'rb']:
             raise ValueError("Invalid mode")
-            
-        return self.read(name)
+        if not os.path.exists(self.archive_path):
+            raise FileNotFoundError(f"Archive not found: {self.archive_path}")
 
-    def _load_index(self) -> Optional[List[Dict[str, Any]]]:
-        """Load archive index from .idx file if it exists and is newer than archive"""
-        if not self._index_store:
+        name = name.replace('\\', '/')
+        info = self.getinfo(name)
+        if info is None:
+            raise KeyError(f"There is no item named {name!r} in the archive")
+        if info['is_dir']:
+            raise IsADirectoryError(f"{name} is a directory")
+
+        password = self._get_password()
+        if self.backend.in_process:
+            stream = self.backend.open_member(self.archive_path, name, info['size'], password)
+            if stream is not None:
+                return stream
+        self._check_7z()
+        return _CLI_BACKEND.open_member(self.archive_path, name, info['size'], password)
+
+    def copy_to_tar(self, tar: tarfile.TarFile, progress_callback=None, cancel_check=None) -> None:
+        """Stream every member into an open tarfile without extracting to disk
+
+        Args:
+            tar: Tar archive opened for writing (any compression)
+            progress_callback: Called with (bytes done, bytes total)
+            cancel_check: Returning True stops before the next member
+        """
+        entries = [e for e in self.infolist() if not self._should_skip(e['path'])]
+        total = sum(e['size'] for e in entries if not e['is_dir'])
+        done = 0
+        for entry in entries:
+            if cancel_check and cancel_check():
+                raise Exception("Operation cancelled")
+            info = tarfile.TarInfo(entry['path'])
+            info.mtime = int(entry.get('mtime') or 0)
+            if entry['is_dir']:
+                info.type = tarfile.DIRTYPE
+                info.mode = entry.get('mode', 0o755)
+                tar.addfile(info)
+                continue
+            info.size = entry['size']
+            info.mode = entry.get('mode', 0o644)
+            with self.open(entry['path']) as member:
+                tar.addfile(info, member)
+            done += entry['size']
+            if progress_callback:
+                progress_callback(done, total)
+
+    def _archive_state(self) -> Optional[tuple]:
+        """(size, mtime_ns) of the archive, used to tell when a listing is stale"""
+        try:
+            stat = os.stat(self.archive_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self, state: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Load the listing from the .idx file if it was written for this archive state"""
+        if not self._index_store or not os.path.exists(self._index_path):
             return None
-            
         try:
-            if not os.path.exists(self._index_path):
-                return None
-                
-            # Check if index is newer than archive
-            archive_mtime = os.path.getmtime(self.archive_path)
-            index_mtime = os.path.getmtime(self._index_path)
-            if index_mtime < archive_mtime:
-                return None
-                
-            # Load index
-            with open(self._index_path, 'r') as f:
-                import json
-                return json.load(f)
-                
-        except Exception as e:
-            print(f"Error loading index: {e}")
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load index: {e}")
             return None
-            
-    def _save_index(self, entries: List[Dict[str, Any]]) -> None:
-        """Save archive index to .idx file"""
+        # Only 7z tool listings are kept: in-process backends leave out fields like 'mode'
+        if (not isinstance(data, dict) or data.get('version') != INDEX_VERSION
+                or data.get('backend') != _CLI_BACKEND.name
+                or [data.get('size'), data.get('mtime_ns')] != list(state)):
+            return None
+        return data.get('entries')
+
+    def _save_index(self, entries: List[Dict[str, Any]], state: tuple) -> None:
+        """Save the listing to the .idx file"""
         if not self._index_store:
             return
-            
         try:
-            with open(self._index_path, 'w') as f:
-                import json
-                json.dump(entries, f)
-        except Exception as e:
-            print(f"Error saving index: {e}")
-            
-    def list_contents(self) -> List[Dict[str, Any]]:
-        """List contents of the archive"""
-        print("Starting list_contents")
-        sys.stdout.flush()
-        
-        if not os.path.exists(self.archive_path):
-            print(f"Archive not found: {self.archive_path}")
-            sys.stdout.flush()
+            with open(self._index_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'backend': _CLI_BACKEND.name,
+                           'size': state[0], 'mtime_ns': state[1], 'entries': entries}, f)
+        except OSError as e:
+            print(f"Warning: Could not save index: {e}")
+
+    def _invalidate_listing(self) -> None:
+        """Forget the cached listing after the archive was modified"""
+        self._listing = None
+        self._listing_state = None
+
+    def _get_listing(self) -> Dict[str, Dict[str, Any]]:
+        """Listing keyed by path, read once and reused until the archive changes"""
+        state = self._archive_state()
+        if state is None:
             raise FileNotFoundError(f"Archive not found: {self.archive_path}")
+        if self._listing is not None and self._listing_state == state:
+            return self._listing
 
-        try:
-            # Use 'l' command to list contents with technical info
-            cmd = ['7z', 'l', self.archive_path]
-            print("Built base command")
-            sys.stdout.flush()
-            
-            password = self._get_password()
-            print("Got password result")
-            sys.stdout.flush()
-            
-            if password:
-                print("Adding password to command")
-                sys.stdout.flush()
-                cmd.extend(['-p' + password])
+        entries = self._load_index(state)
+        if entries is None:
+            entries = self._read_listing()
+            if not self.backend.in_process:
+                self._save_index(entries, state)
+        self._listing = {entry['path']: entry for entry in entries}
+        self._listing_state = state
+        return self._listing
 
-            print(f"Running command: {' '.join(cmd)}")
-            sys.stdout.flush()
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            print(f"Command completed with return code: {result.returncode}")
-            sys.stdout.flush()
-            
-            if result.returncode != 0:
-                stderr = result.stderr.strip()
-                if "Wrong password" in stderr:
-                    raise Exception("Incorrect password")
-                elif "Can not open" in stderr:
-                    raise FileNotFoundError(f"Cannot open archive: {self.archive_path}")
-                else:
-                    raise Exception(f"Error reading archive: {stderr}")
-
-            entries = []
-            reading_files = False
-            found_summary = False  # Track if we've hit the summary line
-            
-            print("Starting to parse output")
-            sys.stdout.flush()
-            
-            print("Output lines:")
-            for line in result.stdout.splitlines():
-                print(f"  > {line}")
-            sys.stdout.flush()
-            
-            for line in result.stdout.splitlines():
-                line = line.rstrip()
-                
-                # Look for the header line
-                if 'Date' in line and 'Time' in line and 'Attr' in line:
-                    print(f"Found header line: {line}")
-                    sys.stdout.flush()
-                    reading_files = True
-                    continue
-                    
-                # Skip until we find the header
-                if not reading_files:
-                    continue
-                    
-                # Skip separator lines and empty lines
-                if not line.strip() or line.startswith('-------------------'):
-                    continue
-                    
-                # Check if we've hit the summary line (contains "files")
-                if ' files' in line and line.startswith('20'):
-                    print(f"Found summary line: {line}")
-                    sys.stdout.flush()
-                    found_summary = True
-                    continue
-                    
-                # Skip if we've hit the summary
-                if found_summary:
-                    continue
-                    
-                # Parse line like: "2024-11-29 18:36:33 ....A        22914         6864  poetry.lock"
-                try:
-                    parts = line.split(None, 5)  # Split by whitespace, max 6 parts
-                    print(f"Parsing line: {line}")
-                    print(f"Parts: {parts}")
-                    sys.stdout.flush()
-                    
-                    if len(parts) == 6:
-                        date, time, attr, size, packed, name = parts
-                        print(f"Parsing file: {name} (size={size}, packed={packed})")
-                        sys.stdout.flush()
-                        
-                        try:
-                            size = int(size)
-                            packed = int(packed)
-                        except ValueError:
-                            size = 0
-                            packed = 0
-                            
-                        entry = {
-                            'path': name,
-                            'name': os.path.basename(name.rstrip('/')),
-                            'size': size,
-                            'compressed_size': packed,
-                            'modified': f"{date} {time}",
-                            'attributes': attr,
-                            'is_dir': name.endswith('/') or 'D' in attr
-                        }
-                        entries.append(entry)
-                        print(f"Added entry: {entry}")
-                        sys.stdout.flush()
-                except Exception as e:
-                    print(f"Error parsing line: {e}")
-                    sys.stdout.flush()
-                    continue
-
-            print(f"Finished parsing, found {len(entries)} entries")
-            sys.stdout.flush()
-            return entries
+    def _read_listing(self) -> List[Dict[str, Any]]:
+        """List the archive through the selected backend, falling back to the 7z tool"""
+        password = self._get_password()
+        if self.backend.in_process:
+            try:
+                return self.backend.list_entries(self.archive_path, password)
+            except Exception as e:
+                if check_7z_cli():
+                    raise
+                print(f"Warning: {self.backend.name} could not list {self.archive_path} ({e}); using 7z")
+        self._check_7z()
+        return _CLI_BACKEND.list_entries(self.archive_path, password)
 
-        except Exception as e:
-            print(f"Error in list_contents: {e}")
-            sys.stdout.flush()
-            raise Exception(f"Error listing archive contents: {str(e)}")
-            
-    def _parse_list_output(self, output: str) -> List[Dict[str, Any]]:
-        """Parse 7z list command output"""
-        entries = []
-        current_entry = {}
-        
+    def list_contents(self) -> List[Dict[str, Any]]:
+        """List contents of the archive"""
         try:
-            lines = output.splitlines()
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Skip empty lines and headers
-                if not line or line.startswith('--'):
-                    if current_entry and 'Path' in current_entry:
-                        self._process_entry(current_entry, entries)
-                    current_entry = {}
-                    continue
-                    
-                if ': ' in line:
-                    key, value = line.split(': ', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    if key == 'Path':
-                        if not value:  # Skip entries with empty paths
-                            continue
-                        current_entry['path'] = value
-                        current_entry['name'] = os.path.basename(value)
-                        current_entry['is_dir'] = value.endswith('/') or value.endswith('\\')
-                    elif key == 'Size':
-                        try:
-                            current_entry['size'] = int(value) if value else 0
-                        except ValueError:
-                            current_entry['size'] = 0
-                    elif key == 'Packed Size':
-                        try:
-                            current_entry['compressed_size'] = int(value) if value else 0
-                        except ValueError:
-                            current_entry['compressed_size'] = 0
-                    elif key == 'Modified':
-                        current_entry['modified'] = value
-                    elif key == 'Attributes':
-                        current_entry['attributes'] = value
-                        if 'D' in value:  # Directory attribute
-                            current_entry['is_dir'] = True
-                        
-            # Add the last entry if it exists
-            if current_entry and 'Path' in current_entry:
-                self._process_entry(current_entry, entries)
-                
-            return entries
-            
+            return list(self._get_listing().values())
+        except FileNotFoundError:
+            raise
         except Exception as e:
-            print(f"Error parsing output: {e}")
-            raise Exception(f"Error parsing archive listing: {str(e)}")
-
-    def _process_entry(self, entry: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
-        """Process and validate a single entry before adding to entries list"""
-        # Ensure required fields exist
-        if 'path' not in entry:
-            return
-            
-        # Set defaults for missing fields
-        entry.setdefault('size', 0)
-        entry.setdefault('compressed_size', entry['size'])
-        entry.setdefault('is_dir', False)
-        entry.setdefault('modified', '')
-        entry.setdefault('attributes', '')
-        
-        # Clean up path
-        entry['path'] = entry['path'].replace('\\', '/')
-        
-        # Add to entries list
-        entries.append(entry)
+            raise Exception(f"Error listing archive contents: {str(e)}")
 
     def _get_password(self) -> Optional[str]:
-        """Get password from environment or prompt user"""
-        print("Getting password")
-        sys.stdout.flush()
-        
-        # First try the stored password
+        """Get the stored password, falling back to SEVENZIP_PASSWORD"""
         if self._password:
-            print("Using stored password")
-            sys.stdout.flush()
             return self._password
-            
-        # Then try environment variable
         env_pass = os.environ.get('SEVENZIP_PASSWORD')
         if env_pass:
-            print("Using environment password")
-            sys.stdout.flush()
             self._password = env_pass
             return env_pass
-            
-        print("No password found")
-        sys.stdout.flush()
         return None
 
     def _should_skip(self, filepath):
         """Check if file should be skipped based on patterns"""
-        return should_skip_file(filepath, self.skip_patterns)
+        return self._skip_matcher.match(filepath)
 
 class FileInfo:
     """Simple file info class to match zipfile/rarfile interface"""
@@ -0,0 +1,15 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from ..engine.scheduler import JobScheduler
+from ..engine.callbacks import forward_signals
+
+class SchedulerBridge(QObject):
+    """Re-emits a JobScheduler's callbacks as signals, delivered on the GUI thread"""
+    job_added = pyqtSignal(object)  # ScheduledJob
+    job_updated = pyqtSignal(object)  # ScheduledJob whose state or progress changed
+    job_finished = pyqtSignal(object)  # ScheduledJob that is done, failed or cancelled
+    all_done = pyqtSignal()  # Nothing is queued or running
+
+    def __init__(self, scheduler=None, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler or JobScheduler()
+        forward_signals(self.scheduler, self, ('job_added', 'job_updated', 'job_finished', 'all_done'))
@@ -0,0 +1,23 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from ..engine.verify_job import VerifyJob
+from ..engine.callbacks import forward_signals
+
+class VerifyThread(QThread):
+    """Runs a VerifyJob off the GUI thread, re-emitting its callbacks as signals"""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(dict)  # The verification report
+    error = pyqtSignal(str, bool)  # error message, is_permission_error
+    status = pyqtSignal(str)  # Throughput and time left
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.job = VerifyJob(*args, **kwargs)
+        forward_signals(self.job, self, ('progress', 'finished', 'error', 'status'))
+
+    def run(self):
+        """Run the verification thread"""
+        self.job.run()
+
+    def cancel(self):
+        """Cancel the verification"""
+        self.job.cancel()
@@ -0,0 +1,302 @@
+"""Persistent archive index (.arindex) stored next to an archive.
+
+Version 2 is a small binary, columnar layout designed to be memory-mapped:
+
+    header   magic, version, entry count, archive size/mtime, section offsets
+    records  one fixed-size record per entry, sorted by UTF-8 path
+    strings  UTF-8 path bytes referenced by the records
+
+Lookups binary-search the record table through ``mmap``, so opening an
+index for a million-entry archive only touches the pages a query needs.
+The index records the archive's size and mtime and is ignored once the
+archive changes.
+
+Version 1 indexes were ``str(dict)`` text files; they are still readable
+through :func:`load_legacy_index` and are rewritten as version 2 on load.
+"""
+
+import ast
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = '.arindex'
+INDEX_MAGIC = b'VARIDX\x00\x00'
+INDEX_VERSION = 2
+
+# magic, version, flags, entry count, archive size, archive mtime (ns),
+# record table offset, strings offset, strings size
+_HEADER = struct.Struct('<8sHHIQqQQQ')
+# path offset, path length, flags, size, compressed size, mtime, member offset
+_RECORD = struct.Struct('<QIIQQdq')
+# Just the size field of a record, for summing without unpacking whole records
+_SIZE = struct.Struct('<16xQ')
+# The size and compressed size fields of a record
+_SIZES = struct.Struct('<16xQQ')
+
+FLAG_DIR = 0x1
+
+
+def index_path_for(archive_path: str) -> str:
+    """Path of the index file belonging to an archive"""
+    return archive_path + INDEX_SUFFIX
+
+
+def write_index(archive_path: str, entries: List[Dict[str, Any]],
+                index_path: Optional[str] = None) -> str:
+    """Write a version 2 index for archive_path.
+
+    Each entry is a dict with 'path' and optionally 'size', 'compressed',
+    'mtime', 'is_dir' and 'offset' (the member header offset inside the
+    archive, where the format has one). Must be called after the archive is
+    closed so the recorded size/mtime match the final file.
+
+    Returns the path of the written index.
+    """
+    index_path = index_path or index_path_for(archive_path)
+    stat = os.stat(archive_path)
+
+    encoded = sorted(((e['path'].encode('utf-8'), e) for e in entries), key=lambda item: item[0])
+    strings = bytearray()
+    records = bytearray()
+    for path_bytes, entry in encoded:
+        flags = FLAG_DIR if entry.get('is_dir') else 0
+        offset = entry.get('offset')
+        records += _RECORD.pack(len(strings), len(path_bytes), flags,
+                                int(entry.get('size', 0) or 0),
+                                int(entry.get('compressed', entry.get('size', 0)) or 0),
+                                float(entry.get('mtime', 0) or 0),
+                                -1 if offset is None else int(offset))
+        strings += path_bytes
+
+    table_offset = _HEADER.size
+    strings_offset = table_offset + len(records)
+    header = _HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(encoded), stat.st_size,
+                          stat.st_mtime_ns, table_offset, strings_offset, len(strings))
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(records)
+        f.write(strings)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class ArchiveIndex:
+    """Read-only, memory-mapped view of a version 2 archive index"""
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._file = open(index_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty index file: {index_path}")
+        (magic, version, _flags, self._count, self.archive_size, self.archive_mtime_ns,
+         self._table_offset, self._strings_offset, _strings_size) = _HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {INDEX_VERSION} archive index: {index_path}")
+
+    @classmethod
+    def open(cls, archive_path: str, index_path: Optional[str] = None) -> Optional['ArchiveIndex']:
+        """Open the index for archive_path if it exists and still matches the archive"""
+        index_path = index_path or index_path_for(archive_path)
+        try:
+            index = cls(index_path)
+        except (OSError, ValueError, struct.error):
+            return None
+        try:
+            stat = os.stat(archive_path)
+        except OSError:
+            index.close()
+            return None
+        if stat.st_size != index.archive_size or stat.st_mtime_ns != index.archive_mtime_ns:
+            index.close()
+            return None
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, i: int):
+        return _RECORD.unpack_from(self._map, self._table_offset + i * _RECORD.size)
+
+    def _path_bytes(self, i: int) -> bytes:
+        path_offset, path_len = struct.unpack_from('<QI', self._map, self._table_offset + i * _RECORD.size)
+        start = self._strings_offset + path_offset
+        return self._map[start:start + path_len]
+
+    def entry(self, i: int) -> Dict[str, Any]:
+        """Entry i in path order, as the dict shape used by the browse threads"""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        path_offset, path_len, flags, size, compressed, mtime, offset = self._record(i)
+        start = self._strings_offset + path_offset
+        path = self._map[start:start + path_len].decode('utf-8')
+        return {
+            'path': path,
+            'name': os.path.basename(path.rstrip('/')),
+            'size': size,
+            'compressed': compressed,
+            'mtime': mtime,
+            'is_dir': bool(flags & FLAG_DIR),
+            'offset': None if offset < 0 else offset,
+        }
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.entry(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._count):
+            yield self.entry(i)
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._path_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, path: str) -> Optional[Dict[str, Any]]:
+        """Look up a single path in O(log n)"""
+        key = path.encode('utf-8')
+        i = self._lower_bound(key)
+        if i < self._count and self._path_bytes(i) == key:
+            return self.entry(i)
+        return None
+
+    def iter_prefix(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        """Yield every entry whose path starts with prefix, in path order"""
+        key = prefix.encode('utf-8')
+        i = self._lower_bound(key)
+        while i < self._count and self._path_bytes(i).startswith(key):
+            yield self.entry(i)
+            i += 1
+
+    def prefix_range(self, prefix: str):
+        """(start, end) record positions of the entries whose path starts with prefix"""
+        key = prefix.encode('utf-8')
+        start = self._lower_bound(key)
+        if not key:
+            return start, self._count
+        # Every path with the prefix sorts before the prefix with its last byte incremented
+        upper = key[:-1] + bytes([key[-1] + 1]) if key[-1] < 0xff else None
+        end = self._lower_bound(upper) if upper is not None else self._count
+        return start, end
+
+    def list_dir(self, directory: str) -> List[Dict[str, Any]]:
+        """Immediate children of a directory ('' for the root)
+
+        Directories that only exist as parents of other entries are
+        synthesized as {'path', 'name', 'is_dir': True}. Whole subtrees are
+        skipped with one binary search each, so listing a directory costs
+        O(children * log n) rather than a scan of its descendants.
+        """
+        prefix = directory.rstrip('/') + '/' if directory else ''
+        key = prefix.encode('utf-8')
+        start, end = self.prefix_range(prefix)
+        children: Dict[str, Dict[str, Any]] = {}
+        i = start
+        while i < end:
+            rest = self._path_bytes(i)[len(key):]
+            name_bytes, slash, _ = rest.partition(b'/')
+            if not name_bytes:
+                i += 1  # The directory's own entry ('dir/')
+                continue
+            name = name_bytes.decode('utf-8')
+            if slash:
+                if name not in children:
+                    entry = self.find(prefix + name + '/') or {'path': prefix + name + '/', 'size': 0}
+                    entry.update(name=name, is_dir=True)
+                    children[name] = entry
+                # '0' follows '/' in byte order: jump past everything under name/
+                i = self._lower_bound(key + name_bytes + b'0')
+                continue
+            entry = self.entry(i)
+            if name in children:
+                children[name].update({k: v for k, v in entry.items() if k != 'is_dir'})
+            else:
+                children[name] = entry
+            i += 1
+        return list(children.values())
+
+    def size_under(self, directory: str) -> int:
+        """Total uncompressed size of every entry below a directory"""
+        prefix = directory.rstrip('/') + '/' if directory else ''
+        start, end = self.prefix_range(prefix)
+        total = 0
+        base = self._table_offset
+        for i in range(start, end):
+            total += _SIZE.unpack_from(self._map, base + i * _RECORD.size)[0]
+        return total
+
+    def totals_under(self, directory: str) -> Tuple[int, int]:
+        """(uncompressed, compressed) size of every entry below a directory"""
+        prefix = directory.rstrip('/') + '/' if directory else ''
+        start, end = self.prefix_range(prefix)
+        size = compressed = 0
+        base = self._table_offset
+        for i in range(start, end):
+            entry_size, entry_compressed = _SIZES.unpack_from(self._map, base + i * _RECORD.size)
+            size += entry_size
+            compressed += entry_compressed
+        return size, compressed
+
+    def close(self) -> None:
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def load_legacy_index(index_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Read a version 1 (str(dict)) index without evaluating code"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if not text.startswith('{'):
+            return None
+        data = ast.literal_eval(text)
+        return data.get('files', []) if isinstance(data, dict) else None
+    except (OSError, ValueError, SyntaxError, UnicodeDecodeError):
+        return None
+
+
+def load_index_entries(archive_path: str) -> Optional[List[Dict[str, Any]]]:
+    """Load index entries for an archive from either index format.
+
+    A legacy index that is not older than its archive is migrated to the
+    version 2 format in place. Returns None if there is no usable index.
+    """
+    index = ArchiveIndex.open(archive_path)
+    if index is not None:
+        with index:
+            return list(index)
+
+    index_path = index_path_for(archive_path)
+    try:
+        if os.path.getmtime(index_path) < os.path.getmtime(archive_path):
+            return None
+    except OSError:
+        return None
+    entries = load_legacy_index(index_path)
+    if entries is not None:
+        try:
+            write_index(archive_path, entries, index_path)
+        except OSError as e:
+            print(f"Warning: Could not migrate index {index_path}: {e}")
+    return entries
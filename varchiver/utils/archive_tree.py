@@ -0,0 +1,220 @@
+"""Directory tree built from a flat archive listing.
+
+Every directory node keeps its children in a dict keyed by name, and the
+builder keeps a second dict from directory path to node, so each listing
+entry is placed with O(1) lookups regardless of how wide a directory is.
+Missing parent directories (archives often list only files) are created
+on the way.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class TreeNode:
+    """One file or directory in an archive tree"""
+
+    __slots__ = ('name', 'path', 'is_dir', 'size', 'compressed', 'children', 'parent', 'entry')
+
+    def __init__(self, name: str, path: str, is_dir: bool, parent: Optional['TreeNode'] = None):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.size = 0  # File size, or total size of everything below a directory
+        self.compressed = 0  # Same, compressed
+        self.children: Dict[str, 'TreeNode'] = {}
+        self.parent = parent
+        self.entry: Optional[Dict[str, Any]] = None  # Listing entry the node came from
+
+    def sorted_children(self) -> List['TreeNode']:
+        """Children with directories first, then by case-insensitive name"""
+        return sorted(self.children.values(), key=lambda n: (not n.is_dir, n.name.lower()))
+
+    def file_count(self) -> int:
+        """Number of files at or below this node"""
+        count = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.is_dir:
+                stack.extend(node.children.values())
+            else:
+                count += 1
+        return count
+
+    def __repr__(self) -> str:
+        return f"TreeNode({self.path!r}, is_dir={self.is_dir}, size={self.size})"
+
+
+def _normalize(path: str) -> Optional[str]:
+    """Archive path with '/' separators and no leading './' or '/'; None if unsafe"""
+    path = path.replace('\\', '/')
+    while path.startswith('./'):
+        path = path[2:]
+    path = path.strip('/')
+    if not path or path == '.' or '..' in path.split('/'):
+        return None
+    return path
+
+
+def build_tree(entries: Iterable[Dict[str, Any]],
+               progress_callback: Optional[Callable[[int], None]] = None,
+               cancel_check: Optional[Callable[[], bool]] = None,
+               total: Optional[int] = None,
+               interval: float = 0.1) -> Optional[TreeNode]:
+    """Build a tree from listing entries ({'path', 'size', 'is_dir', ...})
+
+    Args:
+        entries: Archive listing in any order
+        progress_callback: Called with a 0-100 percentage at most once per interval
+        cancel_check: Returns True to abandon the build (the result is then None)
+        total: Number of entries, for progress when entries is not a list
+        interval: Minimum seconds between progress callbacks
+
+    Returns:
+        The root node (an unnamed directory), or None if cancelled
+    """
+    root = TreeNode('', '', True)
+    dirs: Dict[str, TreeNode] = {'': root}
+
+    def ensure_dir(path: str) -> TreeNode:
+        node = dirs.get(path)
+        if node is not None:
+            return node
+        missing = []
+        while path not in dirs:
+            missing.append(path)
+            path = path.rpartition('/')[0]
+        node = dirs[path]
+        for dir_path in reversed(missing):
+            name = dir_path.rpartition('/')[2]
+            child = node.children.get(name)
+            if child is None:
+                child = TreeNode(name, dir_path, True, node)
+                node.children[name] = child
+            else:
+                child.is_dir = True
+            dirs[dir_path] = child
+            node = child
+        return node
+
+    if total is None and hasattr(entries, '__len__'):
+        total = len(entries)
+    last_report = time.monotonic()
+
+    for i, entry in enumerate(entries):
+        if cancel_check and i % 1024 == 0 and cancel_check():
+            return None
+        raw_path = entry['path']
+        path = _normalize(raw_path)
+        if path is None:
+            continue
+        is_dir = entry.get('is_dir', raw_path.endswith('/'))
+
+        if is_dir:
+            ensure_dir(path).entry = entry
+        else:
+            parent_path, _, name = path.rpartition('/')
+            parent = ensure_dir(parent_path)
+            node = parent.children.get(name)
+            if node is None:
+                node = TreeNode(name, path, False, parent)
+                parent.children[name] = node
+            size = entry.get('size', 0) or 0
+            compressed = entry.get('compressed', size) or 0
+            delta = size - node.size  # A repeated entry replaces the earlier one
+            compressed_delta = compressed - node.compressed
+            node.size = size
+            node.compressed = compressed
+            node.entry = entry
+            ancestor = parent
+            while ancestor is not None:
+                ancestor.size += delta
+                ancestor.compressed += compressed_delta
+                ancestor = ancestor.parent
+
+        if progress_callback and total:
+            now = time.monotonic()
+            if now - last_report >= interval:
+                last_report = now
+                progress_callback(int((i + 1) * 100 / total))
+
+    if progress_callback:
+        progress_callback(100)
+    return root
+
+
+class NodeTreeSource:
+    """Tree source over an in-memory TreeNode tree"""
+
+    def __init__(self, root: TreeNode):
+        self.root = root
+        self._dirs: Dict[str, TreeNode] = {'': root}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict[str, Any]]) -> 'NodeTreeSource':
+        return cls(build_tree(entries))
+
+    def _node(self, path: str) -> Optional[TreeNode]:
+        node = self._dirs.get(path)
+        if node is None:
+            node = self.root
+            for part in path.split('/'):
+                node = node.children.get(part)
+                if node is None:
+                    return None
+            self._dirs[path] = node
+        return node
+
+    def children(self, path: str) -> List[TreeNode]:
+        """Children of the directory at path ('' for the root), directories first"""
+        node = self._node(path.rstrip('/'))
+        return node.sorted_children() if node is not None else []
+
+    def dir_size(self, path: str) -> int:
+        return self.dir_totals(path)[0]
+
+    def dir_totals(self, path: str) -> Tuple[int, int]:
+        """(uncompressed, compressed) size of everything below a directory"""
+        node = self._node(path.rstrip('/'))
+        return (node.size, node.compressed) if node is not None else (0, 0)
+
+    def close(self) -> None:
+        pass
+
+
+class IndexTreeSource:
+    """Tree source reading a memory-mapped ArchiveIndex on demand
+
+    Only directories that are actually listed are read from the index, and
+    directory sizes are summed the first time they are asked for.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._sizes: Dict[str, Tuple[int, int]] = {}
+
+    def children(self, path: str) -> List[TreeNode]:
+        """Children of the directory at path ('' for the root), directories first"""
+        nodes = []
+        for entry in self.index.list_dir(path):
+            node = TreeNode(entry['name'], entry['path'].rstrip('/'), entry['is_dir'])
+            node.size = entry.get('size', 0) or 0
+            node.compressed = entry.get('compressed', node.size) or 0
+            node.entry = entry
+            nodes.append(node)
+        nodes.sort(key=lambda n: (not n.is_dir, n.name.lower()))
+        return nodes
+
+    def dir_size(self, path: str) -> int:
+        return self.dir_totals(path)[0]
+
+    def dir_totals(self, path: str) -> Tuple[int, int]:
+        """(uncompressed, compressed) size of everything below a directory"""
+        totals = self._sizes.get(path)
+        if totals is None:
+            totals = self._sizes[path] = self.index.totals_under(path)
+        return totals
+
+    def close(self) -> None:
+        self.index.close()
@@ -1,4 +1,8 @@
 import os
+import tarfile
+
+# Archive types handled through tarfile
+TAR_TYPES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst')
 
 def get_archive_type(archive_path):
     """Helper method to determine archive type from file extension"""
@@ -7,13 +11,64 @@ def get_archive_type(archive_path):
         return 'dir'
         
     ext = os.path.splitext(archive_path.lower())[1]
-    if ext in ('.gz', '.bz2', '.xz'):
+    if ext in ('.gz', '.bz2', '.xz', '.zst'):
         # Handle .tar.gz, .tar.bz2, etc.
         base = os.path.splitext(archive_path[:-len(ext)])[1]
         if base == '.tar':
             return base + ext
     return ext
 
+def open_tar(archive_path, stream=False, fileobj=None):
+    """Open a tar archive for reading.
+
+    tarfile has no zstd support before Python 3.14, so .tar.zst archives are
+    opened as a forward-only stream through the optional zstandard package.
+    With stream=True every format is opened forward-only ('r|*'), which
+    decompresses the archive exactly once when members are visited in
+    order. If fileobj is given it is read instead of archive_path and is
+    left open for the caller to close.
+    """
+    if get_archive_type(archive_path) == '.tar.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise Exception("Reading .tar.zst archives requires the 'zstandard' package")
+        raw = fileobj or open(archive_path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True,
+                                                            closefd=fileobj is None)
+        return tarfile.open(fileobj=reader, mode='r|')
+    if stream:
+        if fileobj is not None:
+            return tarfile.open(fileobj=fileobj, mode='r|*')
+        return tarfile.open(archive_path, 'r|*')
+    return tarfile.open(archive_path, 'r:*')
+
+def extract_tar_member(tar, member, path, set_attrs=True):
+    """Extract one tar member under path, refusing anything that would land outside it
+
+    Uses tarfile's 'data' filter where available (Python 3.11.4+, the
+    default from 3.14); older Pythons get an equivalent check on the
+    member's path and link target. Raises tarfile.TarError (or
+    tarfile.FilterError) for a member that escapes path.
+    """
+    if hasattr(tarfile, 'data_filter'):
+        tar.extract(member, path, set_attrs=set_attrs, filter='data')
+        return
+    root = os.path.realpath(path)
+
+    def inside(target):
+        target = os.path.realpath(os.path.join(root, target))
+        return os.path.commonpath([root, target]) == root
+
+    if os.path.isabs(member.name) or not inside(member.name):
+        raise tarfile.TarError(f"Member points outside the destination: {member.name}")
+    if member.issym() and (os.path.isabs(member.linkname)
+                           or not inside(os.path.join(os.path.dirname(member.name), member.linkname))):
+        raise tarfile.TarError(f"Link points outside the destination: {member.name}")
+    if member.islnk() and not inside(member.linkname):
+        raise tarfile.TarError(f"Link points outside the destination: {member.name}")
+    tar.extract(member, path, set_attrs=set_attrs)
+
 def format_size(size):
     """Format size in bytes to human readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -0,0 +1,242 @@
+"""Incremental, rsync-style directory synchronisation.
+
+Both trees are scanned with the parallel ``fs_scan`` walker, and files are
+compared by size and modification time (to the second, as rsync does by
+default) without opening them. Only files that are new or differ are
+copied, so re-syncing an unchanged tree costs one ``stat`` per file on each
+side. With ``checksum=True``, files whose size matches but whose mtime
+differs are hashed before deciding; identical ones just get their
+timestamps fixed, so the next run no longer needs to hash them.
+
+Copies are written to a temporary name next to the target and renamed into
+place, so an interrupted sync never leaves a half-written file behind. They
+go through ``fast_copy``, so they run on a thread pool and use reflinks or
+in-kernel copies where the filesystem supports them.
+"""
+
+import hashlib
+import os
+import shutil
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .fast_copy import DEFAULT_COPY_WORKERS, CopyResult, copy_file, copy_many
+from .fs_scan import scan_paths
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class SyncAction(NamedTuple):
+    """One file to copy from source to target"""
+    rel_path: str
+    source: str
+    target: str
+    size: int
+
+
+class SyncStats:
+    """What a sync checked, changed and transferred"""
+
+    __slots__ = ('files_checked', 'files_copied', 'files_unchanged', 'files_deleted',
+                 'dirs_deleted', 'bytes_copied', 'bytes_hashed', 'strategies', 'copy_seconds', 'errors')
+
+    def __init__(self):
+        self.files_checked = 0
+        self.files_copied = 0
+        self.files_unchanged = 0
+        self.files_deleted = 0
+        self.dirs_deleted = 0
+        self.bytes_copied = 0
+        self.bytes_hashed = 0
+        self.strategies: Dict[str, int] = {}
+        self.copy_seconds = 0.0
+        self.errors: List[Tuple[str, str]] = []
+
+    def as_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def file_digest(path: str) -> str:
+    """BLAKE2b digest of a file's contents"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_tree(root: str, skip_file, skip_dir, cancel_check) -> Dict[str, Tuple[str, int, float]]:
+    """rel_path -> (path, size, mtime) for every file under root"""
+    files = {}
+    for record in scan_paths([root], skip_file=skip_file, skip_dir=skip_dir,
+                             cancel_check=cancel_check):
+        rel_path = os.path.relpath(record.path, root).replace(os.sep, '/')
+        files[rel_path] = (record.path, record.size, record.mtime)
+    return files
+
+
+def copy_file_atomic(source: str, target: str) -> Tuple[str, int]:
+    """Copy source to target with metadata, replacing target in one rename
+
+    Returns:
+        (copy strategy used, bytes copied), as from fast_copy.copy_file
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.varchiver-tmp")
+    try:
+        result = copy_file(source, tmp_path)
+        os.replace(tmp_path, target)
+        return result
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def plan_sync(source_root: str, target_root: str,
+              skip: Optional[Callable[[str], bool]] = None,
+              skip_dir: Optional[Callable[[str], bool]] = None,
+              checksum: bool = False,
+              cancel_check: Optional[Callable[[], bool]] = None,
+              stats: Optional[SyncStats] = None) -> Tuple[List[SyncAction], List[str]]:
+    """Work out which files to copy and which target files have no source
+
+    Args:
+        source_root: Directory to sync from
+        target_root: Directory to sync into
+        skip: Returns True for relative paths to leave alone on both sides
+        skip_dir: Returns True for relative directory paths to prune
+        checksum: Hash same-size files whose mtimes differ instead of copying them
+        cancel_check: Returns True to stop scanning
+        stats: Updated with checked/unchanged counts and bytes hashed
+
+    Returns:
+        (files to copy, target paths missing from the source)
+    """
+    stats = stats if stats is not None else SyncStats()
+
+    def relative(root, check):
+        if check is None:
+            return None
+        return lambda path: check(os.path.relpath(path, root).replace(os.sep, '/'))
+
+    source_files = _scan_tree(source_root, relative(source_root, skip),
+                              relative(source_root, skip_dir), cancel_check)
+    target_files = {}
+    if os.path.isdir(target_root):
+        target_files = _scan_tree(target_root, relative(target_root, skip),
+                                  relative(target_root, skip_dir), cancel_check)
+
+    actions = []
+    for rel_path, (source, size, mtime) in sorted(source_files.items()):
+        stats.files_checked += 1
+        existing = target_files.get(rel_path)
+        target = os.path.join(target_root, rel_path.replace('/', os.sep))
+        if existing is not None and existing[1] == size:
+            if int(existing[2]) == int(mtime):
+                stats.files_unchanged += 1
+                continue
+            if checksum:
+                stats.bytes_hashed += 2 * size
+                if file_digest(source) == file_digest(existing[0]):
+                    shutil.copystat(source, existing[0])
+                    stats.files_unchanged += 1
+                    continue
+        actions.append(SyncAction(rel_path, source, target, size))
+
+    extraneous = [path for rel_path, (path, _, _) in target_files.items()
+                  if rel_path not in source_files]
+    return actions, sorted(extraneous)
+
+
+def _remove_empty_dirs(target_root: str, source_root: str, stats: SyncStats, skip_dir=None) -> None:
+    """Remove target directories left empty that do not exist in the source"""
+    for root, dirs, files in os.walk(target_root, topdown=False):
+        if root == target_root or files:
+            continue
+        rel_path = os.path.relpath(root, target_root)
+        if skip_dir and skip_dir(rel_path.replace(os.sep, '/')):
+            continue
+        if os.path.isdir(os.path.join(source_root, rel_path)):
+            continue
+        try:
+            os.rmdir(root)
+            stats.dirs_deleted += 1
+        except OSError:
+            pass  # Not empty after all (e.g. holds skipped files)
+
+
+def sync_directories(source_root: str, target_root: str,
+                     skip: Optional[Callable[[str], bool]] = None,
+                     skip_dir: Optional[Callable[[str], bool]] = None,
+                     checksum: bool = False,
+                     delete: bool = False,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     status_callback: Optional[Callable[[str], None]] = None,
+                     cancel_check: Optional[Callable[[], bool]] = None,
+                     workers: int = DEFAULT_COPY_WORKERS) -> SyncStats:
+    """Make target_root match source_root, copying only what changed
+
+    Args:
+        source_root: Directory to sync from
+        target_root: Directory to sync into (created if missing)
+        skip: Returns True for relative paths to leave alone on both sides
+        skip_dir: Returns True for relative directory paths to prune
+        checksum: Hash same-size files whose mtimes differ instead of copying them
+        delete: Remove target files (and then empty directories) absent from the source
+        progress_callback: Called with (bytes copied, bytes to copy)
+        status_callback: Called with a short description of the current step
+        cancel_check: Returns True to stop between files
+        workers: Files copied in parallel
+
+    Returns:
+        SyncStats for the run
+    """
+    stats = SyncStats()
+    if status_callback:
+        status_callback("Comparing directories...")
+    actions, extraneous = plan_sync(source_root, target_root, skip, skip_dir, checksum,
+                                    cancel_check, stats)
+    if cancel_check and cancel_check():
+        return stats  # A partial scan must not drive copies or deletions
+
+    total = sum(action.size for action in actions)
+    if progress_callback:
+        progress_callback(0, total)
+    rel_paths = {action.source: action.rel_path for action in actions}
+
+    def on_copied(source, target, strategy, size):
+        stats.files_copied += 1
+        stats.bytes_copied += size
+        if progress_callback:
+            progress_callback(stats.bytes_copied, total)
+
+    def on_progress(result: CopyResult):
+        if status_callback and result.files:
+            status_callback(f"Copying: {result.summary()}")
+
+    result = copy_many(((action.source, action.target) for action in actions),
+                       workers=workers, copy_fn=copy_file_atomic, on_copied=on_copied,
+                       progress_callback=on_progress, cancel_check=cancel_check)
+    stats.strategies = dict(result.strategies)
+    stats.copy_seconds = result.elapsed
+    stats.errors.extend((rel_paths.get(source, source), message)
+                        for source, message in result.errors)
+    if cancel_check and cancel_check():
+        return stats
+
+    if delete and not (cancel_check and cancel_check()):
+        for path in extraneous:
+            rel_path = os.path.relpath(path, target_root)
+            if os.path.lexists(os.path.join(source_root, rel_path)):
+                continue  # Present but unlisted (e.g. an unreadable directory): keep it
+            if status_callback:
+                status_callback(f"Deleting: {rel_path}")
+            try:
+                os.remove(path)
+                stats.files_deleted += 1
+            except OSError as e:
+                stats.errors.append((rel_path, str(e)))
+        _remove_empty_dirs(target_root, source_root, stats, skip_dir)
+    return stats
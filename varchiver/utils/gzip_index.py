@@ -0,0 +1,344 @@
+"""Random access into gzip-compressed tar archives.
+
+A seek index maps uncompressed offsets to places decompression can restart
+from, so reading one member of a large ``.tar.gz`` only decompresses from
+the nearest seek point instead of from the start of the file.
+
+Seek points come from three places:
+
+* gzip member boundaries. Archives written by ``ParallelCompressedWriter``
+  are a series of independent gzip members, and any multi-member file can be
+  resumed at a member start with no decompressor state. These points are
+  persisted next to the archive in a ``.gzidx`` JSON file.
+* In-memory checkpoints. Python's zlib cannot prime an inflate stream at a
+  bit offset (zran's approach), so inside a single large gzip member we keep
+  copies of the live decompressor every ``span`` bytes. They last for the
+  process and are bounded by an LRU over archives.
+* ``indexed_gzip``, when installed, provides true zran-style indexes for
+  foreign single-member archives; its index is exported to ``.gzidx-zran``.
+"""
+
+import io
+import json
+import os
+import tarfile
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import indexed_gzip
+    INDEXED_GZIP_AVAILABLE = True
+except ImportError:
+    INDEXED_GZIP_AVAILABLE = False
+
+GZIP_INDEX_SUFFIX = '.gzidx'
+ZRAN_INDEX_SUFFIX = '.gzidx-zran'
+GZIP_INDEX_VERSION = 1
+DEFAULT_SPAN = 16 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+MAX_CHECKPOINTED_ARCHIVES = 4
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# (path, size, mtime_ns) -> [(uncompressed offset, compressed offset, decompressor)]
+_checkpoint_cache: 'OrderedDict[Tuple[str, int, int], List[tuple]]' = OrderedDict()
+_checkpoint_lock = Lock()
+
+
+def _archive_key(archive_path: str) -> Tuple[str, int, int]:
+    stat = os.stat(archive_path)
+    return os.path.abspath(archive_path), stat.st_size, stat.st_mtime_ns
+
+
+def _remember_checkpoints(archive_path: str, checkpoints: List[tuple]) -> None:
+    key = _archive_key(archive_path)
+    with _checkpoint_lock:
+        _checkpoint_cache[key] = checkpoints
+        _checkpoint_cache.move_to_end(key)
+        while len(_checkpoint_cache) > MAX_CHECKPOINTED_ARCHIVES:
+            _checkpoint_cache.popitem(last=False)
+
+
+def _cached_checkpoints(archive_path: str) -> List[tuple]:
+    key = _archive_key(archive_path)
+    with _checkpoint_lock:
+        checkpoints = _checkpoint_cache.get(key)
+        if checkpoints is not None:
+            _checkpoint_cache.move_to_end(key)
+        return checkpoints or []
+
+
+def write_seek_index(archive_path: str, points: List[Tuple[int, int]]) -> str:
+    """Persist gzip member start points [(uncompressed, compressed), ...] for archive_path"""
+    stat = os.stat(archive_path)
+    index_path = archive_path + GZIP_INDEX_SUFFIX
+    data = {
+        'version': GZIP_INDEX_VERSION,
+        'archive_size': stat.st_size,
+        'archive_mtime_ns': stat.st_mtime_ns,
+        'points': [list(p) for p in points],
+    }
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def load_seek_index(archive_path: str) -> Optional[List[Tuple[int, int]]]:
+    """Load persisted gzip member start points if they still match the archive"""
+    try:
+        with open(archive_path + GZIP_INDEX_SUFFIX, 'r') as f:
+            data = json.load(f)
+        stat = os.stat(archive_path)
+    except (OSError, ValueError):
+        return None
+    if (data.get('version') != GZIP_INDEX_VERSION or data.get('archive_size') != stat.st_size
+            or data.get('archive_mtime_ns') != stat.st_mtime_ns):
+        return None
+    return [tuple(p) for p in data.get('points', [])]
+
+
+class SeekableGzipReader(io.RawIOBase):
+    """Read-only, seekable view of the uncompressed contents of a gzip file
+
+    Seeking restarts decompression from the closest seek point at or before
+    the target, then reads forward. While reading sequentially it records new
+    member boundaries and (if ``span`` is set) decompressor checkpoints, so a
+    first full pass over the file builds the index.
+    """
+
+    def __init__(self, path: str, points: Optional[List[Tuple[int, int]]] = None,
+                 checkpoints: Optional[List[tuple]] = None, span: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        self.member_points: List[Tuple[int, int]] = sorted(set(points or [(0, 0)]))
+        self.checkpoints: List[tuple] = list(checkpoints or [])
+        self.span = span
+        self._fp = open(path, 'rb')
+        self._restart(0, 0, None)
+
+    def _restart(self, uncompressed: int, compressed: int, decompressor) -> None:
+        self._fp.seek(compressed)
+        self._compressed = compressed
+        self._pos = uncompressed
+        self._decomp = decompressor.copy() if decompressor else zlib.decompressobj(31)
+        self._buffer = b''
+        self._eof = False
+        self._next_checkpoint = (uncompressed // self.span + 1) * self.span if self.span else None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def _fill(self) -> bool:
+        """Decompress one more input chunk into the buffer; False at end of stream"""
+        while not self._eof:
+            chunk = self._fp.read(READ_CHUNK_SIZE)
+            if not chunk:
+                self._eof = True
+                return False
+            chunk_start = self._compressed
+            self._compressed += len(chunk)
+            out = [self._decomp.decompress(chunk)]
+            produced = self._pos + len(self._buffer) + len(out[0])
+            while self._decomp.eof:
+                rest = self._decomp.unused_data
+                if not rest.startswith(_GZIP_MAGIC):
+                    # Trailing padding or garbage after the last member
+                    self._eof = True
+                    break
+                member_start = chunk_start + len(chunk) - len(rest)
+                point = (produced, member_start)
+                if point not in self.member_points:
+                    self.member_points.append(point)
+                self._decomp = zlib.decompressobj(31)
+                data = self._decomp.decompress(rest)
+                out.append(data)
+                produced += len(data)
+            if self._next_checkpoint is not None and produced >= self._next_checkpoint and not self._eof:
+                self.checkpoints.append((produced, self._compressed, self._decomp.copy()))
+                self._next_checkpoint = (produced // self.span + 1) * self.span
+            data = b''.join(out)
+            if data:
+                self._buffer += data
+                return True
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            while self._fill():
+                pass
+            size = len(self._buffer)
+        while len(self._buffer) < size and self._fill():
+            pass
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._pos += len(data)
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            raise io.UnsupportedOperation("seek from end is not supported")
+        if offset < 0:
+            raise ValueError("negative seek position")
+
+        best = max((p for p in self.member_points if p[0] <= offset), default=(0, 0))
+        best_state = None
+        for uncompressed, compressed, decompressor in self.checkpoints:
+            if best[0] < uncompressed <= offset:
+                best = (uncompressed, compressed)
+                best_state = decompressor
+        if not (best[0] <= self._pos <= offset):
+            self._restart(best[0], best[1], best_state)
+
+        while self._pos < offset:
+            if not self.read(min(offset - self._pos, 1024 * 1024)):
+                break
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fp.close()
+        super().close()
+
+
+def _zran_index(archive_path: str) -> Optional[str]:
+    """Path of a current zran index for archive_path, if indexed_gzip can use one"""
+    zran_path = archive_path + ZRAN_INDEX_SUFFIX
+    if INDEXED_GZIP_AVAILABLE and os.path.exists(zran_path) and \
+            os.path.getmtime(zran_path) >= os.path.getmtime(archive_path):
+        return zran_path
+    return None
+
+
+def has_seek_points(archive_path: str) -> bool:
+    """Whether decompression of archive_path can restart anywhere past its start
+
+    False for a single gzip member indexed in an earlier process: its only
+    seek point is offset 0, so random access would re-inflate from there.
+    """
+    points = load_seek_index(archive_path)
+    if points and any(uncompressed > 0 for uncompressed, _ in points):
+        return True
+    return bool(_cached_checkpoints(archive_path) or _zran_index(archive_path))
+
+
+def open_seekable_gzip(archive_path: str, span: int = DEFAULT_SPAN):
+    """Open a gzip file for random access using the best index available"""
+    points = load_seek_index(archive_path)
+    checkpoints = _cached_checkpoints(archive_path)
+    if points and len(points) > 1 or checkpoints:
+        return SeekableGzipReader(archive_path, points, checkpoints, span=None)
+
+    zran_path = _zran_index(archive_path)
+    if zran_path:
+        return indexed_gzip.IndexedGzipFile(archive_path, index_file=zran_path, spacing=span)
+
+    return SeekableGzipReader(archive_path, points, checkpoints, span=span)
+
+
+def build_tar_gz_index(archive_path: str, span: int = DEFAULT_SPAN,
+                       progress_callback: Optional[Callable[[int, int], None]] = None
+                       ) -> List[Dict[str, Any]]:
+    """List a .tar.gz in one pass while recording seek points and member offsets
+
+    Persists the gzip member boundaries (and a zran index when indexed_gzip is
+    available), keeps decompressor checkpoints in memory for this process and
+    returns .arindex-style entries whose 'offset' is the member's header offset
+    in the uncompressed tar stream.
+
+    Args:
+        archive_path: The .tar.gz archive
+        span: Uncompressed distance between in-memory checkpoints
+        progress_callback: Called with (compressed bytes read, archive size)
+    """
+    total = os.path.getsize(archive_path)
+    entries = []
+    with SeekableGzipReader(archive_path, span=span) as reader:
+        with tarfile.open(fileobj=reader, mode='r|') as tar:
+            for member in tar:
+                entries.append({
+                    'path': member.name + ('/' if member.isdir() and not member.name.endswith('/') else ''),
+                    'size': member.size,
+                    'compressed': member.size,
+                    'mtime': member.mtime,
+                    'is_dir': member.isdir(),
+                    'offset': member.offset,
+                })
+                if progress_callback:
+                    progress_callback(reader._compressed, total)
+        member_points = reader.member_points
+        checkpoints = reader.checkpoints
+
+    write_seek_index(archive_path, member_points)
+    if len(member_points) > 1:
+        # Member boundaries already give cheap restart points
+        return entries
+    if INDEXED_GZIP_AVAILABLE:
+        try:
+            with indexed_gzip.IndexedGzipFile(archive_path, spacing=span) as zran:
+                zran.build_full_index()
+                zran.export_index(archive_path + ZRAN_INDEX_SUFFIX)
+            return entries
+        except Exception as e:
+            print(f"Warning: Could not build zran index: {e}")
+    _remember_checkpoints(archive_path, checkpoints)
+    return entries
+
+
+def open_tar_member(archive_path: str, header_offset: int):
+    """Open a .tar.gz positioned at one member without decompressing from the start
+
+    Returns (tarfile, tarinfo); read the data with ``tarfile.extractfile``
+    or ``tarfile.extract``. The caller closes the returned TarFile, which also
+    closes the underlying reader.
+    """
+    reader = open_seekable_gzip(archive_path)
+    reader.seek(header_offset)
+    tar = tarfile.open(fileobj=reader, mode='r:')
+    tar._extfileobj = False  # Close the reader together with the TarFile
+    member = tar.firstmember or tar.next()
+    if member is None:
+        tar.close()
+        raise Exception(f"No tar member at offset {header_offset}")
+    return tar, member
+
+
+def iter_tar_members(archive_path: str, header_offsets: List[int]):
+    """Yield (tarfile, tarinfo) for the members at header_offsets, in offset order
+
+    One reader and one TarFile serve every member: each header is reached by
+    seeking forward from the previous member, restarting only at a seek point
+    past the current position, so the archive is inflated at most once.
+    Extract each member before advancing the generator; close the generator
+    to release the file early.
+    """
+    offsets = sorted(set(header_offsets))
+    if not offsets:
+        return
+    reader = open_seekable_gzip(archive_path)
+    reader.seek(offsets[0])
+    tar = tarfile.open(fileobj=reader, mode='r:')
+    tar._extfileobj = False  # Close the reader together with the TarFile
+    with tar:
+        for offset in offsets:
+            if offset != offsets[0]:
+                tar.offset = offset
+            member = tar.next()
+            if member is None:
+                raise Exception(f"No tar member at offset {offset}")
+            yield tar, member
@@ -0,0 +1,86 @@
+"""Source file hashes recorded when an archive is created (.arhashes).
+
+A ZIP's CRC32s and a 7z's CRCs only show that members still match what
+was written, and tar checksums cover headers alone. Recording the digest
+of every source file as it is archived lets verification check the
+content itself, in any format, against the tree it came from.
+
+The manifest is gzipped JSON next to the archive:
+
+    {"version": 1, "algorithm": "blake2b-160",
+     "files": {"<member path>": ["<hex digest>", <size>], ...}}
+
+Unlike the .arindex it is not tied to the archive's size and mtime: it
+describes what the archive should contain, so it is kept when the archive
+changes and a mismatch is reported instead.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .dir_sync import file_digest
+
+HASHES_SUFFIX = '.arhashes'
+MANIFEST_VERSION = 1
+ALGORITHM = 'blake2b-160'  # What dir_sync.file_digest computes
+
+
+def new_digest():
+    """A hash object matching file_digest, for data read from an archive"""
+    return hashlib.blake2b(digest_size=20)
+
+
+def hashes_path_for(archive_path: str) -> str:
+    """Path of the hash manifest belonging to an archive"""
+    return archive_path + HASHES_SUFFIX
+
+
+def hash_source(path: str) -> Tuple[str, int]:
+    """(digest, size) of a source file"""
+    return file_digest(path), os.path.getsize(path)
+
+
+def write_hashes(archive_path: str, files: Dict[str, Tuple[str, int]]) -> str:
+    """Write the manifest for archive_path from {member path: (digest, size)}"""
+    path = hashes_path_for(archive_path)
+    data = {'version': MANIFEST_VERSION, 'algorithm': ALGORITHM,
+            'files': {name: [digest, size] for name, (digest, size) in sorted(files.items())}}
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_hashes(archive_path: str) -> Optional[Dict[str, Tuple[str, int]]]:
+    """{member path: (digest, size)} from the archive's manifest, or None if it has none"""
+    try:
+        with gzip.open(hashes_path_for(archive_path), 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get('version') != MANIFEST_VERSION or data.get('algorithm') != ALGORITHM:
+        raise ValueError(f"Unsupported hash manifest: version {data.get('version')}, "
+                         f"{data.get('algorithm')}")
+    return {name: (digest, size) for name, (digest, size) in data['files'].items()}
+
+
+def compare_hashes(recorded: Dict[str, Tuple[str, int]],
+                   actual: Dict[str, str]) -> List[List[str]]:
+    """[member, message] for every difference between recorded and archived digests
+
+    actual maps each member read from the archive to its digest.
+    """
+    errors = []
+    for name, (digest, size) in recorded.items():
+        found = actual.get(name)
+        if found is None:
+            errors.append([name, "Recorded at creation but missing from the archive"])
+        elif found != digest:
+            errors.append([name, "Content differs from the source recorded at creation"])
+    for name in actual.keys() - recorded.keys():
+        errors.append([name, "Not among the source files recorded at creation"])
+    return errors
@@ -0,0 +1,204 @@
+"""Bounded cache of archive listings.
+
+Listings are keyed by the archive's resolved path together with its size,
+mtime and inode, so a rewritten or replaced archive never matches a stale
+entry. The in-memory layer is an LRU bounded both by entry count and by an
+estimate of the listings' size in bytes. Listings can also be written to
+``~/.cache/varchiver/listings`` as gzipped JSON, which makes reopening a
+recently browsed archive after a restart as fast as a memory hit; the disk
+directory is pruned oldest-first to its own byte budget.
+
+Listings of password-protected archives are kept in memory only, since
+file names can be as sensitive as the contents.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.expanduser('~/.cache/varchiver/listings')
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+LISTING_CACHE_VERSION = 1
+
+# Rough per-entry overhead of a listing dict on top of its path string
+_ENTRY_OVERHEAD = 200
+
+CacheKey = Tuple[str, int, int, int]
+
+
+def listing_key(archive_path: str) -> CacheKey:
+    """Cache key for an archive: (real path, size, mtime_ns, inode)"""
+    stat = os.stat(archive_path)
+    return os.path.realpath(archive_path), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def _estimate_bytes(listing: List[Dict[str, Any]]) -> int:
+    return sum(len(entry.get('path', '')) + _ENTRY_OVERHEAD for entry in listing)
+
+
+class ListingCache:
+    """LRU cache of archive listings with optional persistence on disk"""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        """
+        Args:
+            cache_dir: Directory for persisted listings; None keeps them in memory only
+            max_entries: Listings kept in memory
+            max_bytes: Estimated memory budget for all cached listings
+            max_disk_bytes: Budget for the persisted listing files
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[CacheKey, Tuple[List[Dict[str, Any]], int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def _disk_path(self, key: CacheKey) -> str:
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json.gz")
+
+    def _remember(self, key: CacheKey, listing: List[Dict[str, Any]]) -> None:
+        """Add a listing to the memory LRU; caller holds the lock"""
+        size = _estimate_bytes(listing)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (listing, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _load_from_disk(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable listing cache {path}: {e}")
+            return None
+        if data.get('version') != LISTING_CACHE_VERSION or tuple(data.get('key', ())) != key:
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for pruning
+        except OSError:
+            pass
+        return data['entries']
+
+    def _save_to_disk(self, key: CacheKey, listing: List[Dict[str, Any]]) -> None:
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1) as f:
+                json.dump({'version': LISTING_CACHE_VERSION, 'key': list(key), 'entries': listing}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Warning: Could not write listing cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Remove the least recently used listing files beyond the disk budget"""
+        try:
+            files = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.json.gz'):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def get(self, archive_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached listing for the archive as it is now, or None"""
+        try:
+            key = listing_key(archive_path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+        listing = self._load_from_disk(key)
+        with self._lock:
+            if listing is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, listing)
+        return listing
+
+    def put(self, archive_path: str, listing: List[Dict[str, Any]], persist: bool = True) -> None:
+        """Cache a listing; persist=False keeps it out of the disk cache"""
+        if not listing:
+            return
+        try:
+            key = listing_key(archive_path)
+        except OSError:
+            return
+        with self._lock:
+            self._remember(key, listing)
+        if persist and self.cache_dir:
+            self._save_to_disk(key, listing)
+
+    def clear(self) -> None:
+        """Drop all in-memory listings and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory use"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries), 'bytes': self._bytes}
+
+
+_shared_cache: Optional[ListingCache] = None
+_shared_lock = Lock()
+
+
+def get_listing_cache() -> ListingCache:
+    """Process-wide listing cache shared by all browse threads"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ListingCache()
+        return _shared_cache
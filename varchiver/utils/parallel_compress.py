@@ -0,0 +1,142 @@
+"""Block-parallel compressed stream writer (pigz-style).
+
+Data written to :class:`ParallelCompressedWriter` is cut into fixed-size
+blocks, each block is compressed on a thread pool as an independent gzip
+member / bzip2 stream / xz stream / zstd frame, and the results are written
+to the output in order. Standard decompressors (gzip, bzip2, xz, zstd and
+Python's tarfile) read concatenated members as one continuous stream.
+
+Because every block is self-contained, the writer also records where each
+block starts in both the uncompressed and compressed stream, which gives
+free random-access seek points for archives we create ourselves.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Archive extension -> codec name
+TAR_CODECS = {
+    '.tar.gz': 'gz',
+    '.tgz': 'gz',
+    '.tar.bz2': 'bz2',
+    '.tar.xz': 'xz',
+    '.tar.zst': 'zst',
+}
+
+
+def _compress_block(codec: str, level: int, data: bytes) -> bytes:
+    """Compress one block as a self-contained member of the given codec"""
+    if codec == 'gz':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if codec == 'bz2':
+        return bz2.compress(data, max(1, level))
+    if codec == 'xz':
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=level)
+    if codec == 'zst':
+        return zstandard.ZstdCompressor(level=max(1, level)).compress(data)
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+class ParallelCompressedWriter(io.RawIOBase):
+    """Writable binary stream that compresses fixed-size blocks in parallel
+
+    Args:
+        path: Output file path
+        codec: One of 'gz', 'bz2', 'xz' or 'zst'
+        level: Compression level 0-9
+        workers: Number of compression threads (defaults to CPU count)
+        block_size: Uncompressed bytes per independently compressed block
+    """
+
+    def __init__(self, path: str, codec: str = 'gz', level: int = 6,
+                 workers: Optional[int] = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        super().__init__()
+        if codec not in ('gz', 'bz2', 'xz', 'zst'):
+            raise ValueError(f"Unsupported codec: {codec}")
+        if codec == 'zst' and not ZSTD_AVAILABLE:
+            raise Exception("zstd output requires the 'zstandard' package")
+        self.codec = codec
+        self.level = level
+        self.workers = workers or max(1, os.cpu_count() or 1)
+        self.block_size = block_size
+        self.bytes_in = 0  # Uncompressed bytes accepted
+        self.bytes_out = 0  # Compressed bytes written
+        # (uncompressed offset, compressed offset) of every block start
+        self.seek_points: List[Tuple[int, int]] = []
+        self._out = open(path, 'wb')
+        self._buffer = bytearray()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending = deque()
+        self._block_start = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed file")
+        self._buffer += data
+        self.bytes_in += len(data)
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.bytes_in
+
+    def _submit(self, block: bytes) -> None:
+        """Queue a block for compression, writing finished blocks as the queue fills"""
+        future = self._pool.submit(_compress_block, self.codec, self.level, block)
+        self._pending.append((self._block_start, future))
+        self._block_start += len(block)
+        while self._pending and (len(self._pending) > self.workers * 2 or self._pending[0][1].done()):
+            self._write_next()
+
+    def _write_next(self) -> None:
+        """Write the oldest compressed block to the output"""
+        uncompressed_offset, future = self._pending.popleft()
+        payload = future.result()
+        self.seek_points.append((uncompressed_offset, self.bytes_out))
+        self._out.write(payload)
+        self.bytes_out += len(payload)
+
+    def abort(self) -> None:
+        """Discard queued blocks and close the output file"""
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+        self._out.close()
+        super().close()
+
+    def close(self) -> None:
+        """Compress the final partial block and flush everything to disk"""
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self.seek_points and not self._pending:
+                # An empty stream still gets one (empty) member so it stays valid
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._write_next()
+        finally:
+            self._pool.shutdown(wait=True)
+            self._out.close()
+            super().close()
@@ -0,0 +1,266 @@
+"""Parallel ZIP extraction and verification.
+
+ZIP members are compressed independently, so they can be inflated in any
+order. Members are grouped into batches of roughly equal compressed size and
+the batches are extracted (or read through to check their CRCs) on a
+process pool (inflate and CRC checking are CPU-bound and hold the GIL for
+small members). Each worker process opens its own ``ZipFile`` handle once
+and reuses it for every batch it receives; small jobs run in the calling
+thread on a handle of their own.
+"""
+
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from .hash_manifest import new_digest
+from .parallel_zip import default_workers, READ_CHUNK_SIZE
+
+DEFAULT_BATCH_BYTES = 32 * 1024 * 1024
+# Below this much compressed data, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 16 * 1024 * 1024
+
+_worker_archives: Dict[str, zipfile.ZipFile] = {}
+
+
+def member_mode(info: zipfile.ZipInfo) -> int:
+    """Unix permission bits stored in a member's external attributes"""
+    return (info.external_attr >> 16) & 0o777
+
+
+def partition_members(infos: List[zipfile.ZipInfo],
+                      batch_bytes: int = DEFAULT_BATCH_BYTES) -> List[List[zipfile.ZipInfo]]:
+    """Group members into batches of about batch_bytes compressed data each
+
+    The largest members come first so long-running batches start early and
+    the pool finishes evenly. Members bigger than batch_bytes get a batch of
+    their own.
+    """
+    batches = []
+    current, current_bytes = [], 0
+    for info in sorted(infos, key=lambda i: i.compress_size, reverse=True):
+        current.append(info)
+        current_bytes += info.compress_size
+        if current_bytes >= batch_bytes:
+            batches.append(current)
+            current, current_bytes = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _open_worker_archive(archive_path: str, password: Optional[bytes]) -> zipfile.ZipFile:
+    """This worker process's handle on archive_path, opened on first use"""
+    archive = _worker_archives.get(archive_path)
+    if archive is None:
+        archive = zipfile.ZipFile(archive_path, 'r')
+        if password:
+            archive.setpassword(password)
+        _worker_archives[archive_path] = archive
+    return archive
+
+
+def _in_worker(task, archive_path: str, password: Optional[bytes], names: List[str], *args):
+    """Run task on a pool worker's cached handle for archive_path"""
+    return task(_open_worker_archive(archive_path, password), names, *args)
+
+
+def _extract_batch(archive: zipfile.ZipFile, names: List[str], extract_path: str,
+                   preserve_permissions: bool):
+    """Extract one batch of members; returns (uncompressed bytes, [(name, error)])"""
+    done = 0
+    errors = []
+    for name in names:
+        try:
+            info = archive.getinfo(name)
+            target = archive.extract(info, extract_path)
+            if preserve_permissions:
+                mode = member_mode(info)
+                if mode:
+                    os.chmod(target, mode)
+            done += info.file_size
+        except Exception as e:
+            errors.append((name, str(e)))
+    return done, errors
+
+
+def _verify_batch(archive: zipfile.ZipFile, names: List[str], digests: bool):
+    """Read one batch of members through, which checks their CRCs
+
+    Returns (uncompressed bytes, [(name, error)], {name: digest} when digests).
+    """
+    done = 0
+    errors = []
+    found = {}
+    for name in names:
+        digest = new_digest() if digests else None
+        try:
+            with archive.open(name) as f:
+                while True:
+                    chunk = f.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    done += len(chunk)
+                    if digest:
+                        digest.update(chunk)
+        except Exception as e:
+            errors.append((name, str(e)))
+            continue
+        if digest:
+            found[name] = digest.hexdigest()
+    return done, errors, found
+
+
+def _run_batches(archive_path: str, password: Optional[bytes], batches, task, args: tuple,
+                 workers: int, compressed: int, on_result: Callable,
+                 cancel_check: Optional[Callable[[], bool]]) -> None:
+    """Run task(archive, names, *args) for every batch, on a process pool when worthwhile
+
+    on_result is called with each batch's result in the calling thread. The
+    serial path opens its own ZipFile for this call only, so concurrent jobs
+    in one process never share (or close) each other's handle.
+    """
+    if workers <= 1 or compressed < PARALLEL_THRESHOLD or len(batches) <= 1:
+        with zipfile.ZipFile(archive_path, 'r') as archive:
+            if password:
+                archive.setpassword(password)
+            for batch in batches:
+                if cancel_check and cancel_check():
+                    break
+                on_result(task(archive, [i.filename for i in batch], *args))
+        return
+
+    def submit(batch):
+        return pool.submit(_in_worker, task, archive_path, password,
+                           [i.filename for i in batch], *args)
+
+    # spawn rather than fork: the caller is usually a thread inside a Qt process.
+    # Frozen builds need multiprocessing.freeze_support() in their entry point.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=context) as pool:
+        pending = set()
+        queue = iter(batches)
+        # Keep a bounded number of batches queued so cancellation takes effect quickly
+        for batch in queue:
+            pending.add(submit(batch))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if not future.cancelled():
+                    on_result(future.result())
+            if cancel_check and cancel_check():
+                for future in pending:
+                    future.cancel()
+                continue
+            for batch in queue:
+                pending.add(submit(batch))
+                if len(pending) >= workers * 2:
+                    break
+
+
+def _plan(files: List[zipfile.ZipInfo], workers: int, batch_bytes: int):
+    """(batches, compressed bytes) for files"""
+    compressed = sum(info.compress_size for info in files)
+    # Aim for several batches per worker so a few large members don't leave workers idle
+    batch_bytes = min(batch_bytes, max(1024 * 1024, compressed // (workers * 4)))
+    return partition_members(files, batch_bytes), compressed
+
+
+def extract_zip_parallel(archive_path: str, extract_path: str,
+                         members: Optional[List[str]] = None,
+                         password: Optional[str] = None,
+                         preserve_permissions: bool = True,
+                         workers: Optional[int] = None,
+                         batch_bytes: int = DEFAULT_BATCH_BYTES,
+                         progress_callback: Optional[Callable[[int, int], None]] = None,
+                         cancel_check: Optional[Callable[[], bool]] = None) -> dict:
+    """Extract ZIP members on a process pool
+
+    Args:
+        archive_path: ZIP archive to read
+        extract_path: Destination directory
+        members: Member names to extract (defaults to every member)
+        password: Password for encrypted members
+        preserve_permissions: Apply the Unix mode stored in each member
+        workers: Number of worker processes (defaults to CPU count)
+        batch_bytes: Compressed bytes per unit of work
+        progress_callback: Called with (uncompressed bytes done, total bytes)
+        cancel_check: Returns True to stop submitting further batches
+
+    Returns:
+        dict with 'files', 'bytes' and 'errors' ([(name, message)])
+    """
+    workers = workers or default_workers()
+    pwd = password.encode() if password else None
+
+    # Directories first, in the parent process, so workers never race on them.
+    # ZipFile.extract strips '..' and absolute prefixes, as it does for files.
+    files = []
+    with zipfile.ZipFile(archive_path, 'r') as archive:
+        infos = archive.infolist() if members is None else [archive.getinfo(m) for m in members]
+        for info in infos:
+            if info.is_dir():
+                archive.extract(info, extract_path)
+            else:
+                files.append(info)
+
+    total = sum(info.file_size for info in files)
+    result = {'files': len(files), 'bytes': 0, 'errors': []}
+
+    def on_result(batch_result):
+        batch_done, batch_errors = batch_result
+        result['bytes'] += batch_done
+        result['errors'].extend(batch_errors)
+        if progress_callback:
+            progress_callback(result['bytes'], total)
+
+    batches, compressed = _plan(files, workers, batch_bytes)
+    _run_batches(archive_path, pwd, batches, _extract_batch, (extract_path, preserve_permissions),
+                 workers, compressed, on_result, cancel_check)
+    return result
+
+
+def verify_zip_parallel(archive_path: str, password: Optional[str] = None,
+                        workers: Optional[int] = None, digests: bool = False,
+                        batch_bytes: int = DEFAULT_BATCH_BYTES,
+                        progress_callback: Optional[Callable[[int, int], None]] = None,
+                        cancel_check: Optional[Callable[[], bool]] = None) -> dict:
+    """Read every ZIP member through on a process pool, checking its CRC32
+
+    Args:
+        archive_path: ZIP archive to check
+        password: Password for encrypted members
+        workers: Number of worker processes (defaults to CPU count)
+        digests: Also hash each member's contents (see hash_manifest)
+        batch_bytes: Compressed bytes per unit of work
+        progress_callback: Called with (uncompressed bytes done, total bytes)
+        cancel_check: Returns True to stop submitting further batches
+
+    Returns:
+        dict with 'files', 'bytes', 'errors' ([(name, message)]) and, with
+        digests, 'digests' ({name: hex digest} for members read without error)
+    """
+    workers = workers or default_workers()
+    pwd = password.encode() if password else None
+    with zipfile.ZipFile(archive_path, 'r') as archive:
+        files = [info for info in archive.infolist() if not info.is_dir()]
+
+    total = sum(info.file_size for info in files)
+    result = {'files': len(files), 'bytes': 0, 'errors': [], 'digests': {}}
+
+    def on_result(batch_result):
+        batch_done, batch_errors, found = batch_result
+        result['bytes'] += batch_done
+        result['errors'].extend(batch_errors)
+        result['digests'].update(found)
+        if progress_callback:
+            progress_callback(result['bytes'], total)
+
+    batches, compressed = _plan(files, workers, batch_bytes)
+    _run_batches(archive_path, pwd, batches, _verify_batch, (digests,),
+                 workers, compressed, on_result, cancel_check)
+    return result
@@ -0,0 +1,150 @@
+"""Parallel ZIP writer.
+
+Members are deflated on a thread pool (zlib releases the GIL while
+compressing) and the finished raw deflate streams are appended to a regular
+``zipfile.ZipFile`` in submission order, so the result is a standard ZIP with
+a normal central directory.
+"""
+
+import os
+import zlib
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def default_workers() -> int:
+    """Number of compression workers to use when none is requested"""
+    return max(1, os.cpu_count() or 1)
+
+
+def _compress_file(src_path: str, level: int):
+    """Compress a file to a raw deflate stream; returns (payload, crc, size)"""
+    crc = 0
+    size = 0
+    chunks = []
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if level > 0 else None
+    with open(src_path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        chunks.append(compressor.flush())
+    return b''.join(chunks), crc, size
+
+
+class ParallelZipWriter:
+    """Write a ZIP archive while compressing members on a worker pool
+
+    Args:
+        archive_name: Path of the ZIP file to create
+        compression_level: zlib level 0-9 (0 stores members uncompressed)
+        workers: Number of compression threads (defaults to CPU count)
+        max_inflight_bytes: Upper bound on source bytes queued for compression,
+            which bounds memory held by finished-but-unwritten members
+        large_file_threshold: Files larger than this are streamed through
+            ``ZipFile.write`` on the calling thread instead of being buffered
+        on_written: Called with each ``ZipInfo`` once it lands in the archive
+    """
+
+    def __init__(self, archive_name: str, compression_level: int = 5,
+                 workers: Optional[int] = None,
+                 max_inflight_bytes: int = 256 * 1024 * 1024,
+                 large_file_threshold: int = 64 * 1024 * 1024,
+                 on_written: Optional[Callable[[zipfile.ZipInfo], None]] = None):
+        self.compression_level = compression_level
+        self.workers = workers or default_workers()
+        self.max_inflight_bytes = max_inflight_bytes
+        self.large_file_threshold = large_file_threshold
+        self.on_written = on_written
+        self._compress_type = zipfile.ZIP_DEFLATED if compression_level > 0 else zipfile.ZIP_STORED
+        self._zip = zipfile.ZipFile(archive_name, 'w', compression=self._compress_type,
+                                    compresslevel=compression_level if compression_level > 0 else None)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending = deque()  # (zinfo, future, source size) in submission order
+        self._inflight_bytes = 0
+
+    def add(self, src_path: str, arcname: str) -> None:
+        """Queue a file for compression under arcname"""
+        zinfo = zipfile.ZipInfo.from_file(src_path, arcname)
+        zinfo.compress_type = self._compress_type
+        size = zinfo.file_size
+
+        if size > self.large_file_threshold:
+            # Keep ordering: everything queued before this file goes first
+            self._drain()
+            self._zip.write(src_path, arcname)
+            if self.on_written:
+                self.on_written(self._zip.getinfo(arcname))
+            return
+
+        future = self._pool.submit(_compress_file, src_path, self.compression_level)
+        self._pending.append((zinfo, future, size))
+        self._inflight_bytes += size
+
+        while self._pending and (self._inflight_bytes > self.max_inflight_bytes or
+                                 len(self._pending) > self.workers * 4):
+            self._write_next()
+
+    def _write_next(self) -> None:
+        """Wait for the oldest queued member and append it to the archive"""
+        zinfo, future, size = self._pending.popleft()
+        self._inflight_bytes -= size
+        payload, crc, file_size = future.result()
+        self._write_precompressed(zinfo, payload, crc, file_size)
+        if self.on_written:
+            self.on_written(zinfo)
+
+    def _write_precompressed(self, zinfo: zipfile.ZipInfo, payload: bytes,
+                             crc: int, file_size: int) -> None:
+        """Append an already-compressed member, mirroring ZipFile's own bookkeeping"""
+        zf = self._zip
+        zinfo.CRC = crc
+        zinfo.file_size = file_size
+        zinfo.compress_size = len(payload)
+        zip64 = file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(payload)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+    def _drain(self) -> None:
+        """Write every queued member"""
+        while self._pending:
+            self._write_next()
+
+    def abort(self) -> None:
+        """Drop queued work and close the archive without writing pending members"""
+        for _, future, _ in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+        self._zip.close()
+
+    def close(self) -> None:
+        """Flush queued members and write the central directory"""
+        try:
+            self._drain()
+        finally:
+            self._pool.shutdown(wait=True)
+            self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
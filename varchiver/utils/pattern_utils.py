@@ -1,8 +1,10 @@
 """Pattern matching utilities for file and path matching."""
 
 import fnmatch
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, List, Optional, Set, Tuple
 
 def should_skip_file(filepath: str, skip_patterns: List[str]) -> bool:
     """
@@ -32,6 +34,105 @@ def should_skip_file(filepath: str, skip_patterns: List[str]) -> bool:
                 return True
     return False
 
+_GLOB_CHARS = set('*?[')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Regex source for a glob, without fnmatch's anchoring wrapper"""
+    regex = fnmatch.translate(pattern)
+    if regex.startswith('(?s:') and regex.endswith(')\\Z'):
+        return regex[4:-3]
+    return regex
+
+
+class SkipMatcher:
+    """Skip patterns compiled once for fast repeated matching
+
+    Patterns are sorted into three buckets when the matcher is built:
+
+    * plain names (``node_modules``, ``**/.git/**``, ``**/.DS_Store``) go into a
+      set and match any path component,
+    * ``*.ext`` patterns (``*.pyc``, ``**/*.log``) go into a suffix tuple and
+      match the file name,
+    * anything else is translated to a regex; all of them are joined into one
+      alternation that matches at any component boundary, with ``dir/**``
+      patterns also matching everything below the directory.
+
+    Matching is case-insensitive and accepts either path separator.
+    """
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None):
+        names = set()
+        extensions = set()
+        file_regexes = []
+        dir_regexes = []
+        for pattern in patterns or []:
+            pattern = pattern.strip().replace('\\', '/')
+            if not pattern:
+                continue
+            body = pattern[3:] if pattern.startswith('**/') else pattern
+            is_dir = body.endswith('/**')
+            if is_dir:
+                body = body[:-3]
+            body = body.rstrip('/')
+            if not body:
+                continue
+            if '/' not in body and not _GLOB_CHARS & set(body):
+                names.add(body.lower())
+            elif (not is_dir and body.startswith('*.') and '/' not in body
+                  and not _GLOB_CHARS & set(body[1:])):
+                extensions.add(body[1:].lower())
+            elif is_dir:
+                dir_regexes.append(_glob_to_regex(body))
+            else:
+                file_regexes.append(_glob_to_regex(body))
+
+        self.patterns = list(patterns or [])
+        self._names = frozenset(names)
+        self._extensions: Tuple[str, ...] = tuple(sorted(extensions))
+        alternatives = [f'(?:{r})' for r in file_regexes]
+        alternatives += [f'(?:{r})(?:/.*)?' for r in dir_regexes]
+        self._regex = (re.compile(r'(?:^|/)(?:' + '|'.join(alternatives) + r')\Z',
+                                  re.IGNORECASE | re.DOTALL) if alternatives else None)
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[str], extra_patterns: Optional[Iterable[str]] = None) -> 'SkipMatcher':
+        """Build a matcher from DEFAULT_SKIP_PATTERNS group names plus extra patterns"""
+        from .constants import DEFAULT_SKIP_PATTERNS
+        patterns = [p for group in groups for p in DEFAULT_SKIP_PATTERNS.get(group, [])]
+        patterns.extend(extra_patterns or [])
+        return cls(patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self._names or self._extensions or self._regex)
+
+    def match(self, path: str) -> bool:
+        """Whether a file path should be skipped"""
+        path = str(path).replace('\\', '/').rstrip('/').lower()
+        if self._names and not self._names.isdisjoint(path.split('/')):
+            return True
+        if self._extensions and path.endswith(self._extensions):
+            return True
+        return bool(self._regex and self._regex.search(path))
+
+    def match_dir(self, path: str) -> bool:
+        """Whether a directory and everything below it should be skipped"""
+        path = str(path).replace('\\', '/').rstrip('/').lower()
+        if self._names and not self._names.isdisjoint(path.split('/')):
+            return True
+        return bool(self._regex and self._regex.search(path))
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(patterns: Tuple[str, ...]) -> SkipMatcher:
+    return SkipMatcher(patterns)
+
+
+def get_skip_matcher(patterns: Optional[Iterable[str]]) -> SkipMatcher:
+    """Shared compiled matcher for a list of patterns"""
+    return _cached_matcher(tuple(patterns or ()))
+
+
 def read_pattern_file(file_path: str, ignore_comments: bool = True) -> Set[str]:
     """
     Read patterns from a file (like .gitignore or .gitattributes).
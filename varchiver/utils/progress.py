@@ -0,0 +1,225 @@
+"""Byte-based, rate-limited progress reporting for long-running jobs.
+
+Jobs used to emit progress and status for every file. Each emit from a
+worker thread becomes a queued event on the GUI thread, so on 100k small
+files delivering them cost more than the I/O did, and percentages counted
+files, so one 10 GB file looked stuck at the same number for minutes.
+
+A ``ProgressReporter`` is told how many bytes (and files) are done, from
+any number of threads, and calls its callbacks at most once per
+``interval`` (20 times a second by default). The percentage is by bytes
+when the total is known, by files otherwise, and the status line carries
+the throughput over the last few seconds and the time left.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from .archive_utils import format_size
+
+DEFAULT_INTERVAL = 0.05  # Seconds between reports, ~20 Hz
+RATE_WINDOW = 5.0  # Seconds of history the throughput is averaged over
+
+
+def format_duration(seconds: float) -> str:
+    """0:42, 12:05 or 3:07:19"""
+    seconds = int(seconds + 0.5)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressReporter:
+    """Aggregates bytes and files done and reports them at a bounded rate
+
+    progress_callback(int) gets a 0-100 percentage and status_callback(str)
+    a line like "Adding to src: 1,234/100,000 files, 12.3 MB of 1.2 GB,
+    45.6 MB/s, 0:23 left". Neither is called more than once per interval,
+    and neither is called with a value it was already given.
+
+    Totals can grow while work is under way (add_total, for a scan that
+    streams into the writer); no percentage is reported until set_total
+    says they are final.
+    """
+
+    def __init__(self, progress_callback: Optional[Callable[[int], None]] = None,
+                 status_callback: Optional[Callable[[str], None]] = None,
+                 label: str = "Processing", total_bytes: int = 0, total_files: int = 0,
+                 totals_known: bool = True, interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.progress_callback = progress_callback
+        self.status_callback = status_callback
+        self.label = label
+        self.interval = DEFAULT_INTERVAL if interval is None else interval
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.totals_known = totals_known
+        self.bytes_done = 0
+        self.files_done = 0
+        self.current = None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self._last_report = float('-inf')
+        self._last_percent = None
+        self._last_status = None
+        self._samples = deque([(self.started, 0, 0)])  # (time, bytes, files)
+        self._rate = (0.0, 0.0)  # bytes/s, files/s
+
+    # Counting
+
+    def add_total(self, nbytes: int = 0, files: int = 0) -> None:
+        """Grow the totals, e.g. as a scan finds more files"""
+        with self._lock:
+            self.total_bytes += nbytes
+            self.total_files += files
+
+    def set_total(self, nbytes: Optional[int] = None, files: Optional[int] = None) -> None:
+        """Fix the totals (by default at what add_total counted) and allow percentages"""
+        with self._lock:
+            if nbytes is not None:
+                self.total_bytes = nbytes
+            if files is not None:
+                self.total_files = files
+            self.totals_known = True
+
+    def advance(self, nbytes: int = 0, files: int = 1, current: Optional[str] = None) -> None:
+        """Count nbytes and files more as done; reports if the interval has passed"""
+        with self._lock:
+            self.bytes_done += nbytes
+            self.files_done += files
+            if current is not None:
+                self.current = current
+            report = self._due()
+        if report:
+            self._deliver(*report)
+
+    def update(self, bytes_done: Optional[int] = None, files_done: Optional[int] = None,
+               current: Optional[str] = None) -> None:
+        """Set the amount done outright, for work that reports a position"""
+        with self._lock:
+            if bytes_done is not None:
+                self.bytes_done = bytes_done
+            if files_done is not None:
+                self.files_done = files_done
+            if current is not None:
+                self.current = current
+            report = self._due()
+        if report:
+            self._deliver(*report)
+
+    def finish(self) -> None:
+        """Report the final numbers now, whatever the interval"""
+        with self._lock:
+            report = self._due(force=True)
+        self._deliver(*report)
+
+    # Figures
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    @property
+    def percent(self) -> Optional[int]:
+        """Percentage done by bytes (by files if there are none), or None while totals may grow"""
+        if not self.totals_known:
+            return None
+        if self.total_bytes:
+            return min(100, int(self.bytes_done * 100 / self.total_bytes))
+        if self.total_files:
+            return min(100, int(self.files_done * 100 / self.total_files))
+        return None
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second over the last RATE_WINDOW seconds, as of the last report"""
+        return self._rate[0]
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current rate, or None if that can't be told yet"""
+        if not self.totals_known:
+            return None
+        byte_rate, file_rate = self._rate
+        if self.total_bytes and byte_rate > 0:
+            return max(0.0, (self.total_bytes - self.bytes_done) / byte_rate)
+        if not self.total_bytes and self.total_files and file_rate > 0:
+            return max(0.0, (self.total_files - self.files_done) / file_rate)
+        return None
+
+    def summary(self) -> str:
+        """e.g. "100,000 files, 1.2 GB in 12.3s (98.0 MB/s)" over the whole run"""
+        elapsed = self.elapsed
+        text = f"{self.files_done:,} files, {format_size(self.bytes_done)} in {elapsed:.1f}s"
+        if elapsed > 0 and self.bytes_done:
+            text += f" ({format_size(int(self.bytes_done / elapsed))}/s)"
+        return text
+
+    def format_status(self) -> str:
+        """The status line for the current figures"""
+        parts = []
+        if self.files_done or self.total_files:
+            files = f"{self.files_done:,}"
+            if self.totals_known and self.total_files:
+                files += f"/{self.total_files:,}"
+            parts.append(f"{files} files")
+        if self.bytes_done or self.total_bytes:
+            size = format_size(self.bytes_done)
+            if self.totals_known and self.total_bytes:
+                size += f" of {format_size(self.total_bytes)}"
+            parts.append(size)
+        byte_rate, file_rate = self._rate
+        if byte_rate > 0:
+            parts.append(f"{format_size(int(byte_rate))}/s")
+        elif file_rate > 0:
+            parts.append(f"{file_rate:,.0f} files/s")
+        eta = self.eta
+        if eta is not None and self.percent != 100:
+            parts.append(f"{format_duration(eta)} left")
+        text = f"{self.label} {self.current}" if self.current else self.label
+        return f"{text}: {', '.join(parts)}" if parts else text
+
+    # Reporting
+
+    def _due(self, force: bool = False):
+        """Under the lock: (percent, status) to deliver, or None inside the interval
+
+        Either value is None when it has not changed since the last report.
+        """
+        now = self._clock()
+        if not force and now - self._last_report < self.interval:
+            return None
+        self._last_report = now
+
+        samples = self._samples
+        samples.append((now, self.bytes_done, self.files_done))
+        while len(samples) > 2 and now - samples[0][0] > RATE_WINDOW:
+            samples.popleft()
+        then, bytes_then, files_then = samples[0]
+        if now > then:
+            self._rate = (max(0.0, (self.bytes_done - bytes_then) / (now - then)),
+                          max(0.0, (self.files_done - files_then) / (now - then)))
+
+        percent = self.percent
+        if percent == self._last_percent:
+            percent = None
+        else:
+            self._last_percent = percent
+        status = self.format_status()
+        if status == self._last_status:
+            status = None
+        else:
+            self._last_status = status
+        return percent, status
+
+    def _deliver(self, percent, status) -> None:
+        # Outside the lock, so a slow callback holds up only its own thread
+        if percent is not None and self.progress_callback:
+            self.progress_callback(percent)
+        if status is not None and self.status_callback:
+            self.status_callback(status)
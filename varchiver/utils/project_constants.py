@@ -155,6 +155,8 @@ ARCHIVE_EXTENSIONS = {
     "Gzipped TAR Archives (*.tar.gz)": ".tar.gz",
     "TGZ Archives (*.tgz)": ".tgz",
     "Bzip2 TAR Archives (*.tar.bz2)": ".tar.bz2",
+    "XZ TAR Archives (*.tar.xz)": ".tar.xz",
+    "Zstandard TAR Archives (*.tar.zst)": ".tar.zst",
     "7z Archives (*.7z)": ".7z",
     "RAR Archives (*.rar)": ".rar"
 }
\ No newline at end of file
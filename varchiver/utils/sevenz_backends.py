@@ -0,0 +1,421 @@
+"""Backends that read 7z archives for SevenZipHandler.
+
+Listing and reading members can go through one of three backends:
+
+* ``cli`` runs the ``7z`` tool, one process per operation. It is always
+  used for writing and batch extraction, and is the fallback when no
+  in-process backend is importable.
+* ``libarchive`` (the ``libarchive-c`` package) lists and streams members
+  in-process, with no fork/exec per archive.
+* ``py7zr`` lists members in-process.
+
+The backend is chosen per handler, then by ``set_default_backend``, then by
+the ``VARCHIVER_7Z_BACKEND`` environment variable, and is ``cli`` when none
+of those names one: the in-process backends are opt-in. ``auto`` prefers an
+in-process backend when one is importable. Whether the ``7z`` tool works is
+checked once per process rather than once per handler.
+"""
+
+import functools
+import importlib
+import importlib.util
+import io
+import os
+import re
+import subprocess
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional
+
+# The in-process backends are only imported when a handler first uses them:
+# importing py7zr costs more than listing a ZIP from the command line does
+LIBARCHIVE_AVAILABLE = importlib.util.find_spec('libarchive') is not None
+PY7ZR_AVAILABLE = importlib.util.find_spec('py7zr') is not None
+
+
+def _optional_module(name):
+    """Import libarchive or py7zr, keeping it as a module attribute"""
+    module = importlib.import_module(name)
+    globals()[name] = module
+    return module
+
+
+def __getattr__(name):
+    if name in ('libarchive', 'py7zr'):
+        return _optional_module(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+BACKEND_ENV = 'VARCHIVER_7Z_BACKEND'
+
+# Read buffer for streamed members
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+_UNIX_MODE_RE = re.compile(r'[-dlcbps][-r][-w][-xsS][-r][-w][-xsS][-r][-w][-xtT]')
+
+
+def _parse_7z_time(value: str) -> float:
+    """Epoch seconds for a 7z 'YYYY-MM-DD HH:MM:SS[.fraction]' timestamp, 0 if absent"""
+    from datetime import datetime
+    try:
+        seconds = datetime.strptime(value[:19], '%Y-%m-%d %H:%M:%S').timestamp()
+    except (TypeError, ValueError):
+        return 0
+    fraction = value[20:] if value[19:20] == '.' else ''
+    return seconds + (int(fraction) / 10 ** len(fraction) if fraction.isdigit() else 0)
+
+
+def _mode_from_string(perms: str) -> int:
+    """Permission bits from an ls-style string such as '-rwxr-xr-x'"""
+    mode = 0
+    for i, ch in enumerate(perms[1:10]):
+        if ch not in '-ST':
+            mode |= 1 << (8 - i)
+    return mode
+
+
+def parse_slt_listing(output: str) -> List[Dict[str, Any]]:
+    """Parse the technical listing printed by '7z l -slt -ba'
+
+    Each member is a block of 'Key = Value' lines separated by blank lines.
+    Values are taken verbatim after the first ' = ', so paths containing
+    spaces (or ' = ') are kept intact.
+    """
+    # Without -ba, archive properties come first, ending at a '----------' line
+    if '\n----------\n' in output:
+        output = output.split('\n----------\n', 1)[1]
+
+    entries = []
+    for block in re.split(r'\r?\n\s*\r?\n', output):
+        fields = {}
+        for line in block.splitlines():
+            key, sep, value = line.partition(' = ')
+            if sep:
+                fields[key.strip()] = value
+            elif line.endswith(' ='):
+                fields[line[:-2].strip()] = ''
+        path = fields.get('Path')
+        if not path:
+            continue
+
+        path = path.replace('\\', '/')
+        attributes = fields.get('Attributes', '')
+        is_dir = fields.get('Folder') == '+' or path.endswith('/') or attributes.startswith('D')
+        path = path.rstrip('/')
+        try:
+            size = int(fields.get('Size') or 0)
+        except ValueError:
+            size = 0
+        try:
+            packed = int(fields.get('Packed Size') or 0)
+        except ValueError:
+            packed = 0
+        modified = fields.get('Modified', '')
+
+        entry = {
+            'path': path,
+            'name': os.path.basename(path),
+            'size': size,
+            'compressed_size': packed,
+            'modified': modified[:19],
+            'mtime': _parse_7z_time(modified),
+            'attributes': attributes,
+            'crc': fields.get('CRC', ''),
+            'method': fields.get('Method', ''),
+            'encrypted': fields.get('Encrypted') == '+',
+            'is_dir': is_dir,
+        }
+        unix_mode = _UNIX_MODE_RE.search(attributes)
+        if unix_mode:
+            entry['mode'] = _mode_from_string(unix_mode.group(0))
+        entries.append(entry)
+    return entries
+
+
+def raise_7z_error(stderr: str, archive_path: str) -> None:
+    """Raise the exception matching a failed 7z run's stderr"""
+    stderr = stderr.strip()
+    if 'Wrong password' in stderr or 'password is incorrect' in stderr:
+        raise Exception("Incorrect password")
+    elif 'No such file or directory' in stderr:
+        raise FileNotFoundError(f"Archive not found: {archive_path}")
+    elif stderr:
+        raise Exception(f"7z command failed: {stderr}")
+    else:
+        raise Exception("Unknown 7z error")
+
+
+@functools.lru_cache(maxsize=None)
+def check_7z_cli() -> Optional[str]:
+    """Why the 7z tool cannot be used, or None if it works; run once per process"""
+    try:
+        result = subprocess.run(['7z', '--help'], capture_output=True, text=True,
+                                stdin=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return "7z command not found. Please install p7zip."
+    if result.returncode != 0:
+        return "7z command is not working properly"
+    return None
+
+
+class SevenZipMemberReader(io.RawIOBase):
+    """Raw binary stream over the stdout of a '7z e -so' process"""
+
+    def __init__(self, proc: subprocess.Popen, stderr_file, name: str, size: int,
+                 raise_error=None):
+        self._proc = proc
+        self._stderr_file = stderr_file
+        self._raise_error = raise_error
+        self.name = name
+        self.size = size
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._finished:
+            return 0
+        count = self._proc.stdout.readinto(buffer)
+        if not count:
+            self._finish()
+        return count or 0
+
+    def _finish(self) -> None:
+        """Reap 7z at end of stream and surface its error, if any"""
+        self._finished = True
+        self._proc.wait()
+        if self._proc.returncode != 0:
+            self._stderr_file.seek(0)
+            stderr = self._stderr_file.read().decode(errors='replace')
+            if self._raise_error:
+                self._raise_error(stderr)
+            raise Exception(f"Failed to extract file: {stderr.strip()}")
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._proc.poll() is None:
+                self._proc.kill()
+            self._proc.wait()
+            self._proc.stdout.close()
+            self._stderr_file.close()
+        finally:
+            super().close()
+
+
+class IterStream(io.RawIOBase):
+    """Raw binary stream over an iterator of byte blocks"""
+
+    def __init__(self, blocks: Iterator[bytes]):
+        self._blocks = blocks
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = bytes(next(self._blocks))
+            except StopIteration:
+                return 0
+        count = min(len(buffer), len(self._pending))
+        buffer[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            close = getattr(self._blocks, 'close', None)
+            if close:
+                close()
+        super().close()
+
+
+class SevenZipBackend:
+    """Lists and reads 7z archives; subclasses implement one library or tool"""
+
+    name = ''
+    in_process = False
+
+    def list_entries(self, archive_path: str, password: Optional[str]) -> List[Dict[str, Any]]:
+        """Listing entries in the same shape parse_slt_listing produces"""
+        raise NotImplementedError
+
+    def open_member(self, archive_path: str, name: str, size: int,
+                    password: Optional[str]) -> Optional[io.BufferedIOBase]:
+        """Binary file object for one member, or None to use the 7z tool instead"""
+        return None
+
+
+class CliBackend(SevenZipBackend):
+    """The 7z command-line tool"""
+
+    name = 'cli'
+
+    def list_entries(self, archive_path, password):
+        cmd = ['7z', 'l', '-slt', '-ba', '-sccUTF-8']
+        if password:
+            cmd.append('-p' + password)
+        cmd.append(archive_path)
+
+        # stdin is closed so an encrypted header fails instead of prompting
+        result = subprocess.run(cmd, capture_output=True, stdin=subprocess.DEVNULL)
+        stdout = result.stdout.decode('utf-8', errors='replace')
+        stderr = result.stderr.decode('utf-8', errors='replace').strip()
+        if result.returncode != 0:
+            if 'Wrong password' in stderr or 'password is incorrect' in stderr:
+                raise Exception("Incorrect password")
+            elif 'Can not open' in stderr:
+                raise FileNotFoundError(f"Cannot open archive: {archive_path}")
+            raise Exception(f"Error reading archive: {stderr or 'unknown 7z error'}")
+        return parse_slt_listing(stdout)
+
+    def open_member(self, archive_path, name, size, password):
+        cmd = ['7z', 'e', '-so', '-bd', '-spd', '-scsUTF-8']
+        if password:
+            cmd.append('-p' + password)
+        cmd.extend([archive_path, name])
+        stderr_file = tempfile.TemporaryFile()
+        try:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=stderr_file)
+        except Exception:
+            stderr_file.close()
+            raise
+        reader = SevenZipMemberReader(proc, stderr_file, name, size,
+                                      lambda stderr: raise_7z_error(stderr, archive_path))
+        return io.BufferedReader(reader, buffer_size=STREAM_BUFFER_SIZE)
+
+
+class LibarchiveBackend(SevenZipBackend):
+    """libarchive through the libarchive-c bindings"""
+
+    name = 'libarchive'
+    in_process = True
+
+    def _reader(self, archive_path, password):
+        if password:
+            return _optional_module('libarchive').file_reader(archive_path, passphrase=password)
+        return _optional_module('libarchive').file_reader(archive_path)
+
+    def list_entries(self, archive_path, password):
+        entries = []
+        with self._reader(archive_path, password) as archive:
+            for entry in archive:
+                path = entry.pathname.replace('\\', '/').rstrip('/')
+                if not path:
+                    continue
+                entries.append({
+                    'path': path,
+                    'name': os.path.basename(path),
+                    'size': entry.size or 0,
+                    'compressed_size': 0,  # libarchive does not report packed sizes
+                    'modified': _format_mtime(entry.mtime),
+                    'mtime': float(entry.mtime or 0),
+                    'attributes': '',
+                    'crc': '',
+                    'method': '',
+                    'encrypted': bool(password),
+                    'is_dir': entry.isdir,
+                    'mode': entry.mode & 0o7777,
+                })
+        return entries
+
+    def open_member(self, archive_path, name, size, password):
+        def blocks():
+            with self._reader(archive_path, password) as archive:
+                for entry in archive:
+                    if entry.pathname.replace('\\', '/').rstrip('/') == name:
+                        yield from entry.get_blocks()
+                        return
+            raise KeyError(f"There is no item named {name!r} in the archive")
+        return io.BufferedReader(IterStream(blocks()), buffer_size=STREAM_BUFFER_SIZE)
+
+
+class Py7zrBackend(SevenZipBackend):
+    """The pure-Python py7zr package
+
+    Only listing is done in-process: py7zr decompresses a member into
+    memory as a whole, so members are still streamed through the 7z tool.
+    """
+
+    name = 'py7zr'
+    in_process = True
+
+    def list_entries(self, archive_path, password):
+        entries = []
+        with _optional_module('py7zr').SevenZipFile(archive_path, 'r', password=password) as archive:
+            # list() has no permission bits; the archive's file records do
+            modes = {f.filename.replace('\\', '/').rstrip('/'): getattr(f, 'posix_mode', None)
+                     for f in getattr(archive, 'files', ())}
+            for info in archive.list():
+                path = info.filename.replace('\\', '/').rstrip('/')
+                mtime = info.creationtime.timestamp() if info.creationtime else 0
+                entries.append({
+                    'path': path,
+                    'name': os.path.basename(path),
+                    'size': info.uncompressed or 0,
+                    'compressed_size': info.compressed or 0,
+                    'modified': _format_mtime(mtime),
+                    'mtime': mtime,
+                    'attributes': '',
+                    'crc': f"{info.crc32:08X}" if info.crc32 is not None else '',
+                    'method': '',
+                    'encrypted': archive.password_protected,
+                    'is_dir': info.is_directory,
+                })
+                mode = modes.get(path)
+                if mode is not None:
+                    entries[-1]['mode'] = mode & 0o7777
+        return entries
+
+
+def _format_mtime(mtime) -> str:
+    """A 7z-style 'YYYY-MM-DD HH:MM:SS' string for epoch seconds"""
+    from datetime import datetime
+    if not mtime:
+        return ''
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+
+
+BACKENDS = {
+    'cli': CliBackend(),
+    'libarchive': LibarchiveBackend(),
+    'py7zr': Py7zrBackend(),
+}
+
+_IMPORTABLE = {'cli': True, 'libarchive': LIBARCHIVE_AVAILABLE, 'py7zr': PY7ZR_AVAILABLE}
+
+_default_backend: Optional[str] = None
+
+
+def available_backends() -> List[str]:
+    """Names of the backends usable in this process, preferred first"""
+    names = [name for name in ('libarchive', 'py7zr') if _IMPORTABLE[name]]
+    if check_7z_cli() is None:
+        names.append('cli')
+    return names
+
+
+def set_default_backend(name: Optional[str]) -> None:
+    """Backend for handlers created without one; None restores 'cli'"""
+    global _default_backend
+    if name is not None and name != 'auto' and name not in BACKENDS:
+        raise ValueError(f"Unknown 7z backend: {name}")
+    _default_backend = name
+
+
+def get_backend(name: Optional[str] = None) -> SevenZipBackend:
+    """Resolve a backend name (None uses the default, then the environment, then 'cli')"""
+    name = name or _default_backend or os.environ.get(BACKEND_ENV) or 'cli'
+    if name == 'auto':
+        for candidate in ('libarchive', 'py7zr'):
+            if _IMPORTABLE[candidate]:
+                return BACKENDS[candidate]
+        return BACKENDS['cli']
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown 7z backend: {name}")
+    if not _IMPORTABLE[name]:
+        raise ValueError(f"7z backend '{name}' is not installed")
+    return BACKENDS[name]
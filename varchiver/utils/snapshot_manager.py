@@ -2,9 +2,16 @@ from datetime import datetime
 import os
 import json
 import shutil
-from typing import List, Dict, Optional
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass
 from ..utils.constants import DEFAULT_SKIP_PATTERNS
+from .fast_copy import CopyResult, copy_many, copy_tree
+from .snapshot_store import BlobStore, file_lock, manifest_digests, read_manifest, write_manifest
+
+DEFAULT_HASH_WORKERS = 4
 
 @dataclass
 class SnapshotInfo:
@@ -17,20 +24,32 @@ class SnapshotInfo:
     description: Optional[str] = None
     tags: List[str] = None
     parent_id: Optional[str] = None
+    source_path: Optional[str] = None
+    stored_size: int = 0  # Bytes this snapshot added to the store
 
 class SnapshotManager:
-    """Manages archive snapshots with versioning support"""
+    """Manages archive snapshots with versioning support
+
+    Snapshots are manifests over a content-addressed blob store (see
+    snapshot_store), so unchanged files are stored once across snapshots.
+    Snapshots made before the store existed are full copies under
+    snapshots/ and are still listed, restored and deleted.
+    """
     
     def __init__(self, base_dir: str):
         self.base_dir = os.path.expanduser(base_dir)
         self.snapshots_dir = os.path.join(self.base_dir, 'snapshots')
+        self.manifests_dir = os.path.join(self.base_dir, 'manifests')
         self.index_file = os.path.join(self.base_dir, 'snapshots.json')
+        self.index_lock_path = os.path.join(self.base_dir, 'snapshots.lock')
         self._ensure_dirs()
+        self.store = BlobStore(os.path.join(self.base_dir, 'store'))
         self._load_index()
     
     def _ensure_dirs(self):
         """Ensure required directories exist"""
         os.makedirs(self.snapshots_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
     
     def _load_index(self) -> Dict:
         """Load snapshots index"""
@@ -43,59 +62,174 @@ class SnapshotManager:
         return {'snapshots': {}}
     
     def _save_index(self, index: Dict):
-        """Save snapshots index"""
-        with open(self.index_file, 'w') as f:
+        """Save snapshots index atomically, so readers never see a partial file"""
+        tmp_path = self.index_file + '.tmp'
+        with open(tmp_path, 'w') as f:
             json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_file)
+
+    @contextmanager
+    def _edit_index(self):
+        """Load, yield and save the index under an exclusive lock
+
+        Concurrent creates, deletes and updates then never drop each other's
+        entries. Nothing is saved if the body raises.
+        """
+        with file_lock(self.index_lock_path, exclusive=True):
+            index = self._load_index()
+            yield index
+            self._save_index(index)
     
     def create_snapshot(self, source_path: str, name: str = None, 
                        description: str = None, tags: List[str] = None,
-                       parent_id: str = None) -> SnapshotInfo:
-        """Create a new snapshot from source path"""
-        # Generate snapshot ID and name
+                       parent_id: str = None,
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       workers: int = DEFAULT_HASH_WORKERS) -> SnapshotInfo:
+        """Create a new snapshot from source path
+
+        File contents go into the shared blob store, and the snapshot itself
+        is a manifest. Files whose size and mtime match the parent snapshot
+        (or, without a parent, the latest snapshot of the same source) reuse
+        its digests without being read.
+
+        Args:
+            progress_callback: Called with (bytes hashed, bytes to hash)
+            workers: Files hashed and stored in parallel
+        """
+        # Name the snapshot; its ID is picked when it is added to the index
         timestamp = datetime.now().timestamp()
-        snapshot_id = f"snap_{int(timestamp)}"
+        index = self._load_index()
         if not name:
             name = os.path.basename(source_path)
-        
-        # Create snapshot directory
-        snapshot_dir = os.path.join(self.snapshots_dir, snapshot_id)
-        os.makedirs(snapshot_dir)
-        
-        # Copy source to snapshot directory
-        if os.path.isfile(source_path):
-            shutil.copy2(source_path, snapshot_dir)
-            size = os.path.getsize(source_path)
-        else:
-            shutil.copytree(source_path, snapshot_dir, dirs_exist_ok=True)
-            size = sum(f.stat().st_size for f in os.scandir(snapshot_dir) if f.is_file())
-        
+        source_path = os.path.abspath(source_path)
+
+        files, dirs, links = self._scan_source(source_path)
+        reference = self._reference_manifest(index, source_path, parent_id)
+        done = 0
+        stored_size = 0
+        with self.store.lock(), ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Blobs are only checked under the store lock, so garbage collection
+            # cannot remove a reused blob before the new manifest is indexed
+            digests = {}
+            changed = []
+            for rel_path, (path, size, mtime, mode) in files.items():
+                previous = reference.get(rel_path)
+                if (previous and previous['size'] == size and previous['mtime'] == mtime
+                        and self.store.has(previous['digest'])):
+                    digests[rel_path] = previous['digest']
+                else:
+                    changed.append(rel_path)
+
+            total = sum(files[rel_path][1] for rel_path in changed)
+            results = pool.map(lambda rel_path: self.store.add_file(files[rel_path][0]), changed)
+            for rel_path, (digest, new_bytes) in zip(changed, results):
+                digests[rel_path] = digest
+                stored_size += new_bytes
+                done += files[rel_path][1]
+                if progress_callback:
+                    progress_callback(done, total)
+
+            size = sum(entry[1] for entry in files.values())
+            # The index entry is saved before the shared store lock is released:
+            # garbage collection finds live blobs through the index
+            with self._edit_index() as index:
+                snapshot_id = f"snap_{int(timestamp)}"
+                suffix = 1
+                while snapshot_id in index['snapshots']:
+                    snapshot_id = f"snap_{int(timestamp)}_{suffix}"
+                    suffix += 1
+                manifest_path = os.path.join(self.manifests_dir, f"{snapshot_id}.json.gz")
+                write_manifest(manifest_path, {
+                    'source_path': source_path,
+                    'files': {rel_path: {'digest': digests[rel_path], 'size': size,
+                                         'mtime': mtime, 'mode': mode}
+                              for rel_path, (_, size, mtime, mode) in files.items()},
+                    'dirs': dirs,
+                    'links': links,
+                })
+                index['snapshots'][snapshot_id] = {
+                    'name': name,
+                    'timestamp': timestamp,
+                    'path': manifest_path,
+                    'size': size,
+                    'description': description,
+                    'tags': tags or [],
+                    'parent_id': parent_id,
+                    'manifest': True,
+                    'source_path': source_path,
+                    'stored_size': stored_size
+                }
+
         # Create snapshot info
         snapshot = SnapshotInfo(
             id=snapshot_id,
             name=name,
             timestamp=timestamp,
-            path=snapshot_dir,
+            path=manifest_path,
             size=size,
             description=description,
             tags=tags or [],
-            parent_id=parent_id
+            parent_id=parent_id,
+            source_path=source_path,
+            stored_size=stored_size
         )
-        
-        # Update index
-        index = self._load_index()
-        index['snapshots'][snapshot_id] = {
-            'name': name,
-            'timestamp': timestamp,
-            'path': snapshot_dir,
-            'size': size,
-            'description': description,
-            'tags': tags or [],
-            'parent_id': parent_id
-        }
-        self._save_index(index)
-        
+
         return snapshot
-    
+
+    def _scan_source(self, source_path: str):
+        """(files {rel: (path, size, mtime, mode)}, dirs, links {rel: target}) under source_path"""
+        files, dirs, links = {}, [], {}
+
+        def add_file(path, rel_path):
+            info = os.stat(path)
+            if stat.S_ISREG(info.st_mode):  # Not FIFOs, sockets or devices
+                files[rel_path] = (path, info.st_size, info.st_mtime, info.st_mode & 0o7777)
+
+        if os.path.isfile(source_path):
+            add_file(source_path, os.path.basename(source_path))
+            return files, dirs, links
+
+        for root, dirnames, filenames in os.walk(source_path):
+            rel_root = os.path.relpath(root, source_path)
+            for name in dirnames + filenames:
+                path = os.path.join(root, name)
+                rel_path = os.path.normpath(os.path.join(rel_root, name)).replace(os.sep, '/')
+                if os.path.islink(path):
+                    links[rel_path] = os.readlink(path)
+                elif name in dirnames:
+                    dirs.append(rel_path)
+                else:
+                    add_file(path, rel_path)
+        return files, dirs, links
+
+    def _reference_manifest(self, index: Dict, source_path: str, parent_id: Optional[str]) -> Dict:
+        """Files of the snapshot to compare against: the parent, or the latest of this source"""
+        snapshots = index['snapshots']
+        if parent_id and snapshots.get(parent_id, {}).get('manifest'):
+            candidate = parent_id
+        else:
+            same_source = [(info['timestamp'], snap_id) for snap_id, info in snapshots.items()
+                           if info.get('manifest') and info.get('source_path') == source_path]
+            if not same_source:
+                return {}
+            candidate = max(same_source)[1]
+        manifest = read_manifest(snapshots[candidate]['path'])
+        return manifest['files'] if manifest else {}
+
+    def _to_info(self, snapshot_id: str, info: Dict) -> SnapshotInfo:
+        return SnapshotInfo(
+            id=snapshot_id,
+            name=info['name'],
+            timestamp=info['timestamp'],
+            path=info['path'],
+            size=info['size'],
+            description=info.get('description'),
+            tags=info.get('tags', []),
+            parent_id=info.get('parent_id'),
+            source_path=info.get('source_path'),
+            stored_size=info.get('stored_size', info['size'])
+        )
+
     def list_snapshots(self, tag: str = None, 
                       sort_by: str = 'timestamp',
                       reverse: bool = True) -> List[SnapshotInfo]:
@@ -106,17 +240,7 @@ class SnapshotManager:
         for snap_id, info in index['snapshots'].items():
             if tag and tag not in info.get('tags', []):
                 continue
-            snapshot = SnapshotInfo(
-                id=snap_id,
-                name=info['name'],
-                timestamp=info['timestamp'],
-                path=info['path'],
-                size=info['size'],
-                description=info.get('description'),
-                tags=info.get('tags', []),
-                parent_id=info.get('parent_id')
-            )
-            snapshots.append(snapshot)
+            snapshots.append(self._to_info(snap_id, info))
         
         # Sort snapshots
         if sort_by == 'name':
@@ -133,50 +257,102 @@ class SnapshotManager:
         index = self._load_index()
         info = index['snapshots'].get(snapshot_id)
         if info:
-            return SnapshotInfo(
-                id=snapshot_id,
-                name=info['name'],
-                timestamp=info['timestamp'],
-                path=info['path'],
-                size=info['size'],
-                description=info.get('description'),
-                tags=info.get('tags', []),
-                parent_id=info.get('parent_id')
-            )
+            return self._to_info(snapshot_id, info)
         return None
     
     def delete_snapshot(self, snapshot_id: str) -> bool:
-        """Delete a snapshot and its files"""
-        index = self._load_index()
-        if snapshot_id not in index['snapshots']:
-            return False
-        
-        # Remove snapshot directory
-        snapshot_dir = index['snapshots'][snapshot_id]['path']
-        if os.path.exists(snapshot_dir):
-            shutil.rmtree(snapshot_dir)
-        
-        # Update index
-        del index['snapshots'][snapshot_id]
-        self._save_index(index)
-        
+        """Delete a snapshot; its blobs stay in the store until collect_garbage()"""
+        with self._edit_index() as index:
+            if snapshot_id not in index['snapshots']:
+                return False
+
+            info = index['snapshots'][snapshot_id]
+            if info.get('manifest'):
+                if os.path.exists(info['path']):
+                    os.remove(info['path'])
+            elif os.path.exists(info['path']):
+                # Snapshot stored as a full copy
+                shutil.rmtree(info['path'])
+
+            # Update index
+            del index['snapshots'][snapshot_id]
+
         return True
+
+    def restore_snapshot(self, snapshot_id: str, target_dir: str,
+                         progress_callback: Optional[Callable[[CopyResult], None]] = None) -> CopyResult:
+        """Materialize a snapshot's files into target_dir
+
+        Raises:
+            KeyError: Unknown snapshot
+            OSError: The manifest cannot be read
+        """
+        info = self._load_index()['snapshots'][snapshot_id]
+        if not info.get('manifest'):
+            return copy_tree(info['path'], target_dir, progress_callback=progress_callback)
+
+        manifest = read_manifest(info['path'])
+        if manifest is None:
+            raise OSError(f"Cannot read snapshot manifest: {info['path']}")
+        os.makedirs(target_dir, exist_ok=True)
+        for rel_path in manifest['dirs']:
+            os.makedirs(os.path.join(target_dir, rel_path), exist_ok=True)
+
+        targets = {}
+        for rel_path, entry in manifest['files'].items():
+            target = os.path.join(target_dir, rel_path)
+            targets[target] = entry
+
+        def on_copied(blob_path, target, strategy, size):
+            entry = targets[target]
+            os.chmod(target, entry['mode'])
+            os.utime(target, (entry['mtime'], entry['mtime']))
+
+        result = copy_many(((self.store.path_for(entry['digest']), target)
+                            for target, entry in targets.items()),
+                           preserve_metadata=False, on_copied=on_copied,
+                           progress_callback=progress_callback)
+        for rel_path, link_target in manifest['links'].items():
+            link_path = os.path.join(target_dir, rel_path)
+            if os.path.lexists(link_path):
+                os.remove(link_path)
+            os.symlink(link_target, link_path)
+        return result
+
+    def collect_garbage(self, dry_run: bool = False) -> Dict[str, int]:
+        """Remove blobs that no snapshot references
+
+        Returns:
+            {'blobs_removed', 'bytes_freed', 'blobs_kept'}
+
+        Raises:
+            OSError: A manifest could not be read, so nothing was removed
+        """
+        with self.store.lock(exclusive=True):
+            manifests = []
+            for info in self._load_index()['snapshots'].values():
+                if not info.get('manifest'):
+                    continue
+                manifest = read_manifest(info['path'])
+                if manifest is None:
+                    raise OSError(f"Cannot read snapshot manifest {info['path']}; not collecting")
+                manifests.append(manifest)
+            return self.store.remove_unreferenced(manifest_digests(manifests), dry_run=dry_run)
     
     def update_snapshot(self, snapshot_id: str, name: str = None,
                        description: str = None, tags: List[str] = None) -> bool:
         """Update snapshot metadata"""
-        index = self._load_index()
-        if snapshot_id not in index['snapshots']:
-            return False
-        
-        if name:
-            index['snapshots'][snapshot_id]['name'] = name
-        if description is not None:
-            index['snapshots'][snapshot_id]['description'] = description
-        if tags is not None:
-            index['snapshots'][snapshot_id]['tags'] = tags
-        
-        self._save_index(index)
+        with self._edit_index() as index:
+            if snapshot_id not in index['snapshots']:
+                return False
+
+            if name:
+                index['snapshots'][snapshot_id]['name'] = name
+            if description is not None:
+                index['snapshots'][snapshot_id]['description'] = description
+            if tags is not None:
+                index['snapshots'][snapshot_id]['tags'] = tags
+
         return True
     
     def get_snapshot_history(self, snapshot_id: str) -> List[SnapshotInfo]:
@@ -0,0 +1,166 @@
+"""Content-addressed storage for snapshots.
+
+Every file's contents are stored once, as a blob named by its BLAKE2b
+digest under ``objects/<first two hex digits>/<rest>``. A snapshot is a
+manifest (gzipped JSON) mapping each relative path to a digest, size,
+mtime and mode, plus its directories and symlinks, so snapshots of a tree
+that barely changes cost little more than their manifests.
+
+Blobs are written to a temporary name and linked into place, so a blob
+that exists is always complete and only one writer counts it as stored. They are copied in and out with
+``fast_copy``, so on reflink filesystems storing and restoring share
+extents instead of duplicating data. Nothing is deleted when a snapshot is
+removed; ``BlobStore.remove_unreferenced`` reclaims blobs no manifest
+uses. Creating snapshots holds a shared lock on the store, until the new
+snapshot is in the index, and garbage collection an exclusive one, so a
+collection never removes a blob that a snapshot being written is about to
+reference.
+"""
+
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .dir_sync import file_digest
+from .fast_copy import copy_file
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MANIFEST_VERSION = 1
+TMP_SUFFIX = '.varchiver-tmp'
+
+
+class BlobStore:
+    """Blobs keyed by content digest under root/objects"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.lock_path = os.path.join(root, 'store.lock')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def add_file(self, path: str, digest: Optional[str] = None) -> Tuple[str, int]:
+        """Store a file's contents
+
+        Args:
+            path: File to store
+            digest: Its digest, if already known
+
+        Returns:
+            (digest, bytes newly stored); 0 when the blob already existed
+        """
+        digest = digest or file_digest(path)
+        blob_path = self.path_for(digest)
+        if os.path.exists(blob_path):
+            return digest, 0
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}"
+        try:
+            _, size = copy_file(path, tmp_path, preserve_metadata=False)
+            os.chmod(tmp_path, 0o444)
+            try:
+                # Fails if a concurrent writer stored the same contents first
+                os.link(tmp_path, blob_path)
+            except FileExistsError:
+                size = 0
+            except OSError:
+                os.replace(tmp_path, blob_path)  # No hard links on this filesystem
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return digest, size
+
+    def materialize(self, digest: str, target: str) -> None:
+        """Write a blob's contents to target (without the blob's metadata)"""
+        copy_file(self.path_for(digest), target, preserve_metadata=False)
+
+    def remove_unreferenced(self, referenced: Set[str], dry_run: bool = False) -> Dict[str, int]:
+        """Delete blobs not in referenced, and leftover temporary files
+
+        Call with the store locked exclusively (see lock()).
+
+        Returns:
+            {'blobs_removed', 'bytes_freed', 'blobs_kept'}
+        """
+        stats = {'blobs_removed': 0, 'bytes_freed': 0, 'blobs_kept': 0}
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, name)
+                if not name.endswith(TMP_SUFFIX) and prefix + name in referenced:
+                    stats['blobs_kept'] += 1
+                    continue
+                try:
+                    size = os.path.getsize(path)
+                    if not dry_run:
+                        os.remove(path)
+                except OSError:
+                    continue
+                stats['blobs_removed'] += 1
+                stats['bytes_freed'] += size
+            if not dry_run:
+                try:
+                    os.rmdir(prefix_dir)
+                except OSError:
+                    pass  # Still holds blobs
+        return stats
+
+    def lock(self, exclusive: bool = False):
+        """Hold the store lock: shared while adding blobs, exclusive while collecting"""
+        return file_lock(self.lock_path, exclusive)
+
+
+@contextmanager
+def file_lock(path: str, exclusive: bool = False):
+    """Hold an advisory lock on path (created if missing); a no-op without fcntl"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_manifest(path: str, manifest: Dict) -> None:
+    """Write a manifest atomically as gzipped JSON"""
+    manifest = dict(manifest, version=MANIFEST_VERSION)
+    tmp_path = path + TMP_SUFFIX
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str) -> Optional[Dict]:
+    """Load a manifest; None if it is missing, unreadable or of another version"""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def manifest_digests(manifests: Iterable[Dict]) -> Set[str]:
+    """Every blob digest referenced by the given manifests"""
+    return {entry['digest'] for manifest in manifests for entry in manifest['files'].values()}
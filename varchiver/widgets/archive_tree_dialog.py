@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QProgressBar,
-                            QTreeWidget, QTreeWidgetItem, QHeaderView, QApplication,
-                            QPushButton, QHBoxLayout)
+                            QTreeView, QHeaderView, QPushButton, QHBoxLayout)
 from PyQt6.QtCore import Qt
+from ..utils.archive_tree import NodeTreeSource
+from .archive_tree_model import ArchiveTreeModel
 
 class ArchiveTreeDialog(QDialog):
     def __init__(self, parent=None):
@@ -25,11 +26,16 @@ class ArchiveTreeDialog(QDialog):
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
         
-        # Create tree widget
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(['Name', 'Size', 'Compressed', 'Ratio'])
+        # Create tree view; rows are only created for expanded directories
+        self.model = ArchiveTreeModel(None, self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
         self.tree.setAlternatingRowColors(True)
         self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        self.tree.setColumnWidth(0, 360)
         layout.addWidget(self.tree)
         
         # Create buttons
@@ -53,7 +59,7 @@ class ArchiveTreeDialog(QDialog):
 
     def prepare_for_loading(self):
         """Prepare dialog for loading new content"""
-        self.tree.clear()
+        self.model.set_source(None)
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
         self.info_label.setText("Loading archive contents...")
@@ -68,159 +74,25 @@ class ArchiveTreeDialog(QDialog):
         self.progress_bar.setVisible(False)
         
     def show_contents(self, contents):
-        """Display archive contents in tree dialog"""
+        """Display archive contents (a flat listing) in the tree"""
         if not contents:
             self.info_label.setText("No files found in archive")
             self.progress_bar.setVisible(False)
             return
 
-        # Clear tree
-        self.tree.clear()
-        self.progress_bar.setVisible(True)
-
-        # Create a dictionary to store directory items
-        dir_items = {}
-        
-        # Process each file
         total_size = 0
         total_compressed = 0
         total_files = 0
-        
-        # Sort contents by path to ensure parent directories are created first
-        contents = sorted(contents, key=lambda x: x['path'])
-        
-        # First pass: create all directories
         for file_info in contents:
             if file_info.get('is_dir', False):
-                path = file_info.get('path', '')
-                parent_path = file_info.get('parent_path', '')
-                name = file_info.get('name', '')
-                
-                if not path or not name:
-                    continue
-                    
-                # Get parent item
-                parent_item = None
-                if parent_path:
-                    parent_info = dir_items.get(parent_path)
-                    if parent_info:
-                        parent_item = parent_info['item']
-                
-                # Create directory item
-                item = QTreeWidgetItem()
-                item.setText(0, name)
-                
-                # Store name and path for sorting
-                item.setData(0, Qt.ItemDataRole.UserRole, name.lower())
-                item.setData(0, Qt.ItemDataRole.UserRole + 1, path)
-                
-                # Add to parent or root
-                if parent_item:
-                    parent_item.addChild(item)
-                else:
-                    self.tree.addTopLevelItem(item)
-                
-                # Store directory item
-                dir_items[path] = {
-                    'item': item,
-                    'size': 0,
-                    'compressed': 0
-                }
-        
-        # Second pass: add files
-        batch_size = 100
-        for i in range(0, len(contents), batch_size):
-            batch = contents[i:i + batch_size]
-            
-            for file_info in batch:
-                if file_info.get('is_dir', False):
-                    continue
-                    
-                path = file_info.get('path', '')
-                parent_path = file_info.get('parent_path', '')
-                name = file_info.get('name', '')
-                size = file_info.get('size', 0)
-                compressed = file_info.get('compressed', size)
-                
-                if not path or not name:
-                    continue
-                
-                # Update totals
-                total_size += size
-                total_compressed += compressed
-                total_files += 1
-                
-                # Get parent item
-                parent_item = None
-                if parent_path:
-                    parent_info = dir_items.get(parent_path)
-                    if parent_info:
-                        parent_item = parent_info['item']
-                
-                # Create file item
-                item = QTreeWidgetItem()
-                item.setText(0, name)
-                item.setText(1, self._format_size(size))
-                item.setText(2, self._format_size(compressed))
-                
-                # Calculate and format compression ratio
-                if size > 0:
-                    ratio = (1 - compressed / size)
-                    item.setText(3, f"{ratio:.3f}")
-                else:
-                    item.setText(3, "0.000")
-                
-                # Store raw values for sorting
-                item.setData(0, Qt.ItemDataRole.UserRole, name.lower())
-                item.setData(0, Qt.ItemDataRole.UserRole + 1, path)
-                item.setData(1, Qt.ItemDataRole.UserRole, size)
-                item.setData(2, Qt.ItemDataRole.UserRole, compressed)
-                item.setData(3, Qt.ItemDataRole.UserRole, ratio if size > 0 else 0)
-                
-                # Add to parent or root
-                if parent_item:
-                    parent_item.addChild(item)
-                else:
-                    self.tree.addTopLevelItem(item)
-                
-                # Update parent directory sizes
-                current_path = parent_path
-                while current_path:
-                    if current_path in dir_items:
-                        dir_info = dir_items[current_path]
-                        dir_info['size'] += size
-                        dir_info['compressed'] += compressed
-                    parent_parts = [p for p in current_path.split('/') if p]
-                    if len(parent_parts) > 1:
-                        current_path = '/'.join(parent_parts[:-1]) + '/'
-                    else:
-                        break
-            
-            # Update progress
-            self.progress_bar.setValue((i + len(batch)) * 100 // len(contents))
-            QApplication.processEvents()
+                continue
+            size = file_info.get('size', 0) or 0
+            total_size += size
+            total_compressed += file_info.get('compressed', size) or 0
+            total_files += 1
 
-        # Update directory items
-        for path, dir_info in dir_items.items():
-            item = dir_info['item']
-            size = dir_info['size']
-            compressed = dir_info['compressed']
-            
-            if size > 0:
-                item.setText(1, self._format_size(size))
-                item.setText(2, self._format_size(compressed))
-                ratio = (1 - compressed / size)
-                item.setText(3, f"{ratio:.3f}")
-                
-                # Store raw values
-                item.setData(1, Qt.ItemDataRole.UserRole, size)
-                item.setData(2, Qt.ItemDataRole.UserRole, compressed)
-                item.setData(3, Qt.ItemDataRole.UserRole, ratio)
+        self.show_source(NodeTreeSource.from_entries(contents))
 
-        # Update column widths
-        for i in range(4):
-            self.tree.resizeColumnToContents(i)
-        
         # Update info label
         if total_size > 0:
             ratio = (1 - total_compressed / total_size)
@@ -232,7 +104,10 @@ class ArchiveTreeDialog(QDialog):
             )
         else:
             self.info_label.setText(f"Total: {total_files} files")
-            
+
+    def show_source(self, source):
+        """Display a tree source (NodeTreeSource or IndexTreeSource)"""
+        self.model.set_source(source)
         self.progress_bar.setVisible(False)
 
     def _format_size(self, size):
@@ -0,0 +1,229 @@
+from datetime import datetime
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QApplication, QStyle
+
+from ..utils.archive_utils import format_size
+
+
+class _Row:
+    """A row the view has asked for; children are created only when fetched"""
+
+    __slots__ = ('node', 'parent', 'row', 'children', 'pending', 'totals')
+
+    def __init__(self, node, parent, row):
+        self.node = node
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self.pending = None  # Child nodes listed but not yet turned into rows
+        self.totals = None
+
+
+class ArchiveTreeModel(QAbstractItemModel):
+    """Lazy tree model over an archive tree source
+
+    The source (NodeTreeSource or IndexTreeSource) is asked for a
+    directory's children only when the view expands it, and rows are added
+    in batches through canFetchMore/fetchMore, so memory follows what has
+    been expanded rather than the size of the archive.
+
+    Sorting reorders the rows already fetched and the children still
+    pending, and directories listed later are sorted as they are fetched,
+    so a sort never lists the rest of the archive.
+    """
+
+    COLUMNS = ["Name", "Size", "Compressed", "Ratio", "Modified"]
+    BATCH_SIZE = 1000
+    PathRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self._root = _Row(None, None, 0)
+        self._dir_icon = None
+        self._file_icon = None
+        self._sort_column = 0
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def _row_for(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _dir_path(self, row):
+        return row.node.path if row.node is not None else ''
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_row = self._row_for(parent)
+        if 0 <= row < len(parent_row.children) and 0 <= column < len(self.COLUMNS):
+            return self.createIndex(row, column, parent_row.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_row = index.internalPointer().parent
+        if parent_row is None or parent_row is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_row.row, 0, parent_row)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self._row_for(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        row = self._row_for(parent)
+        if row is self._root:
+            return self.source is not None
+        return row.node.is_dir and (row.pending is None or bool(row.pending) or bool(row.children))
+
+    def canFetchMore(self, parent):
+        if self.source is None:
+            return False
+        row = self._row_for(parent)
+        if row is not self._root and not row.node.is_dir:
+            return False
+        return row.pending is None or bool(row.pending)
+
+    def fetchMore(self, parent):
+        row = self._row_for(parent)
+        if row.pending is None:
+            row.pending = self._sorted(self.source.children(self._dir_path(row)))
+            row.pending.reverse()  # Pop from the end in sorted order
+        if not row.pending:
+            return
+        count = min(self.BATCH_SIZE, len(row.pending))
+        first = len(row.children)
+        self.beginInsertRows(parent, first, first + count - 1)
+        for i in range(count):
+            row.children.append(_Row(row.pending.pop(), row, first + i))
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def _totals(self, node):
+        """(size, compressed size) of a file, or of everything below a directory"""
+        if not node.is_dir:
+            entry = node.entry or {}
+            return node.size, entry.get('compressed')
+        return self.source.dir_totals(node.path)
+
+    def _row_totals(self, row):
+        if row.totals is None:
+            row.totals = self._totals(row.node)
+        return row.totals
+
+    @staticmethod
+    def _ratio(size, compressed):
+        """Space saved by compression, as in the archive summary"""
+        if compressed is None or not size:
+            return None
+        return 1 - compressed / size
+
+    def _sort_key(self, node):
+        column = self._sort_column
+        if column == 0:
+            return node.name.lower()
+        if column == 4:
+            entry = node.entry or {}
+            return entry.get('mtime') or 0, entry.get('modified') or ''
+        size, compressed = self._totals(node)
+        if column == 1:
+            return size
+        if column == 2:
+            return compressed if compressed is not None else -1
+        ratio = self._ratio(size, compressed)
+        return ratio if ratio is not None else -1.0
+
+    def _sorted(self, nodes):
+        """Nodes in the current sort order, directories first"""
+        reverse = self._sort_order == Qt.SortOrder.DescendingOrder
+        nodes = sorted(nodes, key=self._sort_key, reverse=reverse)
+        nodes.sort(key=lambda n: not n.is_dir)
+        return nodes
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.COLUMNS):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        if self.source is None:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_rows = [(index.internalPointer(), index.column()) for index in old_indexes]
+
+        stack = [self._root]
+        while stack:
+            parent = stack.pop()
+            if parent.children:
+                by_node = {id(child.node): child for child in parent.children}
+                nodes = self._sorted([child.node for child in parent.children])
+                parent.children = [by_node[id(node)] for node in nodes]
+                for i, child in enumerate(parent.children):
+                    child.row = i
+                    stack.append(child)
+            if parent.pending:
+                parent.pending = self._sorted(parent.pending)
+                parent.pending.reverse()
+
+        self.changePersistentIndexList(
+            old_indexes,
+            [self.createIndex(row.row, column, row) for row, column in old_rows])
+        self.layoutChanged.emit()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.internalPointer()
+        node = row.node
+        column = index.column()
+
+        if role == self.PathRole:
+            return node.path
+        if role == Qt.ItemDataRole.DecorationRole and column == 0:
+            if self._dir_icon is None:
+                style = QApplication.style()
+                self._dir_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+                self._file_icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+            return self._dir_icon if node.is_dir else self._file_icon
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        entry = node.entry or {}
+        if column == 0:
+            return node.name
+        if column == 1:
+            return format_size(self._row_totals(row)[0])
+        if column == 2:
+            compressed = self._row_totals(row)[1]
+            return format_size(compressed) if compressed is not None else ''
+        if column == 3:
+            ratio = self._ratio(*self._row_totals(row))
+            return f"{ratio:.3f}" if ratio is not None else ''
+        if column == 4:
+            mtime = entry.get('mtime')
+            if mtime:
+                return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            return entry.get('modified', '')
+        return None
+
+    def path(self, index):
+        """Archive path of the entry at index"""
+        return self.data(index, self.PathRole) if index.isValid() else None
+
+    def set_source(self, source):
+        """Replace the source, closing the previous one"""
+        self.beginResetModel()
+        if self.source is not None and self.source is not source:
+            self.source.close()
+        self.source = source
+        self._root = _Row(None, None, 0)
+        self.endResetModel()
@@ -13,9 +13,13 @@ import rarfile
 from pathlib import Path
 from typing import List, Optional
 from ..utils.archive_utils import get_archive_type
+from ..sevenz import SevenZipHandler
 import tempfile
 import shutil
 
+# Bytes of an archive member shown in a preview tab
+PREVIEW_BYTES = 256 * 1024
+
 class FilePreviewDialog(QDialog):
     """Enhanced file preview dialog with advanced browsing capabilities"""
     
@@ -28,6 +32,7 @@ class FilePreviewDialog(QDialog):
         self.selected_files = set()
         self.temp_dir = None
         self.current_archive = None
+        self._sevenz_archives = {}  # Archive path -> SevenZipHandler with its listing
         self.setup_ui()
         self.populate_tree()
         
@@ -200,6 +205,22 @@ class FilePreviewDialog(QDialog):
                             datetime.fromtimestamp(info.date_time).strftime('%Y-%m-%d %H:%M')
                         ])
                         browser.addTopLevelItem(item)
+            elif archive_type == '.7z':
+                archive = self._sevenz_archives.get(path)
+                if archive is None:
+                    archive = self._sevenz_archives[path] = SevenZipHandler(path)
+                for info in archive.infolist():
+                    item = QTreeWidgetItem([
+                        info['path'],
+                        self._format_size(info['size']),
+                        info.get('modified', '')
+                    ])
+                    if not info.get('is_dir'):
+                        # Only files can be previewed; directory rows carry no member
+                        item.setData(0, Qt.ItemDataRole.UserRole, info['path'])
+                    browser.addTopLevelItem(item)
+                browser.itemDoubleClicked.connect(
+                    lambda item, column, path=path: self._on_archive_member_activated(path, item))
             
             tab_name = os.path.basename(path)
             self.preview_tabs.addTab(browser, f"📦 {tab_name}")
@@ -208,6 +229,34 @@ class FilePreviewDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to preview archive: {e}")
 
+    def _on_archive_member_activated(self, archive_path, item):
+        """Preview the member behind a double-clicked row; directory rows are ignored"""
+        member = item.data(0, Qt.ItemDataRole.UserRole)
+        if member:
+            self.preview_archive_member(archive_path, member)
+
+    def preview_archive_member(self, archive_path, member):
+        """Preview the start of a 7z member, streamed so large members are never loaded whole"""
+        try:
+            archive = self._sevenz_archives[archive_path]
+            with archive.open(member) as f:
+                data = f.read(PREVIEW_BYTES + 1)
+
+            content = data[:PREVIEW_BYTES].decode('utf-8', errors='replace')
+            if len(data) > PREVIEW_BYTES:
+                content += f"\n\n[Preview truncated at {self._format_size(PREVIEW_BYTES)}]"
+
+            editor = QTextEdit()
+            editor.setReadOnly(True)
+            editor.setPlainText(content)
+            self.apply_syntax_highlighting(editor, member)
+
+            self.preview_tabs.addTab(editor, f"📄 {os.path.basename(member)}")
+            self.preview_tabs.setCurrentIndex(self.preview_tabs.count() - 1)
+
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to preview {member}: {e}")
+
     def preview_text_file(self, path):
         """Preview text file content"""
         try:
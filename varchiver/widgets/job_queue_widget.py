@@ -0,0 +1,162 @@
+from PyQt6.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QSpinBox, QTreeWidget, QTreeWidgetItem, QProgressBar,
+                             QHeaderView, QMenu, QAbstractItemView)
+from PyQt6.QtCore import Qt
+from ..engine.scheduler import QUEUED, RUNNING, PAUSED, DONE, FAILED, CANCELLED, FINAL_STATES
+from ..threads.scheduler_bridge import SchedulerBridge
+from ..utils.archive_utils import format_size
+
+STATE_LABELS = {
+    QUEUED: 'Queued',
+    RUNNING: 'Running',
+    PAUSED: 'Paused',
+    DONE: 'Done',
+    FAILED: 'Failed',
+    CANCELLED: 'Cancelled',
+}
+
+
+class JobQueueWidget(QGroupBox):
+    """One row per scheduled extraction or archive job, with pause/resume/cancel"""
+
+    def __init__(self, bridge: SchedulerBridge = None, parent=None):
+        super().__init__("Job Queue", parent)
+        self.bridge = bridge or SchedulerBridge(parent=self)
+        self.scheduler = self.bridge.scheduler
+        self._items = {}  # job id -> QTreeWidgetItem
+
+        self._init_ui()
+        self.bridge.job_added.connect(self._on_job_added)
+        self.bridge.job_updated.connect(self._update_row)
+        self.bridge.job_finished.connect(self._update_row)
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.summary_label = QLabel()
+        controls.addWidget(self.summary_label, 1)
+        controls.addWidget(QLabel("Parallel jobs:"))
+        self.max_jobs_spin = QSpinBox()
+        self.max_jobs_spin.setRange(1, 32)
+        self.max_jobs_spin.setValue(self.scheduler.max_jobs)
+        self.max_jobs_spin.setToolTip(
+            f"Jobs run at the same time. They share {self.scheduler.cpu_budget} CPU workers, "
+            f"and at most {self.scheduler.io_per_device} use any one disk.")
+        self.max_jobs_spin.valueChanged.connect(self.scheduler.set_max_jobs)
+        controls.addWidget(self.max_jobs_spin)
+
+        self.pause_all_button = QPushButton("Pause All")
+        self.pause_all_button.setCheckable(True)
+        self.pause_all_button.toggled.connect(self._toggle_pause_all)
+        controls.addWidget(self.pause_all_button)
+
+        cancel_all_button = QPushButton("Cancel All")
+        cancel_all_button.clicked.connect(self.scheduler.cancel_all)
+        controls.addWidget(cancel_all_button)
+
+        clear_button = QPushButton("Clear Finished")
+        clear_button.clicked.connect(self.clear_finished)
+        controls.addWidget(clear_button)
+        layout.addLayout(controls)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Archive", "Size", "Status", "Progress"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self._show_context_menu)
+        header = self.tree.header()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(2, 260)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
+        header.resizeSection(3, 140)
+        layout.addWidget(self.tree)
+
+        selection = QHBoxLayout()
+        for label, action in (("Pause", self.scheduler.pause), ("Resume", self.scheduler.resume),
+                              ("Cancel", self.scheduler.cancel)):
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked=False, action=action: self._for_selected(action))
+            selection.addWidget(button)
+        selection.addStretch()
+        layout.addLayout(selection)
+
+        self._update_summary()
+
+    def _on_job_added(self, job):
+        item = QTreeWidgetItem([job.label, format_size(job.size) if job.size else "", "", ""])
+        item.setData(0, Qt.ItemDataRole.UserRole, job.id)
+        item.setToolTip(0, f"{'Extract' if job.kind == 'extract' else 'Create'}: {job.label}")
+        self.tree.addTopLevelItem(item)
+        bar = QProgressBar()
+        bar.setRange(0, 100)
+        bar.setTextVisible(True)
+        self.tree.setItemWidget(item, 3, bar)
+        self._items[job.id] = item
+        self._update_row(job)
+
+    def _update_row(self, job):
+        item = self._items.get(job.id)
+        if item is None:
+            return
+        status = STATE_LABELS[job.state]
+        if job.state == RUNNING and job.message:
+            status = job.message
+        elif job.state == FAILED and job.errors:
+            status = f"Failed: {job.errors[0]}"
+        elif job.state == DONE:
+            status = f"Done in {job.elapsed:.1f}s"
+        item.setText(2, status)
+        item.setToolTip(2, "\n".join([status] + job.errors[:10]))
+        bar = self.tree.itemWidget(item, 3)
+        if bar is not None:
+            bar.setValue(job.progress)
+        self._update_summary()
+
+    def _update_summary(self):
+        counts = self.scheduler.counts()
+        finished = counts[DONE] + counts[FAILED] + counts[CANCELLED]
+        text = (f"{counts[RUNNING]} running, {counts[QUEUED]} queued, "
+                f"{finished} of {sum(counts.values())} finished")
+        if counts[PAUSED]:
+            text += f", {counts[PAUSED]} paused"
+        if counts[FAILED]:
+            text += f", {counts[FAILED]} failed"
+        self.summary_label.setText(text)
+
+    def _selected_ids(self):
+        return [item.data(0, Qt.ItemDataRole.UserRole) for item in self.tree.selectedItems()]
+
+    def _for_selected(self, action):
+        for job_id in self._selected_ids():
+            if job_id in self.scheduler.jobs:
+                action(job_id)
+
+    def _show_context_menu(self, position):
+        if not self.tree.selectedItems():
+            return
+        menu = QMenu(self)
+        menu.addAction("Pause", lambda: self._for_selected(self.scheduler.pause))
+        menu.addAction("Resume", lambda: self._for_selected(self.scheduler.resume))
+        menu.addAction("Cancel", lambda: self._for_selected(self.scheduler.cancel))
+        menu.exec(self.tree.viewport().mapToGlobal(position))
+
+    def _toggle_pause_all(self, paused):
+        if paused:
+            self.scheduler.pause_all()
+            self.pause_all_button.setText("Resume All")
+        else:
+            self.scheduler.resume_all()
+            self.pause_all_button.setText("Pause All")
+
+    def clear_finished(self):
+        """Remove rows for jobs that are done, failed or cancelled"""
+        for job_id, job in list(self.scheduler.jobs.items()):
+            if job.state in FINAL_STATES:
+                item = self._items.pop(job_id)
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+        self.scheduler.clear_finished()
+        self._update_summary()
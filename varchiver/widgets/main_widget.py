@@ -7,6 +7,7 @@ import sys
 import subprocess
 import tempfile
 import shutil
+import importlib
 import psutil
 import json
 from PyQt6.QtWidgets import (
@@ -52,18 +53,23 @@ from ..threads.directory_update_thread import DirectoryUpdateThread
 from ..utils.project_constants import DEFAULT_SKIP_PATTERNS, ARCHIVE_EXTENSIONS
 from ..utils.archive_utils import get_archive_type, is_rar_available
 from ..utils.theme_manager import ThemeManager
-from ..utils.release_manager import ReleaseManager
-from ..utils.git_manager import GitManager
-from .file_preview_dialog import FilePreviewDialog
-from .collision_dialog import CollisionDialog
-from .git_widget import GitWidget
-from .variable_calendar import VariableCalendarWidget
-from .supabase_widget import SupabaseWidget
-from .supabase_config_dialog import SupabaseConfigDialog
-from .inventory_widget import InventoryWidget
-from .json_editor_widget import JsonEditorWidget
-from .csv_viewer import CsvViewerWidget
-from .supamerge_widget import SupamergeWidget
+from ..utils.archive_tree import TreeNode, NodeTreeSource
+from ..utils.listing_cache import get_listing_cache
+from .archive_tree_model import ArchiveTreeModel
+
+
+def _widget_factory(module_name, class_name):
+    """A factory that imports varchiver.widgets.<module_name> and builds class_name
+
+    Mode widgets pull in Git, Supabase and SQLAlchemy, so they are only
+    imported when a mode first shows them.
+    """
+
+    def create():
+        module = importlib.import_module(f".{module_name}", __package__)
+        return getattr(module, class_name)()
+
+    return create
 
 
 class MainWidget(QWidget):
@@ -78,9 +84,12 @@ class MainWidget(QWidget):
         self.current_contents = None  # Current archive contents
         self.current_thread = None  # Current operation thread
         self._browse_thread = None  # Browse thread for archives/directories
+        self._verify_thread = None  # Archive verification thread
         self.password = None  # Current archive password
         self.skip_checkboxes = {}  # Skip pattern checkboxes
         self.extraction_queue = []  # Queue for pending extractions
+        self.job_queue = None  # JobQueueWidget running queued extractions concurrently
+        self.compression_workers = None  # Compression threads; None means one per CPU
 
         # Initialize recent archives
         self.recent_archives = []
@@ -104,21 +113,40 @@ class MainWidget(QWidget):
         self.setup_ui()
 
     def _init_widgets(self):
-        """Initialize all mode widgets"""
-        # Initialize Git widget and manager
-        self.git_manager = GitManager()
-        self.git_widget = GitWidget()
-        self.git_widget.repo_changed.connect(self.on_repository_changed)
-        self.git_widget.sequester_path_changed.connect(self.on_sequester_path_changed)
-        self.git_widget.artifacts_path_changed.connect(self.on_artifacts_path_changed)
-
-        # Initialize other widgets
-        self.variable_calendar = VariableCalendarWidget()
-        self.supabase_widget = SupabaseWidget()
-        self.inventory_widget = InventoryWidget()
-        self.json_editor_widget = JsonEditorWidget()
-        self.csv_viewer_widget = CsvViewerWidget()
-        self.supamerge_widget = SupamergeWidget()
+        """Register mode widget factories; a widget is built when a mode first shows it"""
+        self._mode_widgets = {}
+        self._widget_factories = {
+            "git_widget": self._create_git_widget,
+            "variable_calendar": _widget_factory("variable_calendar", "VariableCalendarWidget"),
+            "supabase_widget": _widget_factory("supabase_widget", "SupabaseWidget"),
+            "inventory_widget": _widget_factory("inventory_widget", "InventoryWidget"),
+            "json_editor_widget": _widget_factory("json_editor_widget", "JsonEditorWidget"),
+            "csv_viewer_widget": _widget_factory("csv_viewer", "CsvViewerWidget"),
+            "supamerge_widget": _widget_factory("supamerge_widget", "SupamergeWidget"),
+        }
+
+    def _create_git_widget(self):
+        """Build the Git widget and connect its signals"""
+        git_widget = _widget_factory("git_widget", "GitWidget")()
+        git_widget.repo_changed.connect(self.on_repository_changed)
+        git_widget.sequester_path_changed.connect(self.on_sequester_path_changed)
+        git_widget.artifacts_path_changed.connect(self.on_artifacts_path_changed)
+        return git_widget
+
+    def _mode_widget(self, widget_name):
+        """Return a mode widget, importing and building it on first use"""
+        widget = self._mode_widgets.get(widget_name)
+        if widget is None:
+            widget = self._widget_factories[widget_name]()
+            widget.setVisible(False)
+            # Keep mode widgets in registration order within their layout
+            order = list(self._widget_factories)
+            position = sum(1 for name in self._mode_widgets
+                           if order.index(name) < order.index(widget_name))
+            self.mode_widgets_layout.insertWidget(position, widget)
+            self._mode_widgets[widget_name] = widget
+            setattr(self, widget_name, widget)
+        return widget
 
     def _init_modes_config(self):
         """Initialize modes configuration"""
@@ -216,18 +244,6 @@ class MainWidget(QWidget):
             },
         }
 
-        # Set all widgets initially hidden
-        for widget_name in [
-            "git_widget",
-            "variable_calendar",
-            "supabase_widget",
-            "inventory_widget",
-            "json_editor_widget",
-            "csv_viewer_widget",
-            "supamerge_widget",
-        ]:
-            getattr(self, widget_name).setVisible(False)
-
     def setup_ui(self):
         """Initialize the UI components."""
         main_layout = QVBoxLayout(self)
@@ -278,24 +294,10 @@ class MainWidget(QWidget):
 
         main_layout.addWidget(self.recent_group)
 
-        # Add Git widget
-        main_layout.addWidget(self.git_widget)
-
-        # Add variable calendar widget
-        main_layout.addWidget(self.variable_calendar)
-
-        # Add Supabase widget (for Dev Tools mode)
-        main_layout.addWidget(self.supabase_widget)
-
-        # Add inventory widget
-        self.inventory_widget = InventoryWidget()
-        self.inventory_widget.setVisible(False)
-        main_layout.addWidget(self.inventory_widget)
-
-        # Add all mode widgets
-        main_layout.addWidget(self.json_editor_widget)
-        main_layout.addWidget(self.csv_viewer_widget)
-        main_layout.addWidget(self.supamerge_widget)
+        # Mode widgets are added here as modes first show them
+        self.mode_widgets_layout = QVBoxLayout()
+        self.mode_widgets_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addLayout(self.mode_widgets_layout)
 
         # Create archive group
         self.archive_group = QGroupBox("Archive Operations")
@@ -321,6 +323,17 @@ class MainWidget(QWidget):
         self.info_button.clicked.connect(self.show_archive_info)
         toolbar.addWidget(self.info_button)
 
+        # Verify button
+        self.verify_button = QPushButton("Verify")
+        self.verify_button.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton)
+        )
+        self.verify_button.setToolTip(
+            "Check the archive's CRCs and checksums, and its recorded source hashes if it has them"
+        )
+        self.verify_button.clicked.connect(self.verify_archive)
+        toolbar.addWidget(self.verify_button)
+
         # Create archive button
         self.create_button = QPushButton("Create Archive")
         self.create_button.setIcon(
@@ -500,6 +513,13 @@ class MainWidget(QWidget):
         self.preserve_permissions.setEnabled(True)
         options_layout.addRow("", self.preserve_permissions)
 
+        # Record source hashes checkbox
+        self.record_hashes = QCheckBox("Record source hashes for verification")
+        self.record_hashes.setToolTip(
+            "Save a digest of every file next to the archive, so Verify can check its contents"
+        )
+        options_layout.addRow("", self.record_hashes)
+
         archive_layout.addWidget(options_group)
 
         # Create tree view for file display
@@ -512,6 +532,22 @@ class MainWidget(QWidget):
         self._tree.itemDoubleClicked.connect(self._on_tree_item_double_clicked)
         archive_layout.addWidget(self._tree)
 
+        # Archive contents are shown through a lazy model instead of one item per entry
+        self._archive_model = ArchiveTreeModel(None, self)
+        self._archive_view = QTreeView()
+        self._archive_view.setModel(self._archive_model)
+        self._archive_view.setUniformRowHeights(True)
+        self._archive_view.setAlternatingRowColors(True)
+        self._archive_view.setSortingEnabled(True)
+        self._archive_view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self._archive_view.setSelectionMode(QTreeView.SelectionMode.ExtendedSelection)
+        self._archive_view.header().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Interactive
+        )
+        self._archive_view.setColumnWidth(0, 320)
+        self._archive_view.setVisible(False)
+        archive_layout.addWidget(self._archive_view)
+
         main_layout.addWidget(self.archive_group)
 
         # Status label for detailed progress
@@ -653,7 +689,7 @@ class MainWidget(QWidget):
 
             # Set name filters
             dialog.setNameFilter(
-                "All Supported Types (*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.7z *.rar);;Archives (*.zip);;TAR Archives (*.tar);;Gzipped TAR Archives (*.tar.gz);;TGZ Archives (*.tgz);;Bzip2 TAR Archives (*.tar.bz2);;7z Archives (*.7z);;RAR Archives (*.rar);;All Files (*)"
+                "All Supported Types (*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz *.tar.zst *.7z *.rar);;Archives (*.zip);;TAR Archives (*.tar);;Gzipped TAR Archives (*.tar.gz);;TGZ Archives (*.tgz);;Bzip2 TAR Archives (*.tar.bz2);;XZ TAR Archives (*.tar.xz);;Zstandard TAR Archives (*.tar.zst);;7z Archives (*.7z);;RAR Archives (*.rar);;All Files (*)"
             )
 
             if dialog.exec() == QFileDialog.DialogCode.Accepted:
@@ -717,7 +753,7 @@ class MainWidget(QWidget):
 
             # Create and start browse thread
             self._browse_thread = BrowseThread(archive_path, password)
-            self._browse_thread.contents_ready.connect(self._on_contents_ready)
+            self._browse_thread.source_ready.connect(self._on_source_ready)
             self._browse_thread.error.connect(self._on_error)
             self._browse_thread.status.connect(self.update_status)
             self._browse_thread.progress.connect(self._on_progress)
@@ -742,6 +778,39 @@ class MainWidget(QWidget):
         )
         self.browse_button.setEnabled(True)
 
+    def _on_source_ready(self, source):
+        """Called when a tree source for the archive is ready"""
+        self._show_archive_source(source)
+        self.progress_bar.setVisible(False)
+        cache = get_listing_cache().stats()
+        self.status_label.setText(
+            f"Archive: {os.path.basename(self.current_archive_path)}"
+            f" | Listing cache: {cache['hits']} hits, {cache['misses']} misses"
+        )
+        self.status_label.show()
+        self.browse_button.setEnabled(True)
+
+    def _show_archive_source(self, source):
+        """Display an archive tree source in the lazy archive view"""
+        self._archive_model.set_source(source)
+        self._tree.setVisible(False)
+        self._archive_view.setVisible(True)
+
+    def _populate_tree(self, contents):
+        """Show archive TreeNodes, or filesystem paths, in the tree"""
+        if contents and isinstance(contents[0], TreeNode):
+            root = TreeNode('', '', True)
+            for node in contents:
+                root.children[node.name] = node
+                root.size += node.size
+                root.compressed += node.compressed
+            self._show_archive_source(NodeTreeSource(root))
+            return
+        self._archive_view.setVisible(False)
+        self._tree.setVisible(True)
+        for path in contents or []:
+            self.display_filesystem_item(path)
+
     def _on_error(self, error_msg):
         """Called when an error occurs"""
         self.show_error(error_msg)
@@ -850,23 +919,54 @@ class MainWidget(QWidget):
             self.show_error(f"Error setting up extraction: {str(e)}")
 
     def process_extraction_queue(self):
-        """Process the next item in the extraction queue"""
+        """Hand every queued extraction to the job queue, which runs several at once"""
         if not self.extraction_queue:
             self.start_extract_button.setEnabled(False)
             return
 
-        if self.current_thread and self.current_thread.isRunning():
-            self.show_error("An operation is already in progress")
-            return
-
-        # Get next extraction from queue
-        extraction_info = self.extraction_queue.pop(0)
-
-        # Start the extraction
-        self.extract_archive(**extraction_info)
+        from ..engine.scheduler import UNATTENDED_COLLISION_STRATEGY
+
+        job_queue = self._get_job_queue()
+        scheduler = job_queue.scheduler
+        asks = any(info.get("collision_strategy") == "ask" for info in self.extraction_queue)
+        with scheduler.batch():
+            for extraction_info in self.extraction_queue:
+                info = dict(extraction_info)
+                scheduler.submit_extraction(info.pop("archive_name"), info.pop("output_dir"), **info)
+        message = f"Extracting {len(self.extraction_queue)} archives, up to {scheduler.max_jobs} at a time"
+        if asks:
+            # Queued jobs run unattended, so there is nobody to ask about collisions
+            message += f"; existing files use '{UNATTENDED_COLLISION_STRATEGY}' instead of 'ask'"
+        self.update_status(message)
+        self.extraction_queue = []
 
         # Update button state
-        self.start_extract_button.setEnabled(bool(self.extraction_queue))
+        self.start_extract_button.setEnabled(False)
+
+    def _get_job_queue(self):
+        """The job queue, created and added below the archive view on first use"""
+        if self.job_queue is None:
+            from .job_queue_widget import JobQueueWidget
+
+            self.job_queue = JobQueueWidget(parent=self)
+            self.job_queue.bridge.job_finished.connect(self._on_scheduled_job_finished)
+            self.job_queue.bridge.all_done.connect(self._on_job_queue_done)
+            self.archive_group.layout().addWidget(self.job_queue)
+        self.job_queue.setVisible(True)
+        return self.job_queue
+
+    def _on_scheduled_job_finished(self, job):
+        """Report a scheduled job's errors like any other operation's"""
+        if job.errors:
+            self.handle_error(f"{job.label}: {job.errors[0]}")
+
+    def _on_job_queue_done(self):
+        """Summarize the job queue once everything in it has finished"""
+        counts = self.job_queue.scheduler.counts()
+        self.update_status(
+            f"Job queue finished: {counts['done']} done, {counts['failed']} failed, "
+            f"{counts['cancelled']} cancelled"
+        )
 
     def extract_archive(
         self,
@@ -1150,6 +1250,8 @@ class MainWidget(QWidget):
         skip_patterns=None,
         collision_strategy=None,
         preserve_permissions=None,
+        workers=None,
+        record_hashes=None,
     ):
         """Compress files into an archive"""
         try:
@@ -1166,6 +1268,10 @@ class MainWidget(QWidget):
                 collision_strategy = self.collision_combo.currentText()
             if preserve_permissions is None:
                 preserve_permissions = self.preserve_permissions.isChecked()
+            if workers is None:
+                workers = self.compression_workers
+            if record_hashes is None:
+                record_hashes = self.record_hashes.isChecked()
 
             # Show progress dialog
             progress_dialog = QProgressDialog(
@@ -1185,6 +1291,8 @@ class MainWidget(QWidget):
                 skip_patterns=skip_patterns,
                 collision_strategy=collision_strategy,
                 preserve_permissions=preserve_permissions,
+                workers=workers,
+                record_hashes=record_hashes,
             )
 
             # Connect signals
@@ -1307,6 +1415,8 @@ class MainWidget(QWidget):
                 "Gzipped TAR Archives (*.tar.gz)": ".tar.gz",
                 "TGZ Archives (*.tgz)": ".tgz",
                 "Bzip2 TAR Archives (*.tar.bz2)": ".tar.bz2",
+                "XZ TAR Archives (*.tar.xz)": ".tar.xz",
+                "Zstandard TAR Archives (*.tar.zst)": ".tar.zst",
                 "7z Archives (*.7z)": ".7z",
             }
 
@@ -1357,6 +1467,11 @@ class MainWidget(QWidget):
     <br>- Better compression than GZIP
     <br>- Slower than GZIP
 </li>
+<li><b>TAR.XZ / TAR.ZST (.tar.xz, .tar.zst)</b>
+    <br>- TAR with XZ or Zstandard compression
+    <br>- Compressed in parallel blocks on all cores
+    <br>- .tar.zst requires the zstandard package
+</li>
 <li><b>RAR (.rar)</b>
     <br>- RAR archive format
     <br>- Strong compression
@@ -1417,6 +1532,78 @@ class MainWidget(QWidget):
         """Update files found label"""
         self.files_found_label.setText(f"Files found: {count}")
 
+    def verify_archive(self):
+        """Check the current archive's integrity on a background thread"""
+        from ..threads.verify_thread import VerifyThread
+        from ..utils.hash_manifest import hashes_path_for
+
+        archive_path = self.current_archive_path
+        if not archive_path or os.path.isdir(archive_path):
+            archive_path, _ = QFileDialog.getOpenFileName(
+                self, "Select Archive to Verify", "",
+                "Archives (*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz *.tar.zst *.7z *.rar)",
+            )
+            if not archive_path:
+                return
+
+        self.verify_button.setEnabled(False)
+        self.error_label.setVisible(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+
+        # Compare contents with the source when hashes were recorded at creation
+        compare = os.path.exists(hashes_path_for(archive_path))
+        password = self.password if archive_path == self.current_archive_path else None
+        self._verify_thread = VerifyThread(archive_path, password, compare=compare)
+        self._verify_thread.progress.connect(self._on_progress)
+        self._verify_thread.status.connect(self.update_status)
+        self._verify_thread.error.connect(self.handle_error)
+        self._verify_thread.error.connect(lambda *_: self._on_verify_done())
+        self._verify_thread.finished.connect(self._on_verify_finished)
+        self._verify_thread.start()
+
+    def _on_verify_done(self):
+        self.verify_button.setEnabled(True)
+        self.progress_bar.setVisible(False)
+
+    def _on_verify_finished(self, report):
+        """Summarize a verification report and offer to save it as JSON"""
+        self._on_verify_done()
+        name = os.path.basename(report["archive"])
+        summary = (f"{report['members_checked']:,} members, "
+                   f"{report['bytes_checked'] / (1024 * 1024):.1f} MB checked "
+                   f"in {report['seconds']:.1f}s")
+        if report["hashes_compared"]:
+            summary += f"; {report['hashes_compared']:,} matched against source hashes"
+        if report["ok"]:
+            self.update_status(f"{name}: OK, {summary}")
+            box = QMessageBox(QMessageBox.Icon.Information, "Verification Passed",
+                              f"{name} is intact.\n\n{summary}", parent=self)
+        else:
+            self.update_status(f"{name}: {len(report['errors'])} problems found")
+            details = "\n".join(f"{member or name}: {message}"
+                                for member, message in report["errors"][:20])
+            if len(report["errors"]) > 20:
+                details += f"\n... and {len(report['errors']) - 20} more"
+            box = QMessageBox(QMessageBox.Icon.Warning, "Verification Failed",
+                              f"{name}: {len(report['errors'])} problems found.\n\n{summary}",
+                              parent=self)
+            box.setDetailedText(details)
+        save_button = box.addButton("Save Report...", QMessageBox.ButtonRole.ActionRole)
+        box.addButton(QMessageBox.StandardButton.Close)
+        box.exec()
+        if box.clickedButton() == save_button:
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Save Verification Report", report["archive"] + ".verify.json",
+                "JSON (*.json)",
+            )
+            if path:
+                try:
+                    with open(path, "w") as f:
+                        json.dump(report, f, indent=1)
+                except OSError as e:
+                    self.handle_error(f"Could not save report: {e}")
+
     def handle_error(self, message, is_permission_error=False):
         """Handle error messages"""
         self.error_label.setText(f"Error: {message}")
@@ -1431,6 +1618,9 @@ class MainWidget(QWidget):
         if self.current_thread and self.current_thread.isRunning():
             self.current_thread.terminate()
             self.current_thread.wait()
+        if self.job_queue:
+            self.job_queue.scheduler.cancel_all()
+            self.job_queue.scheduler.wait(5)
         super().closeEvent(event)
 
     def get_active_skip_patterns(self):
@@ -1502,6 +1692,11 @@ class MainWidget(QWidget):
             self.status_label.setText("Operation cancelled")
             self.progress_bar.setVisible(False)
 
+        if self.job_queue:
+            print("\nCancelling queued jobs...")
+            self.job_queue.scheduler.cancel_all()
+            self.job_queue.scheduler.wait(5)
+
         if self._browse_thread and self._browse_thread.isRunning():
             print("\nStopping browse operation...")
             self._browse_thread.terminate()
@@ -1545,6 +1740,7 @@ class MainWidget(QWidget):
                 return
 
             if files:
+                from .file_preview_dialog import FilePreviewDialog
                 dialog = FilePreviewDialog(self, files)
                 dialog.exec()
 
@@ -1556,6 +1752,8 @@ class MainWidget(QWidget):
         if selected_files:
             # Display selected items in tree view
             self._tree.clear()
+            self._archive_view.setVisible(False)
+            self._tree.setVisible(True)
             for file_path in selected_files:
                 self.display_filesystem_item(file_path)
 
@@ -1604,11 +1802,12 @@ class MainWidget(QWidget):
             self.mode_combo.setCurrentText("Dev Tools")
 
         # Show Git widget if hidden
-        if not self.git_widget.isVisible():
-            self.git_widget.setVisible(True)
+        git_widget = self._mode_widget("git_widget")
+        if not git_widget.isVisible():
+            git_widget.setVisible(True)
 
         # Find the release manager tab and select it
-        tab_widget = self.git_widget.findChild(QTabWidget)
+        tab_widget = git_widget.findChild(QTabWidget)
         if tab_widget:
             for i in range(tab_widget.count()):
                 if tab_widget.tabText(i) == "Release Manager":
@@ -1641,23 +1840,15 @@ class MainWidget(QWidget):
         else:
             self.hide_git_ui()
 
-        # Hide all widgets first
-        all_widget_names = [
-            "git_widget",
-            "variable_calendar",
-            "supabase_widget",
-            "inventory_widget",
-            "json_editor_widget",
-            "csv_viewer_widget",
-            "supamerge_widget",
-        ]
-        for widget_name in all_widget_names:
-            getattr(self, widget_name).setVisible(False)
-
-        # Show required widgets
+        # Hide all widgets built so far
+        for widget_name, widget in self._mode_widgets.items():
+            if widget_name not in config["widgets_visible"]:
+                widget.setVisible(False)
+
+        # Show required widgets, building them on first use
         for widget_name in config["widgets_visible"]:
-            if hasattr(self, widget_name):
-                getattr(self, widget_name).setVisible(True)
+            if widget_name in self._widget_factories:
+                self._mode_widget(widget_name).setVisible(True)
 
         # Handle special groups
         for group_name, visible in config["special_groups"].items():
@@ -1691,11 +1882,12 @@ class MainWidget(QWidget):
 
     def show_git_ui(self):
         """Show Git-related UI elements"""
-        self.git_widget.setVisible(True)
+        git_widget = self._mode_widget("git_widget")
+        git_widget.setVisible(True)
         # Set a reasonable maximum height (e.g., 60% of screen height)
         screen = QApplication.primaryScreen().geometry()
         max_height = int(screen.height() * 0.6)  # Reduced from 80% to 60%
-        self.git_widget.setMaximumHeight(max_height)
+        git_widget.setMaximumHeight(max_height)
         # Set a reasonable default height
         default_height = int(screen.height() * 0.4)  # Start at 40% screen height
         self.resize(self.width(), default_height)
@@ -1704,7 +1896,8 @@ class MainWidget(QWidget):
 
     def hide_git_ui(self):
         """Hide Git-related UI elements"""
-        self.git_widget.setVisible(False)
+        if "git_widget" in self._mode_widgets:
+            self._mode_widgets["git_widget"].setVisible(False)
 
     def on_repository_changed(self, repo_path: str):
         """Handle repository path change."""
@@ -1730,6 +1923,7 @@ class MainWidget(QWidget):
 
             if os.path.isfile(path):
                 # Show file preview dialog
+                from .file_preview_dialog import FilePreviewDialog
                 dialog = FilePreviewDialog(self, [path])
                 dialog.exec()
             elif os.path.isdir(path):
@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                             QLabel, QLineEdit, QTextEdit, QComboBox,
                             QTableWidget, QTableWidgetItem, QHeaderView,
-                            QMessageBox, QMenu)
+                            QMessageBox, QMenu, QFileDialog)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction
 from datetime import datetime
@@ -72,6 +72,11 @@ class SnapshotDialog(QDialog):
         self.select_button.setEnabled(False)
         buttons.addWidget(self.select_button)
         
+        gc_button = QPushButton('Reclaim Space')
+        gc_button.setToolTip('Remove stored file contents no snapshot uses any more')
+        gc_button.clicked.connect(self._collect_garbage)
+        buttons.addWidget(gc_button)
+        
         cancel_button = QPushButton('Cancel')
         cancel_button.clicked.connect(self.reject)
         buttons.addWidget(cancel_button)
@@ -120,6 +125,7 @@ class SnapshotDialog(QDialog):
             
             # Size
             size_item = QTableWidgetItem(self._format_size(snap.size))
+            size_item.setToolTip(f"{self._format_size(snap.stored_size)} newly stored")
             self.table.setItem(i, 2, size_item)
             
             # Tags
@@ -142,6 +148,10 @@ class SnapshotDialog(QDialog):
         select_action.triggered.connect(self.accept)
         menu.addAction(select_action)
         
+        restore_action = QAction('Restore To...', self)
+        restore_action.triggered.connect(self._restore_selected)
+        menu.addAction(restore_action)
+        
         delete_action = QAction('Delete', self)
         delete_action.triggered.connect(self._delete_selected)
         menu.addAction(delete_action)
@@ -182,6 +192,39 @@ class SnapshotDialog(QDialog):
             else:
                 QMessageBox.warning(self, 'Error', 'Failed to delete snapshot')
     
+    def _restore_selected(self):
+        """Restore selected snapshot into a chosen directory"""
+        if not self.selected_snapshot:
+            return
+        
+        target_dir = QFileDialog.getExistingDirectory(self, 'Restore Snapshot To')
+        if not target_dir:
+            return
+        try:
+            result = self.snapshot_manager.restore_snapshot(self.selected_snapshot.id, target_dir)
+        except (KeyError, OSError) as e:
+            QMessageBox.warning(self, 'Error', f'Failed to restore snapshot: {e}')
+            return
+        if result.errors:
+            QMessageBox.warning(self, 'Restore Incomplete',
+                                f'{len(result.errors)} files could not be restored '
+                                f'(first: {result.errors[0][1]})')
+        else:
+            QMessageBox.information(self, 'Snapshot Restored', f'Restored {result.summary()}')
+    
+    def _collect_garbage(self):
+        """Remove stored contents that no snapshot references"""
+        try:
+            stats = self.snapshot_manager.collect_garbage()
+        except OSError as e:
+            QMessageBox.warning(self, 'Error', str(e))
+            return
+        QMessageBox.information(
+            self, 'Reclaim Space',
+            f"Removed {stats['blobs_removed']:,} unused files, "
+            f"freeing {self._format_size(stats['bytes_freed'])}"
+        )
+    
     def _edit_selected(self):
         """Edit selected snapshot"""
         if not self.selected_snapshot: